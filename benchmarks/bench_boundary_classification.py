@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+_collect_bucket_batch 2단계(경계 이벤트 분류) 벤치마크
+
+이벤트 수를 늘려가며 기존 방식과 현재 classify_boundary_events를 비교하고,
+중복 체크(DB 조회)로 넘어가는 이벤트 수를 출력합니다.
+
+- legacy: 변경 전 코드 그대로 (게이트가 eventID를 파일명으로 파싱해 항상 실패 → 전부 DB 조회)
+- list-scan: 게이트만 고친 변경 전 코드 (dataclass 리스트 멤버십 비교로 O(n²))
+- current: 한 번의 순회로 분류 (O(n))
+
+사용법:
+    python benchmarks/bench_boundary_classification.py
+    python benchmarks/bench_boundary_classification.py --sizes 1000 10000 100000 1000000 --legacy-max 10000
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from common import setup_environment
+
+setup_environment()
+
+from src.cloud_trail import CloudTrailEvent  # noqa: E402
+from src.s3_cloudtrail import S3CloudTrailCollector, classify_boundary_events  # noqa: E402
+
+
+def make_events(count: int, last_timestamp: datetime, boundary_ratio: float):
+    """last_timestamp 전후로 분포한 이벤트 생성 (boundary_ratio만큼 경계 구간)"""
+    events = []
+    boundary_count = int(count * boundary_ratio)
+    for i in range(count):
+        if i < boundary_count:
+            event_time = last_timestamp + timedelta(seconds=i % 3600)
+        else:
+            event_time = last_timestamp + timedelta(hours=1, seconds=1 + i % 3600)
+        events.append(CloudTrailEvent.from_dict({
+            'eventID': str(uuid.uuid4()),
+            'eventTime': event_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'eventName': 'GetObject',
+        }))
+    return events
+
+
+def legacy_classify(events, last_timestamp):
+    """변경 전 2단계 로직 (eventID에서 파일명 타임스탬프 추출 + 리스트 멤버십 비교)"""
+    collector = S3CloudTrailCollector.__new__(S3CloudTrailCollector)
+    boundary_time = last_timestamp + timedelta(hours=1)
+    definite_new_events = [
+        e for e in events
+        if collector._extract_datetime_from_filename(e.event_id) and
+           collector._parse_event_time(e.event_time) > boundary_time
+    ]
+    boundary_events = [e for e in events if e not in definite_new_events]
+    return definite_new_events, boundary_events
+
+
+def list_scan_classify(events, last_timestamp):
+    """변경 전 2단계의 멤버십 비교만 남긴 버전 (게이트가 정상 동작할 때의 O(n²) 비용)"""
+    collector = S3CloudTrailCollector.__new__(S3CloudTrailCollector)
+    boundary_time = last_timestamp + timedelta(hours=1)
+    definite_new_events = [
+        e for e in events
+        if collector._parse_event_time(e.event_time) > boundary_time
+    ]
+    boundary_events = [e for e in events if e not in definite_new_events]
+    return definite_new_events, boundary_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description='경계 이벤트 분류 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--legacy-max', type=int, default=5000, help='기존 방식을 측정할 최대 이벤트 수')
+    parser.add_argument('--boundary-ratio', type=float, default=0.1, help='경계 구간 이벤트 비율')
+    args = parser.parse_args()
+
+    last_timestamp = datetime(2025, 9, 3, 0, 0)
+
+    print(
+        f"{'events':>10} {'legacy(s)':>10} {'legacy→DB':>10} {'list-scan(s)':>13} "
+        f"{'current(s)':>11} {'current→DB':>11} {'ns/event':>9}"
+    )
+    for size in args.sizes:
+        events = make_events(size, last_timestamp, args.boundary_ratio)
+
+        legacy_time = legacy_db = list_scan_time = '-'
+        if size <= args.legacy_max:
+            started = time.perf_counter()
+            _, boundary = legacy_classify(events, last_timestamp)
+            legacy_time = f"{time.perf_counter() - started:.3f}"
+            legacy_db = str(len(boundary))
+
+            started = time.perf_counter()
+            list_scan_classify(events, last_timestamp)
+            list_scan_time = f"{time.perf_counter() - started:.3f}"
+
+        started = time.perf_counter()
+        _, boundary = classify_boundary_events(events, last_timestamp)
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"{size:>10} {legacy_time:>10} {legacy_db:>10} {list_scan_time:>13} "
+            f"{elapsed:>11.3f} {len(boundary):>11} "
+            f"{elapsed / size * 1e9:>9.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
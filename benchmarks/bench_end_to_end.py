@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+수집기 전체 처리량 벤치마크 (S3 → 파싱 → 중복 제거 → 저장)
+
+합성 CloudTrail 로그 파일(.json.gz)을 로컬 S3(moto)에 올리고
+EC2CloudTrailService.collect_and_send를 Once 모드로 실행해 처리량을 측정합니다.
+s3_cloudtrail.py / direct_rds.py 변경 전후를 같은 조건으로 비교하는 용도입니다.
+
+저장 대상(--sink)
+- null: 저장하지 않는 전송자 (S3 목록/다운로드/파싱/중복 제거까지의 상한)
+- postgres: RDS_* 환경변수의 PostgreSQL (로컬 DB 사용, --reset 시 events/cloudtrail 비움)
+
+출력: events/s, MB/s(압축 기준), 최대 RSS, 단계별 시간 (src.metrics 지표 + 파이프라인 단계 통계)
+수집 설정(PIPELINE_ENABLED, PARSE_PROCESSES, RDS_WRITE_MODE 등)은 환경변수로 지정합니다.
+moto 대신 MinIO 등을 쓰려면 --no-moto와 AWS_ENDPOINT_URL_S3를 지정합니다.
+
+사용법:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/bench_end_to_end.py --files 200 --records 1000 --sink null postgres --reset
+    python benchmarks/bench_end_to_end.py --event-mix GetObject=70 PutObject=20 ConsoleLogin=10 --events ConsoleLogin
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from common import ROOT, setup_environment
+
+setup_environment()
+
+from src.senders import Sender  # noqa: E402
+
+ACCOUNT_ID = '123456789012'
+REGION = 'ap-northeast-2'
+PREFIX = f'AWSLogs/{ACCOUNT_ID}/CloudTrail/{REGION}/'
+BUCKET = 'logsmith-benchmark'
+
+EVENT_SOURCES = {
+    'GetObject': 's3.amazonaws.com', 'PutObject': 's3.amazonaws.com', 'ConsoleLogin': 'signin.amazonaws.com',
+    'AssumeRole': 'sts.amazonaws.com', 'DescribeInstances': 'ec2.amazonaws.com', 'Decrypt': 'kms.amazonaws.com',
+}
+
+
+def parse_event_mix(items: List[str]) -> Dict[str, int]:
+    """['GetObject=70', 'ConsoleLogin=10'] -> {'GetObject': 70, 'ConsoleLogin': 10}"""
+    mix = {}
+    for item in items:
+        name, _, weight = item.partition('=')
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def make_record(event_time: datetime, event_name: str, payload_bytes: int, rng: random.Random) -> dict:
+    user = f"user{rng.randrange(20)}"
+    return {
+        'eventVersion': '1.08',
+        'userIdentity': {
+            'type': 'IAMUser', 'principalId': 'AIDAEXAMPLE', 'arn': f'arn:aws:iam::{ACCOUNT_ID}:user/{user}',
+            'accountId': ACCOUNT_ID, 'accessKeyId': 'AKIAEXAMPLE', 'userName': user,
+            'sessionContext': {'attributes': {'mfaAuthenticated': 'false', 'creationDate': event_time.strftime('%Y-%m-%dT%H:%M:%SZ')}},
+        },
+        'eventTime': event_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'eventSource': EVENT_SOURCES.get(event_name, 'cloudtrail.amazonaws.com'),
+        'eventName': event_name,
+        'awsRegion': REGION,
+        'sourceIPAddress': f'203.0.113.{rng.randrange(1, 255)}',
+        'userAgent': 'aws-cli/2.15.0 Python/3.11.6 Linux/6.1 exe/x86_64',
+        # 페이로드 크기 조절용 필드 (압축률이 너무 높지 않도록 임의 16진수)
+        'requestParameters': {'bucketName': 'example', 'key': f'object-{rng.randrange(10 ** 6)}',
+                              'payload': '%x' % rng.getrandbits(payload_bytes * 4) if payload_bytes else ''},
+        'responseElements': None,
+        'requestID': uuid.uuid4().hex,
+        'eventID': str(uuid.uuid4()),
+        'readOnly': event_name.startswith(('Get', 'Describe')),
+        'eventType': 'AwsApiCall',
+        'managementEvent': event_name not in ('GetObject', 'PutObject'),
+        'recipientAccountId': ACCOUNT_ID,
+        'eventCategory': 'Management',
+        'tlsDetails': {'tlsVersion': 'TLSv1.3', 'cipherSuite': 'TLS_AES_128_GCM_SHA256',
+                       'clientProvidedHostHeader': 'example.amazonaws.com'},
+    }
+
+
+def upload_trails(s3_client, args, start: datetime) -> Dict[str, float]:
+    """합성 로그 파일을 5분 간격으로 생성해 업로드"""
+    rng = random.Random(args.seed)
+    mix = parse_event_mix(args.event_mix)
+    names, weights = list(mix), list(mix.values())
+    compressed = raw = 0
+
+    for index in range(args.files):
+        file_time = start + timedelta(minutes=5 * index)
+        records = [
+            make_record(file_time + timedelta(seconds=i * 300 / args.records), rng.choices(names, weights)[0],
+                        args.payload_bytes, rng)
+            for i in range(args.records)
+        ]
+        body = json.dumps({'Records': records}).encode()
+        data = gzip.compress(body)
+        raw += len(body)
+        compressed += len(data)
+        key = (f"{PREFIX}{file_time:%Y/%m/%d}/{ACCOUNT_ID}_CloudTrail_{REGION}_"
+               f"{file_time:%Y%m%dT%H%MZ}_{uuid.uuid4().hex[:16]}.json.gz")
+        s3_client.put_object(Bucket=BUCKET, Key=key, Body=data)
+
+    return {'compressed_mb': compressed / 1024 / 1024, 'raw_mb': raw / 1024 / 1024}
+
+
+class NullSender(Sender):
+    """저장하지 않고 성공만 반환하는 전송자"""
+    name = 'null'
+
+    def __init__(self):
+        self.group_id = os.environ['GROUP_ID']
+        self.events = 0
+
+    def send_logs(self, log_data) -> bool:
+        self.events += len(log_data.records)
+        return True
+
+    def send_rows(self, rows) -> bool:
+        self.events += len(rows)
+        return True
+
+    def check_existing_events(self, event_ids, time_range=None):
+        return set()
+
+
+def reset_database(schema_file: str) -> None:
+    """스키마 생성 후 벤치마크 그룹 등록, events/cloudtrail 비우기"""
+    import psycopg2
+    from src.config import settings
+
+    conn = psycopg2.connect(host=settings.rds_host, port=settings.rds_port, dbname=settings.rds_database,
+                            user=settings.rds_user, password=settings.rds_password)
+    try:
+        with conn, conn.cursor() as cursor:
+            with open(schema_file, encoding='utf-8') as f:
+                cursor.execute(f.read())
+            cursor.execute("TRUNCATE cloudtrail, events")
+            cursor.execute(
+                "INSERT INTO groups (group_id, group_name) VALUES (%s, 'benchmark') ON CONFLICT DO NOTHING",
+                (settings.group_id,)
+            )
+    finally:
+        conn.close()
+
+
+def current_rss_mb() -> float:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def print_stage_times() -> None:
+    """src.metrics에 기록된 단계별 누적 시간 (병렬 실행이므로 합계는 경과 시간보다 클 수 있음)"""
+    from src.metrics import metrics
+
+    snapshot = metrics.snapshot()
+    for name in ('logsmith_s3_list_seconds', 'logsmith_s3_get_seconds', 'logsmith_decode_seconds',
+                 'logsmith_db_statement_seconds'):
+        for entry in snapshot.get(name, []):
+            label = ','.join(f"{k}={v}" for k, v in entry['labels'].items() if k != 'bucket')
+            title = name.replace('logsmith_', '').replace('_seconds', '') + (f"[{label}]" if label else '')
+            print(f"  {title:40s} {entry['sum']:8.2f}초  {entry['count']:7d}회  평균 {entry['avg'] * 1000:8.2f}ms")
+    for name in ('logsmith_events_parsed_total', 'logsmith_events_filtered_total',
+                 'logsmith_events_deduped_total', 'logsmith_events_written_total'):
+        total = sum(entry['value'] for entry in snapshot.get(name, []))
+        print(f"  {name.replace('logsmith_', ''):40s} {total:,.0f}")
+
+
+def run_once(args) -> None:
+    """한 가지 전송자로 한 번 실행 (최대 RSS를 분리하기 위해 전송자마다 별도 프로세스)"""
+    import boto3
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    with contextlib.ExitStack() as stack:
+        if not args.no_moto:
+            from moto import mock_aws
+            stack.enter_context(mock_aws())
+
+        s3_client = boto3.client('s3', region_name=REGION)
+        if not args.no_moto:
+            s3_client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={'LocationConstraint': REGION})
+
+        start = datetime(2025, 9, 3)
+        end = start + timedelta(minutes=5 * args.files)
+        generated_started = time.perf_counter()
+        sizes = upload_trails(s3_client, args, start)
+        print(f"[{args.sink}] 파일 {args.files}개 × {args.records}개 이벤트, 압축 {sizes['compressed_mb']:.1f} MiB "
+              f"(원본 {sizes['raw_mb']:.1f} MiB), 생성 {time.perf_counter() - generated_started:.1f}초")
+
+        if args.sink == 'postgres' and args.reset:
+            reset_database(args.schema)
+
+        from src.ec2_collector import EC2CloudTrailService
+
+        class BenchmarkService(EC2CloudTrailService):
+            def _initialize_senders(self):
+                return [NullSender()] if args.sink == 'null' else super()._initialize_senders()
+
+        bucket_configs = [{
+            'bucket_name': BUCKET, 'prefix': PREFIX, 'enabled': True,
+            'max_files': args.files, 'max_workers': args.max_workers,
+        }]
+        service = BenchmarkService(bucket_configs)
+        rss_before = current_rss_mb()
+
+        try:
+            output = io.StringIO() if not args.verbose else sys.stdout
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(output):
+                success = service.collect_and_send(event_names=args.events, start_time=start, end_time=end)
+            elapsed = time.perf_counter() - started
+        finally:
+            service.shutdown()
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    events = args.files * args.records
+    print(f"[{args.sink}] {'성공' if success else '실패'} {elapsed:.2f}초  {events / elapsed:,.0f} events/s  "
+          f"{sizes['compressed_mb'] / elapsed:.2f} MB/s (압축)  {sizes['raw_mb'] / elapsed:.2f} MB/s (원본)")
+    print(f"  RSS 수집 전 {rss_before:.0f} MiB, 최대 {peak_rss:.0f} MiB (파싱 프로세스 제외)")
+    print_stage_times()
+
+    result = service.last_pipeline_result
+    if result is not None:
+        for stats in result.stats.values():
+            print(f"  {stats.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='수집기 전체 처리량 벤치마크')
+    parser.add_argument('--files', type=int, default=100)
+    parser.add_argument('--records', type=int, default=1000, help='파일당 이벤트 수')
+    parser.add_argument('--payload-bytes', type=int, default=200, help='이벤트당 requestParameters 추가 크기')
+    parser.add_argument('--event-mix', nargs='+', default=['GetObject=60', 'PutObject=20', 'AssumeRole=15', 'ConsoleLogin=5'],
+                        help='eventName=가중치 목록')
+    parser.add_argument('--events', nargs='*', help='수집할 이벤트 이름 필터 (collect_and_send의 event_names)')
+    parser.add_argument('--sink', nargs='+', choices=['null', 'postgres'], default=['null'])
+    parser.add_argument('--reset', action='store_true', help='postgres 실행 전 스키마 생성 + events/cloudtrail TRUNCATE')
+    parser.add_argument('--schema', default=os.path.join(ROOT, 'sql', 'create_table.sql'))
+    parser.add_argument('--max-workers', type=int, default=None, help='버킷별 동시 다운로드 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-moto', action='store_true', help='moto 대신 AWS_ENDPOINT_URL_S3의 S3 호환 서버 사용 (버킷은 미리 생성)')
+    parser.add_argument('--verbose', action='store_true', help='수집기 로그/출력 표시')
+    args = parser.parse_args()
+
+    if len(args.sink) == 1:
+        args.sink = args.sink[0]
+        run_once(args)
+        return
+
+    # 전송자마다 별도 프로세스로 실행 (최대 RSS, 지표가 섞이지 않도록)
+    argv = sys.argv[1:]
+    sink_index = argv.index('--sink')
+    rest = argv[:sink_index] + argv[sink_index + 1 + len(args.sink):]
+    for sink in args.sink:
+        subprocess.run([sys.executable, os.path.abspath(__file__), *rest, '--sink', sink], check=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+CloudTrailEvent 인스턴스당 메모리 사용량 벤치마크
+
+같은 레코드로 변경 전 모델(__dict__ 기반 dataclass, 문자열 시간)과
+현재 모델(slots dataclass, 파싱된 event_datetime 포함)을 만들어 이벤트당 할당량을 비교합니다.
+레코드 dict와 그 안의 값은 양쪽이 공유하므로 이벤트 객체 자체의 크기만 측정됩니다.
+
+사용법:
+    python benchmarks/bench_event_memory.py --count 200000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.cloud_trail import CloudTrailEvent  # noqa: E402
+
+
+@dataclass
+class LegacyUserIdentity:
+    type: str
+    principal_id: str
+    arn: str
+    account_id: str
+    access_key_id: Optional[str] = None
+    user_name: Optional[str] = None
+    session_context: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class LegacyTlsDetails:
+    tls_version: str
+    cipher_suite: str
+    client_provided_host_header: str
+
+
+@dataclass
+class LegacyCloudTrailEvent:
+    event_id: str
+    event_version: str
+    event_time: str
+    event_source: str
+    event_name: str
+    event_category: str
+    event_type: str
+    aws_region: str
+    read_only: bool
+    request_id: str
+    source_ip_address: str
+    user_agent: str
+    management_event: bool
+    recipient_account_id: str
+    user_identity: LegacyUserIdentity
+    request_parameters: Dict[str, Any]
+    response_elements: Dict[str, Any]
+    session_credential_from_console: Optional[str] = None
+    shared_event_id: str = None
+    error_code: str = None
+    error_message: str = None
+    tls_details: Optional[LegacyTlsDetails] = None
+    insight_details: Dict[str, Any] = None
+    resources: Dict[str, Any] = None
+
+
+def legacy_from_dict(data: Dict[str, Any]) -> LegacyCloudTrailEvent:
+    """변경 전 CloudTrailEvent.from_dict와 동일한 필드 구성"""
+    identity = data.get('userIdentity', {})
+    tls = data.get('tlsDetails')
+    return LegacyCloudTrailEvent(
+        event_id=data.get('eventID', ''),
+        event_version=data.get('eventVersion', ''),
+        event_time=data.get('eventTime', ''),
+        event_source=data.get('eventSource', ''),
+        event_name=data.get('eventName', ''),
+        event_category=data.get('eventCategory', ''),
+        event_type=data.get('eventType', ''),
+        aws_region=data.get('awsRegion', ''),
+        read_only=data.get('readOnly', False),
+        request_id=data.get('requestID', ''),
+        source_ip_address=data.get('sourceIPAddress', ''),
+        user_agent=data.get('userAgent', ''),
+        management_event=data.get('managementEvent', False),
+        recipient_account_id=data.get('recipientAccountId', ''),
+        session_credential_from_console=data.get('sessionCredentialFromConsole'),
+        shared_event_id=data.get('sharedEventId'),
+        error_code=data.get('errorCode'),
+        error_message=data.get('errorMessage'),
+        user_identity=LegacyUserIdentity(
+            type=identity.get('type', ''),
+            principal_id=identity.get('principalId', ''),
+            arn=identity.get('arn', ''),
+            account_id=identity.get('accountId', ''),
+            access_key_id=identity.get('accessKeyId'),
+            user_name=identity.get('userName'),
+            session_context=identity.get('sessionContext'),
+        ),
+        tls_details=LegacyTlsDetails(
+            tls_version=tls.get('tlsVersion', ''),
+            cipher_suite=tls.get('cipherSuite', ''),
+            client_provided_host_header=tls.get('clientProvidedHostHeader', ''),
+        ) if tls else None,
+        request_parameters=data.get('requestParameters', {}),
+        response_elements=data.get('responseElements', {}),
+        insight_details=data.get('insightDetails'),
+        resources=data.get('resources'),
+    )
+
+
+def make_records(count: int):
+    base = datetime(2025, 9, 3)
+    return [{
+        'eventVersion': '1.08',
+        'userIdentity': {
+            'type': 'IAMUser', 'principalId': 'AIDAEXAMPLE', 'arn': 'arn:aws:iam::123456789012:user/alice',
+            'accountId': '123456789012', 'accessKeyId': 'AKIAEXAMPLE', 'userName': 'alice',
+        },
+        'eventTime': (base + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'eventSource': 's3.amazonaws.com',
+        'eventName': 'GetObject',
+        'awsRegion': 'ap-northeast-2',
+        'sourceIPAddress': '203.0.113.10',
+        'userAgent': 'aws-cli/2.15.0',
+        'requestParameters': {'bucketName': 'example', 'key': f'object-{i}'},
+        'responseElements': None,
+        'requestID': uuid.uuid4().hex,
+        'eventID': str(uuid.uuid4()),
+        'readOnly': True,
+        'eventType': 'AwsApiCall',
+        'managementEvent': False,
+        'recipientAccountId': '123456789012',
+        'eventCategory': 'Data',
+        'tlsDetails': {'tlsVersion': 'TLSv1.3', 'cipherSuite': 'TLS_AES_128_GCM_SHA256',
+                       'clientProvidedHostHeader': 'example.s3.amazonaws.com'},
+    } for i in range(count)]
+
+
+def measure(factory, records) -> float:
+    """레코드 전체를 변환할 때 새로 할당된 바이트 / 이벤트"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    events = [factory(record) for record in records]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del events
+    return allocated / len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CloudTrailEvent 메모리 벤치마크')
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    records = make_records(args.count)
+
+    legacy = measure(legacy_from_dict, records)
+    current = measure(CloudTrailEvent.from_dict, records)
+
+    print(f"이벤트 수: {args.count}")
+    print(f"변경 전 (dict 기반 dataclass): {legacy:8.1f} bytes/event")
+    print(f"현재 (slots + event_datetime): {current:8.1f} bytes/event")
+    print(f"절감: {legacy - current:8.1f} bytes/event ({(legacy - current) / legacy:.1%})")
+    print(f"1M 이벤트 기준: {(legacy - current) * 1_000_000 / 1024 / 1024:.0f} MiB 절감")
+
+
+if __name__ == '__main__':
+    main()
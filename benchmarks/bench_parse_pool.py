@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+로그 파싱 처리량 벤치마크 (스레드 vs 파싱 프로세스 풀)
+
+메모리에 만든 CloudTrail 로그 파일(.json.gz)을 gzip 해제 → JSON 디코딩 → COPY 행 인코딩까지
+처리하는 속도를 비교합니다. 다운로드 없이 CPU 작업만 측정하므로 코어 수에 따른 확장성을 볼 수 있습니다.
+
+- threads: 다운로드 스레드에서 파싱하는 기본 방식 (GIL로 코어 하나만 사용)
+- processes N: PARSE_PROCESSES=N과 같은 파싱 프로세스 풀
+
+사용법:
+    python benchmarks/bench_parse_pool.py --files 64 --records 2000 --processes 1 2 4 8
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from common import setup_environment
+
+setup_environment()
+
+from src.cloud_trail import CloudTrailEvent  # noqa: E402
+from src.cloudtrail_stream import iter_cloudtrail_records  # noqa: E402
+from src.direct_rds import build_rows, copy_line  # noqa: E402
+from src.parse_pool import ParsePool  # noqa: E402
+
+
+def make_file(records: int, start: datetime) -> bytes:
+    return gzip.compress(json.dumps({'Records': [{
+        'eventVersion': '1.08',
+        'userIdentity': {
+            'type': 'IAMUser', 'principalId': 'AIDAEXAMPLE', 'arn': 'arn:aws:iam::123456789012:user/alice',
+            'accountId': '123456789012', 'accessKeyId': 'AKIAEXAMPLE', 'userName': 'alice',
+            'sessionContext': {'attributes': {'mfaAuthenticated': 'false'}},
+        },
+        'eventTime': (start + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'eventSource': 's3.amazonaws.com',
+        'eventName': 'GetObject',
+        'awsRegion': 'ap-northeast-2',
+        'sourceIPAddress': '203.0.113.10',
+        'userAgent': 'aws-cli/2.15.0',
+        'requestParameters': {'bucketName': 'example', 'key': f'object-{i}'},
+        'responseElements': None,
+        'requestID': uuid.uuid4().hex,
+        'eventID': str(uuid.uuid4()),
+        'readOnly': True,
+        'eventType': 'AwsApiCall',
+        'managementEvent': False,
+        'recipientAccountId': '123456789012',
+        'eventCategory': 'Data',
+        'tlsDetails': {'tlsVersion': 'TLSv1.3', 'cipherSuite': 'TLS_AES_128_GCM_SHA256',
+                       'clientProvidedHostHeader': 'example.s3.amazonaws.com'},
+    } for i in range(records)]}).encode())
+
+
+def parse_in_thread(data: bytes, group_id: str) -> int:
+    """스레드 방식과 같은 작업 (CloudTrailEvent 생성 후 COPY 행 인코딩)"""
+    count = 0
+    for record in iter_cloudtrail_records(io.BytesIO(data)):
+        event = CloudTrailEvent.from_dict(record)
+        events_row, cloudtrail_row = build_rows(event, group_id)
+        copy_line(events_row)
+        copy_line(cloudtrail_row)
+        count += 1
+    return count
+
+
+def run_threads(files, workers: int, group_id: str) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda data: parse_in_thread(data, group_id), files))
+    return time.perf_counter() - started
+
+
+def run_processes(files, processes: int, group_id: str) -> float:
+    parse_pool = ParsePool(processes, group_id)
+    try:
+        # 워커 기동 시간은 제외 (서비스에서는 한 번만 기동)
+        parse_pool.parse(files[0])
+        started = time.perf_counter()
+        futures = [parse_pool.submit(data) for data in files]
+        for future in futures:
+            future.result()
+        return time.perf_counter() - started
+    finally:
+        parse_pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='파싱 프로세스 풀 벤치마크')
+    parser.add_argument('--files', type=int, default=32)
+    parser.add_argument('--records', type=int, default=2000, help='파일당 레코드 수')
+    parser.add_argument('--threads', type=int, default=8, help='스레드 방식 워커 수 (S3_MAX_WORKERS)')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    group_id = os.environ['GROUP_ID']
+    start = datetime(2025, 9, 3)
+    files = [make_file(args.records, start + timedelta(minutes=5 * i)) for i in range(args.files)]
+    total_events = args.files * args.records
+    total_mb = sum(len(data) for data in files) / 1024 / 1024
+
+    print(f"파일 {args.files}개, 이벤트 {total_events}개, 압축 {total_mb:.1f} MiB, CPU {os.cpu_count()}개")
+
+    elapsed = run_threads(files, args.threads, group_id)
+    baseline = total_events / elapsed
+    print(f"threads ({args.threads}):   {elapsed:7.2f}초  {baseline:10,.0f} events/s  x1.00")
+
+    for processes in sorted(set(args.processes)):
+        elapsed = run_processes(files, processes, group_id)
+        rate = total_events / elapsed
+        print(f"processes ({processes}): {elapsed:7.2f}초  {rate:10,.0f} events/s  x{rate / baseline:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+벤치마크 공통 환경 설정
+
+벤치마크 스크립트는 src 패키지를 import하기 전에 setup_environment()를 호출합니다.
+- 저장소 루트를 import 경로에 추가
+- src.config가 필수로 요구하는 RDS 설정과 AWS 자격증명에 더미 값 지정 (이미 설정된 값은 유지, 워커 프로세스도 상속)
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+DEFAULT_ENV = {
+    'RDS_HOST': 'localhost', 'RDS_PORT': '5432', 'RDS_DATABASE': 'postgres',
+    'RDS_USER': 'postgres', 'RDS_PASSWORD': 'benchmark', 'GROUP_ID': str(uuid.uuid4()),
+    'AWS_DEFAULT_REGION': 'ap-northeast-2', 'AWS_ACCESS_KEY_ID': 'benchmark', 'AWS_SECRET_ACCESS_KEY': 'benchmark',
+    'CHECKPOINT_FILE': os.path.join(tempfile.gettempdir(), 'logsmith-bench-checkpoints.json'),
+}
+
+
+def setup_environment() -> None:
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    for name, value in DEFAULT_ENV.items():
+        os.environ.setdefault(name, value)
@@ -6,10 +6,13 @@ EC2에서 실행되는 CloudTrail 로그 수집 및 전송 메인 애플리케
 import json
 import logging
 import argparse
+import signal
 import sys
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from src.backfill import BackfillRunner
 from src.ec2_collector import EC2CloudTrailService
+from src.sqs_ingest import SqsIngestor
 from src.config import settings
 
 # 로그 설정
@@ -53,14 +56,18 @@ def main():
     parser = argparse.ArgumentParser(description='EC2 CloudTrail 로그 수집 및 전송 서비스')
     parser.add_argument('--config', '-c', 
                        help='전송자 설정 파일 경로 (JSON)')
-    parser.add_argument('--mode', choices=['once', 'service'], default='service',
-                       help='실행 모드: once(한번), service(서비스)')
+    parser.add_argument('--mode', choices=['once', 'service', 'backfill', 'sqs'], default='service',
+                       help='실행 모드: once(한번), service(서비스), backfill(구간 분할 병렬 수집, 재개 가능), sqs(S3 알림 기반 수집)')
     parser.add_argument('--events', nargs='*',
                        help='수집할 CloudTrail 이벤트 이름 목록')
     parser.add_argument('--start-date', 
                        help='시작 날짜/시간 (YYYY-MM-DD 또는 YYYY-MM-DD HH:MM:SS)')
     parser.add_argument('--end-date',
                        help='종료 날짜/시간 (YYYY-MM-DD 또는 YYYY-MM-DD HH:MM:SS)')
+    parser.add_argument('--shard', choices=['day', 'hour'],
+                       help='백필 구간 단위 (기본값: BACKFILL_SHARD)')
+    parser.add_argument('--workers', type=int,
+                       help='백필 동시 구간 수 (기본값: BACKFILL_WORKERS)')
 
     
     args = parser.parse_args()
@@ -112,13 +119,59 @@ def main():
         if args.mode == 'once':
             # 한 번만 실행
             logger.info("단일 실행 모드")
-            success = service.collect_and_send(
-                event_names=args.events,
-                start_time=start_date,
-                end_time=end_date
-            )
+            try:
+                success = service.collect_and_send(
+                    event_names=args.events,
+                    start_time=start_date,
+                    end_time=end_date
+                )
+            finally:
+                service.shutdown()
+            object_cache = service.s3_collector.object_cache if service.s3_collector else None
+            if object_cache is not None:
+                stats = object_cache.stats()
+                logger.info(
+                    f"객체 캐시: 적중 {stats['hits']}개, 미적중 {stats['misses']}개 "
+                    f"(캐시 {stats['entries']}개 파일, {stats['bytes'] / 1024 / 1024:.1f} MiB)"
+                )
             sys.exit(0 if success else 1)
             
+        elif args.mode == 'backfill':
+            # 백필 모드
+            if not start_date or not end_date:
+                logger.error("백필 모드에는 --start-date와 --end-date가 필요합니다.")
+                sys.exit(1)
+            logger.info("백필 모드")
+            runner = BackfillRunner(service, shard=args.shard, workers=args.workers)
+
+            def stop_backfill(signum, frame):
+                logger.info("종료 신호 수신 - 진행 중인 배치까지 저장 후 중단")
+                runner.stop()
+
+            signal.signal(signal.SIGINT, stop_backfill)
+            signal.signal(signal.SIGTERM, stop_backfill)
+            try:
+                success = runner.run(start_date, end_date, event_names=args.events)
+            finally:
+                service.shutdown()
+            sys.exit(0 if success else 1)
+
+        elif args.mode == 'sqs':
+            # SQS 알림 모드
+            logger.info("SQS 알림 수집 모드")
+            ingestor = SqsIngestor(service)
+
+            def stop_ingest(signum, frame):
+                logger.info("종료 신호 수신 - 현재 수신 대기가 끝나면 종료")
+                ingestor.stop()
+
+            signal.signal(signal.SIGINT, stop_ingest)
+            signal.signal(signal.SIGTERM, stop_ingest)
+            try:
+                ingestor.run(event_names=args.events)
+            finally:
+                service.shutdown()
+
         elif args.mode == 'service':
             # 서비스 모드
             logger.info("서비스 모드")
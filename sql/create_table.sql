@@ -19,30 +19,41 @@ CREATE TABLE IF NOT EXISTS events (
     FOREIGN KEY (group_id) REFERENCES groups(group_id)
 );
 
--- CloudTrail 로그 테이블
+-- CloudTrail 로그 테이블 (id = events.id, event_id = CloudTrail eventID)
 CREATE TABLE IF NOT EXISTS cloudtrail (
     id UUID PRIMARY KEY,
-    event_id UUID NOT NULL,
+    event_id VARCHAR(255) NOT NULL,
+    event_version VARCHAR(20),
     event_time TIMESTAMP NOT NULL,
-    event_name VARCHAR(255) NOT NULL,
     event_source VARCHAR(255) NOT NULL,
+    event_name VARCHAR(255) NOT NULL,
+    event_category VARCHAR(100),
+    event_type VARCHAR(100),
     aws_region VARCHAR(50) NOT NULL,
+    read_only BOOLEAN,
+    request_id VARCHAR(255),
     source_ip INET,
+    user_agent TEXT,
+    management_event BOOLEAN,
+    recipient_account_id VARCHAR(20),
+    session_credential_from_console VARCHAR(20),
+    shared_event_id VARCHAR(255),
+    error_code VARCHAR(255),
+    error_message TEXT,
     user_identity JSONB,
+    tls_details JSONB,
     request_parameters JSONB,
     response_elements JSONB,
-    cloudtrail_event_id VARCHAR(255) UNIQUE NOT NULL,
-    event_type VARCHAR(100),
-    management_event BOOLEAN,
-    recipient_account_id VARCHAR(20),
-    event_category VARCHAR(100),
+    insight_details JSONB,
+    resources JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (event_id) REFERENCES events(id)
+    FOREIGN KEY (id) REFERENCES events(id)
 );
 
 CREATE INDEX idx_cloudtrail_event_time ON cloudtrail (event_time);
 CREATE INDEX idx_cloudtrail_event_name ON cloudtrail (event_name);
-CREATE INDEX idx_cloudtrail_event_id ON cloudtrail (cloudtrail_event_id);
 CREATE INDEX idx_cloudtrail_user_identity ON cloudtrail USING GIN (user_identity);
 CREATE INDEX idx_events_group_id ON events (group_id);
-CREATE INDEX idx_cloudtrail_event_id_fk ON cloudtrail (event_id);
\ No newline at end of file
+
+-- CloudTrail eventID 유니크 보장 (중복 체크 조회에 사용, RDS_WRITE_MODE=idempotent의 ON CONFLICT 대상)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_cloudtrail_event_id_unique ON cloudtrail (event_id);
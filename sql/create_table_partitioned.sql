@@ -0,0 +1,67 @@
+-- PostgreSQL용 테이블 구조 (이벤트 시간 기준 범위 파티셔닝, PostgreSQL 12 이상)
+--
+-- RDS_PARTITIONING=true로 실행하면 수집기가 들어오는 데이터 시간에 맞춰 파티션을 미리 만들고
+-- PARTITION_RETENTION_DAYS가 지난 파티션은 DELETE 대신 DROP으로 정리합니다.
+-- 파티션 이름: events_pYYYYMMDD / cloudtrail_pYYYYMMDD (PARTITION_INTERVAL=month이면 _pYYYYMM)
+--
+-- 파티션 테이블의 PK/유니크 제약조건에는 파티션 키가 포함되어야 하므로
+-- events는 (id, occurred_at), cloudtrail은 (id, event_time)과 (event_id, event_time)으로 보장합니다.
+-- 같은 CloudTrail 이벤트는 항상 같은 eventTime을 가지므로 (event_id, event_time) 유니크는 event_id 유니크와 같습니다.
+-- cloudtrail → events 외래키는 두 테이블 파티션을 독립적으로 DROP할 수 있도록 두지 않습니다 (같은 트랜잭션에서 함께 저장됨).
+
+-- 그룹 테이블
+CREATE TABLE IF NOT EXISTS groups (
+    group_id UUID PRIMARY KEY,
+    group_name VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 이벤트 테이블 (occurred_at = CloudTrail eventTime)
+CREATE TABLE IF NOT EXISTS events (
+    id UUID NOT NULL,
+    group_id UUID NOT NULL,
+    source_product VARCHAR(255),
+    source_ip INET,
+    user_agent TEXT,
+    occurred_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, occurred_at),
+    FOREIGN KEY (group_id) REFERENCES groups(group_id)
+) PARTITION BY RANGE (occurred_at);
+
+-- CloudTrail 로그 테이블 (id = events.id, event_id = CloudTrail eventID)
+CREATE TABLE IF NOT EXISTS cloudtrail (
+    id UUID NOT NULL,
+    event_id VARCHAR(255) NOT NULL,
+    event_version VARCHAR(20),
+    event_time TIMESTAMP NOT NULL,
+    event_source VARCHAR(255) NOT NULL,
+    event_name VARCHAR(255) NOT NULL,
+    event_category VARCHAR(100),
+    event_type VARCHAR(100),
+    aws_region VARCHAR(50) NOT NULL,
+    read_only BOOLEAN,
+    request_id VARCHAR(255),
+    source_ip INET,
+    user_agent TEXT,
+    management_event BOOLEAN,
+    recipient_account_id VARCHAR(20),
+    session_credential_from_console VARCHAR(20),
+    shared_event_id VARCHAR(255),
+    error_code VARCHAR(255),
+    error_message TEXT,
+    user_identity JSONB,
+    tls_details JSONB,
+    request_parameters JSONB,
+    response_elements JSONB,
+    insight_details JSONB,
+    resources JSONB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, event_time),
+    UNIQUE (event_id, event_time)
+) PARTITION BY RANGE (event_time);
+
+-- 파티션별로 자동 생성되는 인덱스
+CREATE INDEX IF NOT EXISTS idx_cloudtrail_event_name ON cloudtrail (event_name);
+CREATE INDEX IF NOT EXISTS idx_cloudtrail_user_identity ON cloudtrail USING GIN (user_identity);
+CREATE INDEX IF NOT EXISTS idx_events_group_id ON events (group_id);
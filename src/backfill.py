@@ -0,0 +1,291 @@
+"""
+과거 구간 대량 수집 (백필)
+
+--start-date ~ --end-date 구간을 일/시간 단위 구간(shard)으로 나누어 여러 구간을 동시에 수집합니다.
+- 구간마다 파이프라인을 BACKFILL_FILES_PER_PASS개 파일씩 반복 실행해 구간 끝까지 수집
+- 배치 저장에 성공할 때마다 구간 안의 마지막 S3 키를 상태 파일에 기록 (중단 시 구간 중간부터 재개)
+- 다운로드/파싱에 실패한 파일은 구간 상태에 기록하고 구간 끝에서 다시 수집, 그래도 실패하면 구간 실패
+- 완료된 구간은 상태 파일에 기록되어 다시 실행하면 건너뜀
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .checkpoint import write_json_atomic
+from .config import settings
+from .pipeline import CollectionPipeline
+
+logger = logging.getLogger(__name__)
+
+
+class BackfillRunner:
+    """구간 분할 + 병렬 + 재개 가능한 백필 실행기"""
+
+    def __init__(
+        self,
+        service,
+        shard: Optional[str] = None,
+        workers: Optional[int] = None,
+        state_file: Optional[str] = None,
+        files_per_pass: Optional[int] = None
+    ):
+        """
+        Args:
+            service: EC2CloudTrailService (S3 수집기, 전송자, 파싱 프로세스 풀을 공유)
+            shard: 구간 단위 'day' 또는 'hour' (기본값: BACKFILL_SHARD)
+            workers: 동시에 처리할 구간 수 (기본값: BACKFILL_WORKERS)
+            state_file: 구간별 완료 상태 파일 (기본값: BACKFILL_STATE_FILE)
+            files_per_pass: 파이프라인 1회 실행 시 prefix당 파일 수 (기본값: BACKFILL_FILES_PER_PASS)
+        """
+        self.service = service
+        self.shard = shard or settings.backfill_shard
+        if self.shard not in ('day', 'hour'):
+            raise ValueError(f"지원하지 않는 BACKFILL_SHARD: {self.shard} (day 또는 hour)")
+        self.workers = max(1, workers or settings.backfill_workers)
+        self.state_file = state_file or settings.backfill_state_file
+        self.files_per_pass = max(1, files_per_pass or settings.backfill_files_per_pass)
+
+        self.running = True
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    def plan(self, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        """[start_time, end_time] 구간을 일/시간 경계로 나눈 (시작, 끝) 목록 (끝은 다음 구간 시작 - 1초)"""
+        step = timedelta(days=1) if self.shard == 'day' else timedelta(hours=1)
+        if self.shard == 'day':
+            boundary = datetime(start_time.year, start_time.month, start_time.day)
+        else:
+            boundary = start_time.replace(minute=0, second=0, microsecond=0)
+
+        shards = []
+        while boundary <= end_time:
+            shard_start = max(boundary, start_time)
+            shard_end = min(boundary + step - timedelta(seconds=1), end_time)
+            shards.append((shard_start, shard_end))
+            boundary += step
+        return shards
+
+    def shard_id(self, shard_start: datetime) -> str:
+        return shard_start.strftime('%Y-%m-%d' if self.shard == 'day' else '%Y-%m-%dT%H')
+
+    def run(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        event_names: Optional[List[str]] = None
+    ) -> bool:
+        """전체 구간 백필 (모든 구간이 완료되면 True)"""
+        shards = self.plan(start_time, end_time)
+        event_filter = sorted(event_names or [])
+        pending = [
+            (shard_start, shard_end) for shard_start, shard_end in shards
+            if not self._is_done(self.shard_id(shard_start), event_filter)
+        ]
+
+        logger.info(
+            f"백필 시작: {start_time} ~ {end_time}, {self.shard} 단위 구간 {len(shards)}개 "
+            f"(완료 {len(shards) - len(pending)}개 건너뜀), 동시 {self.workers}개, 상태 파일 {self.state_file}"
+        )
+        if not pending:
+            return True
+
+        started = time.monotonic()
+        completed = failed = 0
+        events_written = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backfill') as executor:
+            futures = {
+                executor.submit(self._run_shard, shard_start, shard_end, event_names, event_filter): shard_start
+                for shard_start, shard_end in pending
+            }
+            for future in as_completed(futures):
+                shard_id = self.shard_id(futures[future])
+                try:
+                    written = future.result()
+                except Exception as e:
+                    logger.error(f"[백필 {shard_id}] 구간 처리 오류: {e}")
+                    written = None
+
+                if written is None:
+                    failed += 1
+                else:
+                    completed += 1
+                    events_written += written
+
+                elapsed = time.monotonic() - started
+                finished = completed + failed
+                remaining = len(pending) - finished
+                eta = elapsed / finished * remaining
+                logger.info(
+                    f"백필 진행: {finished}/{len(pending)} 구간 (실패 {failed}개), 이벤트 {events_written}개, "
+                    f"{events_written / elapsed if elapsed > 0 else 0:,.0f} events/s, "
+                    f"경과 {timedelta(seconds=int(elapsed))}, 남은 시간 약 {timedelta(seconds=int(eta))}"
+                )
+
+        if failed or not self.running:
+            logger.warning(f"백필 미완료: 실패 {failed}개 구간, 다시 실행하면 완료되지 않은 구간부터 이어서 수집합니다")
+            return False
+
+        logger.info(f"백필 완료: 구간 {completed}개, 이벤트 {events_written}개, {time.monotonic() - started:.1f}초")
+        return True
+
+    def stop(self) -> None:
+        """진행 중인 파이프라인 실행까지만 마치고 중단 (상태 파일에서 재개 가능)"""
+        self.running = False
+
+    def _run_shard(
+        self,
+        shard_start: datetime,
+        shard_end: datetime,
+        event_names: Optional[List[str]],
+        event_filter: List[str]
+    ) -> Optional[int]:
+        """구간 하나를 끝까지 수집 (실패 또는 중단 시 None)"""
+        shard_id = self.shard_id(shard_start)
+        with self._lock:
+            entry = self._state['shards'].setdefault(shard_id, {})
+            # 이벤트 필터가 바뀌었으면 이전 진행 위치는 사용하지 않음
+            if entry.get('event_names') != event_filter:
+                entry.clear()
+            entry.update({'status': 'running', 'event_names': event_filter})
+            cursor: Dict[str, str] = dict(entry.get('cursor') or {})
+            # 진행 위치는 지나갔지만 다운로드/파싱에 실패한 파일 {체크포인트 키: [S3 키]}
+            failed_files = self._copy_files(entry.get('failed_files') or {})
+            written = entry.get('events', 0)
+
+        def commit(key: str, last_timestamp: Optional[datetime], last_key: Optional[str]):
+            if last_key:
+                cursor[key] = last_key
+            self._update_shard(shard_id, cursor=dict(cursor))
+
+        # 구간 안에서는 max_files 대신 BACKFILL_FILES_PER_PASS개씩 조회
+        bucket_configs = [dict(config, max_files=self.files_per_pass) for config in self.service.s3_bucket_configs]
+
+        while self.running:
+            previous_cursor = dict(cursor)
+            pipeline = CollectionPipeline(
+                self.service.s3_collector,
+                send_batch=self.service._send_to_senders,
+                duplicate_checker=self.service._duplicate_checker(),
+                on_commit=commit,
+                parse_pool=self.service.parse_pool,
+                send_rows=self.service._send_rows_to_senders,
+                spool_unchecked=self.service._spool_unchecked
+            )
+            result = pipeline.run(
+                bucket_configs,
+                event_names=event_names,
+                start_time=shard_start,
+                end_time=shard_end,
+                last_processed_keys=dict(cursor)
+            )
+            written += result.events_written
+            for key, obj_keys in result.failed_files.items():
+                known = failed_files.setdefault(key, [])
+                known.extend(obj_key for obj_key in obj_keys if obj_key not in known)
+            self._update_shard(shard_id, events=written, failed_files=self._copy_files(failed_files))
+
+            if not result.success:
+                self._update_shard(shard_id, status='failed')
+                logger.error(f"[백필 {shard_id}] 실패 prefix: {', '.join(sorted(result.failed_keys))}")
+                return None
+
+            # 더 가져올 파일이 없으면 건너뛴 파일을 다시 수집한 뒤 구간 완료
+            if result.stats['fetch'].files == 0:
+                if failed_files:
+                    logger.info(
+                        f"[백필 {shard_id}] 다운로드/파싱에 실패했던 파일 "
+                        f"{sum(len(keys) for keys in failed_files.values())}개 다시 수집"
+                    )
+                    retried, failed_files = self._retry_failed_files(bucket_configs, failed_files, event_names)
+                    written += retried
+                    if failed_files:
+                        self._update_shard(shard_id, status='failed', events=written, failed_files=self._copy_files(failed_files))
+                        logger.error(
+                            f"[백필 {shard_id}] 파일을 수집하지 못해 구간 실패로 기록 (다시 실행하면 해당 파일을 재시도): "
+                            + ', '.join(obj_key for keys in failed_files.values() for obj_key in keys)
+                        )
+                        return None
+                self._update_shard(
+                    shard_id,
+                    status='done',
+                    events=written,
+                    failed_files={},
+                    finished_at=datetime.now(timezone.utc).isoformat()
+                )
+                logger.info(f"[백필 {shard_id}] 구간 완료: 이벤트 {written}개")
+                return written
+
+            # 파일은 조회됐지만 진행 위치가 그대로면 조회된 파일을 모두 처리하지 못한 것 (다음 실행도 같은 파일에서 멈춤)
+            if cursor == previous_cursor:
+                self._update_shard(shard_id, status='failed')
+                logger.error(
+                    f"[백필 {shard_id}] 파일 {result.stats['fetch'].files}개를 모두 처리하지 못해 "
+                    f"진행 위치가 바뀌지 않음 (다운로드/파싱 실패), 구간 실패로 기록"
+                )
+                return None
+
+        self._update_shard(shard_id, status='stopped')
+        return None
+
+    def _retry_failed_files(
+        self,
+        bucket_configs: List[Dict[str, Any]],
+        failed_files: Dict[str, List[str]],
+        event_names: Optional[List[str]]
+    ) -> Tuple[int, Dict[str, List[str]]]:
+        """진행 위치가 지나간 실패 파일만 다시 수집 (진행 위치는 바꾸지 않음)
+
+        Returns:
+            (저장한 이벤트 수, 여전히 수집하지 못한 파일 {체크포인트 키: [S3 키]})
+        """
+        pipeline = CollectionPipeline(
+            self.service.s3_collector,
+            send_batch=self.service._send_to_senders,
+            duplicate_checker=self.service._duplicate_checker(),
+            parse_pool=self.service.parse_pool,
+            send_rows=self.service._send_rows_to_senders,
+            spool_unchecked=self.service._spool_unchecked
+        )
+        result = pipeline.run(bucket_configs, event_names=event_names, object_keys=failed_files)
+
+        # 다시 실패한 파일, 저장 실패 등으로 중단된 prefix는 지정한 파일 전체
+        remaining = {key: list(keys) for key, keys in result.failed_files.items()}
+        for key in result.failed_keys:
+            remaining[key] = list(failed_files[key])
+        return result.events_written, remaining
+
+    @staticmethod
+    def _copy_files(files: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        return {key: list(keys) for key, keys in files.items()}
+
+    def _is_done(self, shard_id: str, event_filter: List[str]) -> bool:
+        entry = self._state['shards'].get(shard_id) or {}
+        return entry.get('status') == 'done' and entry.get('event_names') == event_filter
+
+    def _update_shard(self, shard_id: str, **fields: Any) -> None:
+        """구간 상태 갱신 후 상태 파일에 즉시 기록"""
+        with self._lock:
+            self._state['shards'].setdefault(shard_id, {}).update(fields)
+            try:
+                write_json_atomic(self.state_file, self._state)
+            except Exception as e:
+                logger.error(f"백필 상태 파일 저장 실패: {e}")
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if isinstance(state.get('shards'), dict):
+                return state
+            logger.warning(f"백필 상태 파일 형식 오류, 새로 시작합니다: {self.state_file}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"백필 상태 파일 로드 실패, 새로 시작합니다: {e}")
+        return {'shards': {}}
@@ -0,0 +1,101 @@
+"""
+수집 체크포인트 로컬 저장소
+
+버킷/prefix별 마지막 처리 상태를 로컬 JSON 파일에 원자적으로 기록하여
+재시작(크래시 후 systemd 재시작 포함) 시 이어서 수집할 수 있게 합니다.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_key(bucket_name: str, prefix: Optional[str] = None) -> str:
+    """버킷 + prefix 조합의 체크포인트 키"""
+    return f"{bucket_name}/{prefix or ''}"
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """임시 파일에 쓴 뒤 rename하여 JSON 파일을 원자적으로 교체"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # rename 자체가 디스크에 반영되도록 디렉터리도 fsync
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class CheckpointStore:
+    """버킷/prefix별 체크포인트 파일 저장소
+
+    파일 형식:
+        {"version": 1, "checkpoints": {"<bucket>/<prefix>": {"last_timestamp": "2025-09-03T00:00:00",
+                                                             "last_key": "AWSLogs/.../....json.gz"}}}
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """체크포인트 로드 (파일이 없거나 손상된 경우 빈 dict)"""
+        if not os.path.exists(self.path):
+            logger.info(f"체크포인트 파일 없음, 처음부터 수집: {self.path}")
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            checkpoints = {}
+            for key, entry in data.get('checkpoints', {}).items():
+                last_timestamp = entry.get('last_timestamp')
+                checkpoints[key] = {
+                    **entry,
+                    'last_timestamp': datetime.fromisoformat(last_timestamp) if last_timestamp else None
+                }
+
+            logger.info(f"체크포인트 로드 완료: {len(checkpoints)}개 ({self.path})")
+            return checkpoints
+
+        except Exception as e:
+            logger.error(f"체크포인트 로드 실패, 무시하고 진행: {e}")
+            return {}
+
+    def save(self, checkpoints: Dict[str, Dict[str, Any]]) -> bool:
+        """체크포인트 전체를 원자적으로 저장"""
+        serialized = {}
+        for key, entry in checkpoints.items():
+            last_timestamp = entry.get('last_timestamp')
+            serialized[key] = {
+                **entry,
+                'last_timestamp': last_timestamp.isoformat() if last_timestamp else None
+            }
+
+        try:
+            write_json_atomic(self.path, {'version': CHECKPOINT_VERSION, 'checkpoints': serialized})
+            return True
+        except Exception as e:
+            logger.error(f"체크포인트 저장 실패: {e}")
+            return False
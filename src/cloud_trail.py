@@ -1,9 +1,42 @@
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 import json
+import sys
 
+# 대량 이벤트 보관 시 인스턴스별 __dict__를 없애 메모리 절감 (slots는 Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+def _intern(value: Any) -> Any:
+    """반복이 많은 문자열 필드(eventSource, awsRegion 등)를 이벤트끼리 공유하도록 intern
+
+    배치 안에서 같은 값이 수천 번 반복되므로 이벤트마다 별도 사본을 두지 않습니다.
+    intern된 문자열도 참조가 없어지면 해제됩니다. 문자열이 아니면 그대로 반환합니다.
+    """
+    try:
+        return sys.intern(value)
+    except TypeError:
+        return value
+
+
+def parse_event_time(event_time: str) -> Optional[datetime]:
+    """CloudTrail 이벤트 시간(2025-08-12T06:30:00Z)을 UTC 기준 naive datetime으로 파싱
+
+    형식이 맞지 않으면 None을 반환합니다.
+    """
+    if not event_time:
+        return None
+    try:
+        if event_time.endswith('Z'):
+            # 일반적인 형식은 strptime보다 빠른 fromisoformat으로 처리
+            return datetime.fromisoformat(event_time[:-1])
+        return datetime.strptime(event_time, '%Y-%m-%dT%H:%M:%S%z').replace(tzinfo=None)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(**_SLOTS)
 class UserIdentity:
     type: str
     principal_id: str
@@ -12,21 +45,24 @@ class UserIdentity:
     access_key_id: Optional[str] = None
     user_name: Optional[str] = None
     session_context: Optional[Dict[str, Any]] = None
+    # 원본 userIdentity 객체 (invokedBy, sessionContext.sessionIssuer 등 모든 필드를 그대로 저장하기 위해 보관)
+    raw: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'UserIdentity':
         return cls(
-            type=data.get('type', ''),
+            type=_intern(data.get('type', '')),
             principal_id=data.get('principalId', ''),
-            arn=data.get('arn', ''),
-            account_id=data.get('accountId', ''),
+            arn=_intern(data.get('arn', '')),
+            account_id=_intern(data.get('accountId', '')),
             access_key_id=data.get('accessKeyId'),
             user_name=data.get('userName'),
-            session_context=data.get('sessionContext')
+            session_context=data.get('sessionContext'),
+            raw=data
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TlsDetails:
     tls_version: str
     cipher_suite: str
@@ -41,7 +77,7 @@ class TlsDetails:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CloudTrailEvent:
     event_id: str
     event_version: str
@@ -67,6 +103,8 @@ class CloudTrailEvent:
     tls_details: Optional[TlsDetails] = None
     insight_details: Dict[str, Any] = None
     resources: Dict[str, Any] = None
+    # event_time을 한 번만 파싱해 둔 값 (UTC naive, 형식 오류 시 None)
+    event_datetime: Optional[datetime] = field(default=None, compare=False, repr=False)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CloudTrailEvent':
@@ -76,21 +114,24 @@ class CloudTrailEvent:
         if 'tlsDetails' in data:
             tls_details = TlsDetails.from_dict(data['tlsDetails'])
         
+        event_time = data.get('eventTime', '')
+        
         return cls(
             event_id=data.get('eventID', ''),
-            event_version=data.get('eventVersion', ''),
-            event_time=data.get('eventTime', ''),
-            event_source=data.get('eventSource', ''),
-            event_name=data.get('eventName', ''),
-            event_category=data.get('eventCategory', ''),
-            event_type=data.get('eventType', ''),
-            aws_region=data.get('awsRegion', ''),
+            event_version=_intern(data.get('eventVersion', '')),
+            event_time=event_time,
+            event_datetime=parse_event_time(event_time),
+            event_source=_intern(data.get('eventSource', '')),
+            event_name=_intern(data.get('eventName', '')),
+            event_category=_intern(data.get('eventCategory', '')),
+            event_type=_intern(data.get('eventType', '')),
+            aws_region=_intern(data.get('awsRegion', '')),
             read_only=data.get('readOnly', False),
             request_id=data.get('requestID', ''),
-            source_ip_address=data.get('sourceIPAddress', ''),
-            user_agent=data.get('userAgent', ''),
+            source_ip_address=_intern(data.get('sourceIPAddress', '')),
+            user_agent=_intern(data.get('userAgent', '')),
             management_event=data.get('managementEvent', False),
-            recipient_account_id=data.get('recipientAccountId', ''),
+            recipient_account_id=_intern(data.get('recipientAccountId', '')),
             session_credential_from_console=data.get('sessionCredentialFromConsole'),
             shared_event_id=data.get('sharedEventId'),
             error_code=data.get('errorCode'),
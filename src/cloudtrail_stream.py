@@ -0,0 +1,144 @@
+"""
+CloudTrail 로그 파일(.json.gz) 스트리밍 파싱
+
+파일 전체를 메모리에 올리지 않고 압축 해제와 JSON 디코딩을 점진적으로 수행하여
+Records 배열의 레코드를 하나씩 반환합니다. 메모리 사용량은 파일 크기가 아닌
+가장 큰 레코드 크기에 비례합니다.
+"""
+
+import codecs
+import gzip
+import json
+import re
+from typing import Any, BinaryIO, Dict, Iterator
+
+READ_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+# 디코딩한 값 뒤에 이 패턴만 남고 버퍼가 끝나면 값이 청크 경계에서 잘렸을 수 있음
+# (예: "-2.5e" → -2.5, "0." → 0으로 짧게 디코딩됨, "tru"처럼 잘린 리터럴은 디코딩 오류로 처리)
+_TRUNCATED_TAIL = re.compile(r'[0-9.eE+\-]*[ \t\n\r]*\Z')
+
+
+class _JsonTextStream:
+    """압축 해제된 바이트를 필요한 만큼만 읽어 문자열 버퍼로 유지"""
+
+    def __init__(self, fileobj: BinaryIO, chunk_size: int = READ_CHUNK_SIZE):
+        self._raw = fileobj
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 0) -> bool:
+        """버퍼에 데이터 추가 (EOF면 False)"""
+        if self.eof:
+            return False
+
+        chunk = self._raw.read(max(size, self._chunk_size))
+        # 이미 소비한 앞부분은 버림
+        remaining = self.buffer[self.pos:]
+        self.pos = 0
+
+        if not chunk:
+            self.eof = True
+            self.buffer = remaining + self._utf8.decode(b'', final=True)
+            return False
+
+        self.buffer = remaining + self._utf8.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 문자 반환 (소비하지 않음)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def next_char(self) -> str:
+        """공백을 건너뛴 다음 문자 소비"""
+        ch = self.peek()
+        if not ch:
+            raise ValueError("CloudTrail JSON이 예기치 않게 끝났습니다")
+        self.pos += 1
+        return ch
+
+    def expect(self, expected: str) -> None:
+        ch = self.next_char()
+        if ch != expected:
+            raise ValueError(f"CloudTrail JSON 형식 오류: '{expected}' 필요, '{ch}' 발견")
+
+    def decode_value(self) -> Any:
+        """현재 위치의 JSON 값 하나를 디코딩"""
+        if not self.peek():
+            raise ValueError("CloudTrail JSON이 예기치 않게 끝났습니다")
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # 값이 버퍼 경계에서 잘린 경우: 읽기 크기를 늘려가며 재시도
+                if self.fill(len(self.buffer) - self.pos):
+                    continue
+                raise
+
+            # 숫자는 버퍼 끝에서 잘린 채로도 앞부분만 디코딩될 수 있으므로
+            # 값 뒤에 다음 구분자가 보이거나 EOF가 될 때까지 채운 뒤 다시 디코딩
+            if not self.eof and _TRUNCATED_TAIL.match(self.buffer, end):
+                self.fill()
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_cloudtrail_records(fileobj: BinaryIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """gzip 압축된 CloudTrail 로그 스트림에서 Records 항목을 하나씩 반환
+
+    json.loads(...)['Records']와 동일한 레코드를 동일한 순서로 반환합니다.
+    """
+    stream = _JsonTextStream(gzip.GzipFile(fileobj=fileobj), chunk_size)
+
+    stream.expect('{')
+    if stream.peek() == '}':
+        stream.next_char()
+    else:
+        while True:
+            key = stream.decode_value()
+            if not isinstance(key, str):
+                raise ValueError("CloudTrail JSON 형식 오류: 객체 키가 문자열이 아닙니다")
+            stream.expect(':')
+
+            if key == 'Records':
+                if stream.peek() != '[':
+                    raise ValueError("CloudTrail JSON 형식 오류: Records가 배열이 아닙니다")
+                stream.next_char()
+
+                if stream.peek() == ']':
+                    stream.next_char()
+                else:
+                    while True:
+                        yield stream.decode_value()
+                        ch = stream.next_char()
+                        if ch == ']':
+                            break
+                        if ch != ',':
+                            raise ValueError(f"CloudTrail JSON 형식 오류: Records 배열 구분자 '{ch}'")
+            else:
+                # Records 이외의 최상위 키는 디코딩 후 버림
+                stream.decode_value()
+
+            ch = stream.next_char()
+            if ch == '}':
+                break
+            if ch != ',':
+                raise ValueError(f"CloudTrail JSON 형식 오류: 객체 구분자 '{ch}'")
+
+    if stream.peek():
+        raise ValueError("CloudTrail JSON 형식 오류: 최상위 객체 뒤에 추가 데이터가 있습니다")
@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     rds_database: str = Field(..., env="RDS_DATABASE", description="데이터베이스 이름")
     rds_user: str = Field(..., env="RDS_USER", description="데이터베이스 사용자")
     rds_password: str = Field(..., env="RDS_PASSWORD", description="데이터베이스 비밀번호 (필수)")
+    rds_write_mode: str = Field(default="copy", env="RDS_WRITE_MODE", description="저장 방식 (copy: COPY 일괄 저장, row: 개별 INSERT, idempotent: 중복 eventID를 DB에서 건너뜀)")
 
     # 애플리케이션 설정
     group_id: str = Field(..., env="GROUP_ID", description="이벤트 그룹 ID (필수)")
@@ -23,9 +24,67 @@ class Settings(BaseSettings):
     # 로그 설정
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
 
+    # 지표 설정
+    metrics_port: int = Field(default=0, env="METRICS_PORT", description="Prometheus /metrics HTTP 포트 (0이면 비활성화)")
+    metrics_host: str = Field(default="127.0.0.1", env="METRICS_HOST", description="지표 HTTP 서버 바인드 주소")
+    metrics_json_file: Optional[str] = Field(default=None, env="METRICS_JSON_FILE", description="지표 스냅샷 JSON 파일 경로 (없으면 비활성화)")
+    metrics_json_interval: int = Field(default=60, env="METRICS_JSON_INTERVAL", description="지표 JSON 기록 간격 (초)")
+
     # 수집 설정
     collection_interval: int = Field(default=300, env="COLLECTION_INTERVAL")
+    scheduler_adaptive: bool = Field(default=True, env="SCHEDULER_ADAPTIVE", description="적체/유휴 상태에 따라 수집 간격 자동 조절 (false면 COLLECTION_INTERVAL 고정)")
+    scheduler_min_interval: int = Field(default=60, env="SCHEDULER_MIN_INTERVAL", description="새 파일이 있을 때의 수집 간격 (초)")
+    scheduler_latency_target: Optional[int] = Field(default=None, env="SCHEDULER_LATENCY_TARGET", description="유휴 시 최대 수집 간격 = 허용 지연 (초, 없으면 COLLECTION_INTERVAL)")
+    scheduler_backoff_factor: float = Field(default=2.0, env="SCHEDULER_BACKOFF_FACTOR", description="새 파일이 없을 때 간격 증가 배수")
     batch_size: int = Field(default=100, env="BATCH_SIZE")
+    event_id_cache_size: int = Field(default=200000, env="EVENT_ID_CACHE_SIZE", description="최근 저장 eventID 캐시 크기 (0이면 비활성화)")
+    event_id_cache_ttl: int = Field(default=86400, env="EVENT_ID_CACHE_TTL", description="최근 저장 eventID 캐시 유지 시간 (초)")
+    dedup_chunk_size: int = Field(default=5000, env="DEDUP_CHUNK_SIZE", description="중복 체크 쿼리당 eventID 수")
+    checkpoint_file: str = Field(default="state/checkpoints.json", env="CHECKPOINT_FILE", description="버킷별 마지막 처리 위치 저장 파일")
+    spool_dir: Optional[str] = Field(default="state/spool", env="SPOOL_DIR", description="RDS 저장 실패 배치 스풀 디렉터리 (빈 값이면 비활성화)")
+    spool_max_bytes: int = Field(default=1024 * 1024 * 1024, env="SPOOL_MAX_BYTES", description="스풀 최대 크기 (바이트, 넘으면 스풀하지 않고 다음 사이클에 재수집)")
+
+    # 전송자 동시 전송 설정 (전송자별 독립 실행)
+    sender_timeout: float = Field(default=300.0, env="SENDER_TIMEOUT", description="전송자별 배치 전송 제한 시간 (초, 넘으면 기다리지 않고 다음 단계 진행)")
+    sender_retries: int = Field(default=2, env="SENDER_RETRIES", description="전송 실패 시 전송자별 재시도 횟수 (모두 실패하면 스풀)")
+    sender_retry_backoff: float = Field(default=1.0, env="SENDER_RETRY_BACKOFF", description="첫 재시도 대기 시간 (초, 재시도마다 2배)")
+
+    # Parquet 저장 설정 (RDS와 함께 컬럼 파일로 저장)
+    parquet_target: Optional[str] = Field(default=None, env="PARQUET_TARGET", description="Parquet 저장 위치 - 로컬 디렉터리 또는 s3://버킷/prefix (없으면 비활성화)")
+    parquet_compression: str = Field(default="zstd", env="PARQUET_COMPRESSION", description="Parquet 압축 코덱 (zstd, snappy, gzip, none)")
+
+    # 파티션 설정 (sql/create_table_partitioned.sql 스키마 사용 시)
+    rds_partitioning: bool = Field(default=False, env="RDS_PARTITIONING", description="events/cloudtrail 시간 범위 파티션 자동 관리 여부")
+    partition_interval: str = Field(default="day", env="PARTITION_INTERVAL", description="파티션 단위 (day 또는 month)")
+    partition_premake: int = Field(default=3, env="PARTITION_PREMAKE", description="현재 시점 이후 미리 만들어 둘 파티션 수")
+    partition_retention_days: int = Field(default=0, env="PARTITION_RETENTION_DAYS", description="보존 기간 (일, 지난 파티션은 DROP, 0이면 보존)")
+
+    # S3 다운로드 설정
+    s3_max_workers: int = Field(default=8, env="S3_MAX_WORKERS", description="전체 S3 객체 동시 다운로드 수")
+    prefix_scan_workers: int = Field(default=4, env="PREFIX_SCAN_WORKERS", description="계정 × 리전 prefix 동시 수집 수")
+    prefix_discovery_ttl: int = Field(default=3600, env="PREFIX_DISCOVERY_TTL", description="자동 탐색한 prefix 캐시 유지 시간 (초)")
+    object_cache_dir: Optional[str] = Field(default=None, env="OBJECT_CACHE_DIR", description="다운로드한 S3 객체 로컬 캐시 디렉터리 (없으면 비활성화)")
+    object_cache_max_bytes: int = Field(default=10 * 1024 * 1024 * 1024, env="OBJECT_CACHE_MAX_BYTES", description="객체 캐시 최대 크기 (바이트, 넘으면 오래 사용하지 않은 파일부터 삭제)")
+
+    # 파이프라인 설정 (다운로드 → 중복 제거 → 저장 단계 동시 실행)
+    pipeline_enabled: bool = Field(default=True, env="PIPELINE_ENABLED", description="단계별 파이프라인 사용 여부 (false면 전체 수집 후 한 번에 저장)")
+    pipeline_queue_size: int = Field(default=4, env="PIPELINE_QUEUE_SIZE", description="단계 사이 큐에 대기할 수 있는 최대 배치 수")
+    pipeline_files_per_batch: int = Field(default=20, env="PIPELINE_FILES_PER_BATCH", description="파이프라인 배치당 S3 파일 수")
+    parse_processes: int = Field(default=0, env="PARSE_PROCESSES", description="로그 파싱 워커 프로세스 수 (0이면 다운로드 스레드에서 파싱, 파이프라인 모드 전용)")
+
+    # SQS 알림 수집 설정 (ec2_main.py --mode sqs)
+    sqs_queue_url: Optional[str] = Field(default=None, env="SQS_QUEUE_URL", description="S3 로그 파일 생성 알림을 받는 SQS 큐 URL")
+    sqs_wait_time_seconds: int = Field(default=20, env="SQS_WAIT_TIME_SECONDS", description="SQS 롱 폴링 대기 시간 (초, 최대 20)")
+    sqs_max_messages: int = Field(default=10, env="SQS_MAX_MESSAGES", description="한 번에 수신할 SQS 메시지 수 (최대 10)")
+    sqs_visibility_timeout: int = Field(default=0, env="SQS_VISIBILITY_TIMEOUT", description="수신 메시지 가시성 제한 시간 (초, 0이면 큐 기본값)")
+    sqs_endpoint_url: Optional[str] = Field(default=None, env="SQS_ENDPOINT_URL", description="SQS 엔드포인트 (로컬 테스트용, 없으면 AWS)")
+    s3_endpoint_url: Optional[str] = Field(default=None, env="S3_ENDPOINT_URL", description="S3 엔드포인트 (로컬 테스트용, 없으면 AWS)")
+
+    # 백필 설정 (ec2_main.py --mode backfill)
+    backfill_shard: str = Field(default="day", env="BACKFILL_SHARD", description="백필 구간 분할 단위 (day 또는 hour)")
+    backfill_workers: int = Field(default=4, env="BACKFILL_WORKERS", description="동시에 처리할 백필 구간 수")
+    backfill_files_per_pass: int = Field(default=500, env="BACKFILL_FILES_PER_PASS", description="구간 처리 시 prefix당 한 번에 조회할 파일 수")
+    backfill_state_file: str = Field(default="state/backfill.json", env="BACKFILL_STATE_FILE", description="백필 구간별 완료 상태 저장 파일")
 
     class Config:
         # systemd 환경변수 또는 시스템 환경변수에서 읽기
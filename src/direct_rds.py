@@ -2,34 +2,49 @@
 직접 PostgreSQL RDS 접근
 """
 
+import io
 import logging
 import json
 import uuid
 import socket
 import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime
-from typing import Dict, Any, Optional
-from .cloud_trail import CloudTrailLogData
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Sequence, Union
+from .cloud_trail import CloudTrailLogData, CloudTrailEvent
 from .config import settings
+from .event_cache import RecentEventIdCache
+from .metrics import metrics
+from .partitions import PartitionManager, event_time_range
+from .senders import Sender
+from .spool import DiskSpool
 
 logger = logging.getLogger(__name__)
 
 try:
     import psycopg2
-    from psycopg2 import pool
+    from psycopg2 import errorcodes, pool
     PSYCOPG2_AVAILABLE = True
 except ImportError:
     PSYCOPG2_AVAILABLE = False
 
 
+IPV4_PATTERN = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
+
+# 소스 IP 판정 결과 캐시 크기 - 배치 대부분은 소수의 IP(서비스 엔드포인트, NAT)에서 발생
+IP_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=IP_CACHE_SIZE)
 def is_valid_ip(ip_str: str) -> bool:
     """IP 주소 유효성 검사"""
     if not ip_str:
         return False
     
     # IPv4 패턴 체크
-    ipv4_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-    if re.match(ipv4_pattern, ip_str):
+    if IPV4_PATTERN.match(ip_str):
         parts = ip_str.split('.')
         return all(0 <= int(part) <= 255 for part in parts)
     
@@ -44,6 +59,7 @@ def is_valid_ip(ip_str: str) -> bool:
     return False
 
 
+@lru_cache(maxsize=IP_CACHE_SIZE)
 def process_ip_address(ip_str: str) -> Optional[str]:
     """IP 주소 처리 - 유효하지 않으면 None 반환"""
     if not ip_str:
@@ -57,10 +73,312 @@ def process_ip_address(ip_str: str) -> Optional[str]:
     return None
 
 
+EVENTS_COLUMNS = ('id', 'group_id', 'source_product', 'source_ip', 'user_agent', 'occurred_at', 'created_at')
+
+CLOUDTRAIL_COLUMNS = (
+    'id', 'event_id', 'event_version', 'event_time', 'event_source', 'event_name',
+    'event_category', 'event_type', 'aws_region', 'read_only', 'request_id',
+    'source_ip', 'user_agent', 'management_event', 'recipient_account_id',
+    'session_credential_from_console', 'shared_event_id', 'error_code', 'error_message',
+    'user_identity', 'tls_details', 'request_parameters', 'response_elements',
+    'insight_details', 'resources'
+)
+
+EVENTS_INSERT_SQL = f"""
+    INSERT INTO events ({', '.join(EVENTS_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(EVENTS_COLUMNS))})
+"""
+
+# 이미 저장된 eventID면 건너뜀 (RETURNING 결과가 없으면 events 행 삭제)
+CLOUDTRAIL_INSERT_SQL = f"""
+    INSERT INTO cloudtrail ({', '.join(CLOUDTRAIL_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(CLOUDTRAIL_COLUMNS))})
+    ON CONFLICT DO NOTHING
+    RETURNING id
+"""
+
+EVENTS_COPY_SQL = f"COPY events ({', '.join(EVENTS_COLUMNS)}) FROM STDIN"
+
+CLOUDTRAIL_COPY_SQL = f"COPY cloudtrail ({', '.join(CLOUDTRAIL_COLUMNS)}) FROM STDIN"
+
+
+# idempotent 모드: 스테이징 테이블을 거쳐 이미 있는 eventID는 건너뜀
+CLOUDTRAIL_STAGE_CREATE_SQL = """
+    CREATE TEMP TABLE cloudtrail_stage
+    (LIKE cloudtrail INCLUDING DEFAULTS)
+    ON COMMIT DROP
+"""
+
+CLOUDTRAIL_STAGE_COPY_SQL = f"COPY cloudtrail_stage ({', '.join(CLOUDTRAIL_COLUMNS)}) FROM STDIN"
+
+CLOUDTRAIL_STAGE_INSERT_SQL = f"""
+    INSERT INTO cloudtrail ({', '.join(CLOUDTRAIL_COLUMNS)})
+    SELECT {', '.join(CLOUDTRAIL_COLUMNS)} FROM cloudtrail_stage
+    ON CONFLICT DO NOTHING
+    RETURNING id
+"""
+
+EVENTS_DELETE_SQL = "DELETE FROM events WHERE id = ANY(%s)"
+
+# 배열 리터럴을 문자열로 바인딩하면 event_id 컬럼 타입(UUID/VARCHAR)의 배열로 해석됨
+EXISTING_EVENTS_SQL = """
+    SELECT DISTINCT event_id
+    FROM cloudtrail
+    WHERE event_id = ANY(%s)
+"""
+
+# 이벤트 시간 범위를 알면 해당 범위의 파티션/인덱스 구간만 조회
+EXISTING_EVENTS_IN_RANGE_SQL = """
+    SELECT DISTINCT event_id
+    FROM cloudtrail
+    WHERE event_id = ANY(%s)
+      AND event_time BETWEEN %s AND %s
+"""
+
+
+@dataclass
+class WriteResult:
+    """마지막 send_logs의 실제 저장 결과"""
+    inserted: int
+    skipped: int
+
+
+@dataclass
+class RowBatch:
+    """COPY 입력 형식으로 인코딩된 행 묶음 (파싱 프로세스 → 저장 단계 전달용)
+
+    이벤트마다 events / cloudtrail COPY 한 줄씩을 가지며, 중복 제거를 위해
+    eventID와 파싱된 이벤트 시간을 같은 순서로 함께 보관합니다.
+    """
+    event_ids: List[str] = field(default_factory=list)
+    event_times: List[Optional[datetime]] = field(default_factory=list)
+    events_lines: List[str] = field(default_factory=list)
+    cloudtrail_lines: List[str] = field(default_factory=list)
+    parsed: int = 0  # 이벤트 이름 필터 전 레코드 수 (지표용)
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+    def append(self, event_id: str, event_time: Optional[datetime], events_line: str, cloudtrail_line: str) -> None:
+        self.event_ids.append(event_id)
+        self.event_times.append(event_time)
+        self.events_lines.append(events_line)
+        self.cloudtrail_lines.append(cloudtrail_line)
+
+    def extend(self, other: 'RowBatch') -> None:
+        self.parsed += other.parsed
+        self.event_ids.extend(other.event_ids)
+        self.event_times.extend(other.event_times)
+        self.events_lines.extend(other.events_lines)
+        self.cloudtrail_lines.extend(other.cloudtrail_lines)
+
+    def select(self, indices: Iterable[int]) -> 'RowBatch':
+        """지정한 위치의 행만 담은 새 RowBatch"""
+        selected = RowBatch()
+        for idx in indices:
+            selected.append(self.event_ids[idx], self.event_times[idx], self.events_lines[idx], self.cloudtrail_lines[idx])
+        return selected
+
+    def copy_buffers(self) -> Tuple[str, str]:
+        """events / cloudtrail COPY 입력 버퍼"""
+        return ''.join(self.events_lines), ''.join(self.cloudtrail_lines)
+
+    def to_record(self) -> Dict[str, Any]:
+        """스풀 기록용 dict (JSON 직렬화 가능)"""
+        events_buffer, cloudtrail_buffer = self.copy_buffers()
+        return {
+            'ids': self.event_ids,
+            'times': [value.isoformat() if value else None for value in self.event_times],
+            'events': events_buffer,
+            'cloudtrail': cloudtrail_buffer,
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'RowBatch':
+        """to_record()로 만든 dict에서 복원 (COPY 입력 안의 개행은 모두 이스케이프되어 있음)"""
+        def split_lines(buffer: str) -> List[str]:
+            return [line + '\n' for line in buffer.split('\n')[:-1]]
+
+        return cls(
+            event_ids=list(record['ids']),
+            event_times=[datetime.fromisoformat(value) if value else None for value in record['times']],
+            events_lines=split_lines(record['events']),
+            cloudtrail_lines=split_lines(record['cloudtrail']),
+        )
+
+
+class TrackedConnectionPool:
+    """psycopg2 커넥션 풀 래퍼 - 대여 중/유휴 연결 수를 직접 집계 (풀 내부 속성에 의존하지 않음)"""
+
+    def __init__(self, connection_pool):
+        self._pool = connection_pool
+        self._lock = threading.Lock()
+        self._used = 0
+        # 반납 후 닫히지 않고 풀에 남은 연결
+        self._idle = set()
+
+    def getconn(self):
+        conn = self._pool.getconn()
+        with self._lock:
+            self._used += 1
+            self._idle.discard(conn)
+        return conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        try:
+            self._pool.putconn(conn, close=close)
+        finally:
+            with self._lock:
+                self._used -= 1
+                # 풀이 minconn을 넘는 연결은 반납 시 닫음
+                if not conn.closed:
+                    self._idle.add(conn)
+
+    def closeall(self) -> None:
+        self._pool.closeall()
+        with self._lock:
+            self._idle.clear()
+
+    def counts(self) -> Dict[str, int]:
+        """{'used': 대여 중 연결 수, 'idle': 풀에 남은 유휴 연결 수}"""
+        with self._lock:
+            return {'used': self._used, 'idle': len(self._idle)}
+
+
+class DuplicateCheckError(Exception):
+    """중복 체크 실패 - 결과를 신뢰할 수 없으므로 해당 배치를 전송하면 안 됨"""
+
+
+def pg_array_literal(values: Sequence[Any]) -> str:
+    """값 목록을 PostgreSQL 배열 리터럴('{"a","b"}')로 변환"""
+    return '{' + ','.join(
+        '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+        for value in values
+    ) + '}'
+
+
+def first_occurrences(event_ids: Sequence[str]) -> List[int]:
+    """eventID별로 처음 나온 위치 목록 (같은 eventID가 여러 파일에 실려 배치 안에서 반복될 수 있음)"""
+    seen = set()
+    indices = []
+    for idx, event_id in enumerate(event_ids):
+        if event_id not in seen:
+            seen.add(event_id)
+            indices.append(idx)
+    return indices
 
-class DirectRDSSender:
+
+def copy_value(value: Any) -> str:
+    """COPY text 형식으로 값 인코딩 (NULL은 \\N, 역슬래시/제어문자 이스케이프)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return (
+        value.replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def copy_line(values: Sequence[Any]) -> str:
+    """행 하나를 COPY text 형식의 한 줄로 인코딩"""
+    return '\t'.join(copy_value(value) for value in values) + '\n'
+
+
+COPY_ESCAPES = {'t': '\t', 'n': '\n', 'r': '\r'}
+COPY_ESCAPE_PATTERN = re.compile(r'\\(.)')
+
+
+def parse_copy_line(line: str) -> List[Optional[str]]:
+    """copy_line()으로 인코딩한 한 줄을 값 목록으로 복원 (NULL은 None, 그 외는 문자열)"""
+    values = []
+    for value in line.rstrip('\n').split('\t'):
+        if value == '\\N':
+            values.append(None)
+        elif '\\' in value:
+            values.append(COPY_ESCAPE_PATTERN.sub(lambda m: COPY_ESCAPES.get(m.group(1), m.group(1)), value))
+        else:
+            values.append(value)
+    return values
+
+
+def build_rows(event: CloudTrailEvent, group_id: str) -> Tuple[tuple, tuple]:
+    """이벤트 하나를 events / cloudtrail 테이블 행으로 변환 (같은 UUID로 연결)
+
+    파싱 프로세스에서도 사용하므로 DB 연결 없이 동작합니다.
+    """
+    # 1. events 테이블에 UUID 생성하여 삽입
+    event_uuid = str(uuid.uuid4())
+    # IP 주소 처리
+    processed_ip = process_ip_address(event.source_ip_address)
+
+    events_row = (event_uuid, group_id, 'cloudtrail', processed_ip, event.user_agent, event.event_time, datetime.now())
+
+    # 2. cloudtrail 테이블에 로그 데이터 삽입
+    # userIdentity는 원본 객체 전체 저장 (sessionContext, invokedBy 등 중첩 필드 유지)
+    user_identity_json = json.dumps(event.user_identity.raw)
+
+    request_parameters_json = json.dumps(event.request_parameters)
+    response_elements_json = json.dumps(event.response_elements)
+
+    # TLS details JSON 준비
+    tls_details_json = None
+    if event.tls_details:
+        tls_details_json = json.dumps({
+            'tlsVersion': event.tls_details.tls_version,
+            'cipherSuite': event.tls_details.cipher_suite,
+            'clientProvidedHostHeader': event.tls_details.client_provided_host_header
+        })
+
+    # insight_details JSON 준비
+    insight_details_json = json.dumps(event.insight_details) if event.insight_details else None
+
+    # resources JSON 준비
+    resources_json = json.dumps(event.resources) if event.resources else None
+
+    cloudtrail_row = (
+        event_uuid,
+        event.event_id,  # AWS CloudTrail의 실제 eventID 저장
+        event.event_version,
+        event.event_time,
+        event.event_source,
+        event.event_name,
+        event.event_category,
+        event.event_type,
+        event.aws_region,
+        event.read_only,
+        event.request_id,
+        processed_ip,  # 처리된 IP 주소 사용
+        event.user_agent,
+        event.management_event,
+        event.recipient_account_id,
+        event.session_credential_from_console,
+        event.shared_event_id,
+        event.error_code,
+        event.error_message,
+        user_identity_json,
+        tls_details_json,
+        request_parameters_json,
+        response_elements_json,
+        insight_details_json,
+        resources_json
+    )
+
+    return events_row, cloudtrail_row
+
+
+class DirectRDSSender(Sender):
     """직접 PostgreSQL RDS 전송"""
 
+    name = 'rds'
+    supports_rows = True
+
     def __init__(self, min_conn=1, max_conn=10):
         if not PSYCOPG2_AVAILABLE:
             raise Exception("psycopg2 설치 필요")
@@ -77,9 +395,27 @@ class DirectRDSSender:
         # settings에서 GROUP_ID 읽기
         self.group_id = settings.group_id
 
+        # 저장 방식 (copy: COPY 일괄 저장, row: 개별 INSERT, idempotent: 중복 eventID 건너뜀)
+        self.write_mode = settings.rds_write_mode.lower()
+        self.last_write_result: Optional[WriteResult] = None
+        if self.write_mode not in ('copy', 'row', 'idempotent'):
+            logger.warning(f"알 수 없는 RDS_WRITE_MODE: {settings.rds_write_mode}, row 모드 사용")
+            self.write_mode = 'row'
+
+        # 최근 저장한 eventID 캐시 (중복 체크 DB 조회 절감, 0이면 비활성화)
+        self.recent_event_ids = None
+        if settings.event_id_cache_size > 0:
+            self.recent_event_ids = RecentEventIdCache(
+                max_size=settings.event_id_cache_size,
+                ttl_seconds=settings.event_id_cache_ttl
+            )
+
+        # 시간 범위 파티션 관리 (RDS_PARTITIONING=true)
+        self.partitions = None
+
         # 커넥션 풀 생성
         try:
-            self.connection_pool = pool.ThreadedConnectionPool(
+            self.connection_pool = TrackedConnectionPool(pool.ThreadedConnectionPool(
                 min_conn,
                 max_conn,
                 host=self.rds_config['host'],
@@ -87,16 +423,206 @@ class DirectRDSSender:
                 database=self.rds_config['database'],
                 user=self.rds_config['user'],
                 password=self.rds_config['password']
-            )
+            ))
             logger.info(f"RDS 커넥션 풀 생성 완료: {settings.rds_host}:{settings.rds_port}/{settings.rds_database} (min={min_conn}, max={max_conn})")
         except Exception as e:
             logger.error(f"커넥션 풀 생성 실패: {e}")
             raise
 
         logger.info(f"RDS 연결 설정: {settings.rds_host}:{settings.rds_port}/{settings.rds_database}")
+
+        # 커넥션 풀 사용 현황 (지표 출력 시점에 계산)
+        metrics.register_gauge_callback(
+            'logsmith_db_pool_connections',
+            self.connection_pool.counts,
+            label='state'
+        )
+
+        if settings.rds_partitioning:
+            self.partitions = PartitionManager(
+                self.connection_pool,
+                interval=settings.partition_interval,
+                premake=settings.partition_premake,
+                retention_days=settings.partition_retention_days
+            )
+            logger.info(
+                f"파티션 관리 사용: 단위={settings.partition_interval}, 미리 생성={settings.partition_premake}개, "
+                f"보존={settings.partition_retention_days or '무제한'}일"
+            )
+
+        # 저장 실패 배치 로컬 스풀 (SPOOL_DIR이 비어 있으면 비활성화)
+        self.spool = None
+        if settings.spool_dir:
+            try:
+                self.spool = DiskSpool(settings.spool_dir, settings.spool_max_bytes)
+            except Exception as e:
+                logger.error(f"스풀 초기화 실패, 스풀 없이 실행: {e}")
         
+    def _build_rows(self, event: CloudTrailEvent) -> Tuple[tuple, tuple]:
+        """이벤트 하나를 events / cloudtrail 테이블 행으로 변환 (같은 UUID로 연결)"""
+        return build_rows(event, self.group_id)
+
     def send_logs(self, log_data: CloudTrailLogData) -> bool:
-        """PostgreSQL RDS에 직접 로그 전송"""
+        """PostgreSQL RDS에 직접 로그 전송
+
+        RDS_WRITE_MODE=copy이면 COPY로 일괄 저장하고, 실패 시 개별 INSERT로 재시도합니다.
+        RDS_WRITE_MODE=idempotent이면 이미 저장된 eventID를 DB에서 건너뜁니다.
+        배치 안에서 반복되는 eventID는 첫 이벤트만 저장하고, 사전 중복 체크 이후 다른 배치가 저장한 eventID는
+        모든 모드에서 DB가 건너뜁니다 (COPY는 유니크 위반 시 스테이징 경로로 다시 저장, INSERT는 ON CONFLICT).
+        실제 저장/건너뛴 건수는 last_write_result에 기록됩니다.
+        저장에 실패하면 False를 반환합니다 (재시도, 스풀 기록과 재전송은 SenderFanout이 담당).
+        """
+        if not log_data.records:
+            return True
+        return self._write_logs(log_data)
+
+    def _write_logs(self, log_data: CloudTrailLogData) -> bool:
+        records = log_data.records
+        keep = first_occurrences([event.event_id for event in records])
+        if len(keep) < len(records):
+            log_data = CloudTrailLogData(records=[records[idx] for idx in keep])
+
+        if not self._prepare_partitions(event.event_datetime for event in log_data.records):
+            return False
+
+        if self.write_mode == 'idempotent':
+            written = self._send_logs_idempotent(log_data)
+        elif self.write_mode == 'copy' and self._send_logs_copy(log_data):
+            written = True
+        else:
+            if self.write_mode == 'copy':
+                logger.warning("COPY 일괄 저장 실패, 개별 INSERT로 재시도")
+            written = self._send_logs_rows(log_data)
+
+        if not written:
+            return False
+        self._count_batch_duplicates(len(records) - len(keep))
+        return True
+
+    def send_rows(self, rows: RowBatch) -> bool:
+        """파싱 프로세스가 인코딩한 COPY 입력을 그대로 저장
+
+        행 단위 INSERT로 되돌릴 원본 이벤트가 없으므로 row 모드에서도 COPY를 사용합니다.
+        """
+        if not len(rows):
+            return True
+        return self._write_rows(rows)
+
+    def _write_rows(self, rows: RowBatch) -> bool:
+        total = len(rows)
+        keep = first_occurrences(rows.event_ids)
+        if len(keep) < total:
+            rows = rows.select(keep)
+
+        if not self._prepare_partitions(rows.event_times):
+            return False
+
+        events_buffer, cloudtrail_buffer = rows.copy_buffers()
+        if self.write_mode == 'idempotent':
+            written = self._copy_buffers_idempotent(events_buffer, cloudtrail_buffer, rows.event_ids)
+        else:
+            written = self._copy_buffers(events_buffer, cloudtrail_buffer, rows.event_ids)
+
+        if not written:
+            return False
+        self._count_batch_duplicates(total - len(keep))
+        return True
+
+    def _count_batch_duplicates(self, duplicates: int) -> None:
+        """배치 안에서 반복되어 저장하지 않은 이벤트를 건너뛴 건수에 반영"""
+        if duplicates:
+            self.last_write_result.skipped += duplicates
+            logger.info(f"배치 안 중복 eventID {duplicates}개 건너뜀")
+
+    def _encode_rows(self, events: List[CloudTrailEvent]) -> RowBatch:
+        """이벤트 목록을 COPY 입력 행으로 인코딩"""
+        rows = RowBatch()
+        for event in events:
+            events_row, cloudtrail_row = self._build_rows(event)
+            rows.append(event.event_id, event.event_datetime, copy_line(events_row), copy_line(cloudtrail_row))
+        return rows
+
+    def spool_batch(self, batch: Union[List[CloudTrailEvent], RowBatch], reason: str) -> bool:
+        """저장하지 못한 배치를 스풀에 기록 (재전송 시 중복 체크)"""
+        if not len(batch):
+            return True
+        if self.spool is None:
+            return False
+        rows = batch if isinstance(batch, RowBatch) else self._encode_rows(batch)
+        if not self.spool.append(rows.to_record()):
+            return False
+        self.last_write_result = WriteResult(inserted=0, skipped=0)
+        logger.warning(f"{reason}, {len(rows)}개 이벤트를 로컬 스풀에 기록 (DB 복구 후 재전송)")
+        return True
+
+    def replay_spool(self) -> int:
+        """스풀에 쌓인 배치를 오래된 순서로 재전송 (DB 장애가 계속되면 중단), 재전송한 배치 수 반환"""
+        if self.spool is None or not self.spool.has_pending():
+            return 0
+
+        replayed = self.spool.replay(self._replay_record)
+        if replayed:
+            logger.info(f"스풀 재전송 완료: 배치 {replayed}개 (남은 용량 {self.spool.pending_bytes() / 1024 / 1024:.1f} MiB)")
+        return replayed
+
+    def _replay_record(self, record: Dict[str, Any]) -> bool:
+        """스풀 레코드 하나 재전송 (실패하면 False로 재전송 중단)"""
+        rows = RowBatch.from_record(record)
+
+        if self.write_mode != 'idempotent':
+            # 커밋 응답만 유실된 경우 이미 저장되었을 수 있으므로 중복 체크 후 저장
+            try:
+                existing = self.check_existing_events(rows.event_ids, time_range=event_time_range(rows.event_times))
+            except DuplicateCheckError as e:
+                logger.error(f"스풀 재전송 중복 체크 실패: {e}")
+                return False
+            rows = rows.select(idx for idx, event_id in enumerate(rows.event_ids) if event_id not in existing)
+            if not len(rows):
+                return True
+
+        if self._write_rows(rows):
+            return True
+
+        # DB는 정상인데 저장이 실패하면 데이터 문제 - 뒤 배치가 막히지 않도록 따로 보관
+        if self._ping():
+            logger.error(f"스풀 배치 {len(rows)}개 이벤트 저장 불가, {self.spool.directory}/rejected.bin으로 이동")
+            self.spool.reject(record)
+            return True
+        return False
+
+    def _ping(self) -> bool:
+        """DB 연결 확인"""
+        conn = None
+        try:
+            conn = self.connection_pool.getconn()
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+        finally:
+            if conn:
+                self.connection_pool.putconn(conn)
+
+    def _prepare_partitions(self, event_times: Iterable[Optional[datetime]]) -> bool:
+        """배치가 들어갈 파티션 준비 (파티션 미사용 시 항상 True)"""
+        if self.partitions is None:
+            return True
+        try:
+            self.partitions.ensure_partitions(event_times)
+            return True
+        except Exception as e:
+            logger.error(f"파티션 생성 오류: {e}")
+            return False
+
+    @property
+    def handles_duplicates(self) -> bool:
+        """DB 제약조건으로 중복을 건너뛰는 모드인지 (True면 사전 중복 체크 불필요)"""
+        return self.write_mode == 'idempotent'
+
+    def _send_logs_rows(self, log_data: CloudTrailLogData) -> bool:
+        """이벤트마다 INSERT 실행 (events → cloudtrail)"""
         conn = None
         try:
             # 커넥션 풀에서 연결 가져오기
@@ -104,84 +630,25 @@ class DirectRDSSender:
 
             cursor = conn.cursor()
 
-            for event in log_data.records:
-                # 1. events 테이블에 UUID 생성하여 삽입
-                event_uuid = str(uuid.uuid4())
-                # IP 주소 처리
-                processed_ip = process_ip_address(event.source_ip_address)
-                
-                cursor.execute("""
-                    INSERT INTO events (id, group_id, source_product, source_ip, user_agent, created_at)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (event_uuid, self.group_id, 'cloudtrail', processed_ip, event.user_agent, datetime.now()))
-                
-                # 2. cloudtrail 테이블에 로그 데이터 삽입
-                user_identity_json = json.dumps({
-                    'type': event.user_identity.type,
-                    'principalId': event.user_identity.principal_id,
-                    'arn': event.user_identity.arn,
-                    'accountId': event.user_identity.account_id,
-                    'accessKeyId': event.user_identity.access_key_id,
-                    'userName': event.user_identity.user_name
-                })
-                
-                request_parameters_json = json.dumps(event.request_parameters)
-                response_elements_json = json.dumps(event.response_elements)
-                
-                # TLS details JSON 준비
-                tls_details_json = None
-                if event.tls_details:
-                    tls_details_json = json.dumps({
-                        'tlsVersion': event.tls_details.tls_version,
-                        'cipherSuite': event.tls_details.cipher_suite,
-                        'clientProvidedHostHeader': event.tls_details.client_provided_host_header
-                    })
-
-                # insight_details JSON 준비
-                insight_details_json = json.dumps(event.insight_details) if event.insight_details else None
-
-                # resources JSON 준비
-                resources_json = json.dumps(event.resources) if event.resources else None
-
-                cursor.execute("""
-                    INSERT INTO cloudtrail
-                    (id, event_id, event_version, event_time, event_source, event_name,
-                     event_category, event_type, aws_region, read_only, request_id,
-                     source_ip, user_agent, management_event, recipient_account_id,
-                     session_credential_from_console, shared_event_id, error_code, error_message,
-                     user_identity, tls_details, request_parameters, response_elements,
-                     insight_details, resources)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    event_uuid,
-                    event.event_id,  # AWS CloudTrail의 실제 eventID 저장
-                    event.event_version,
-                    event.event_time,
-                    event.event_source,
-                    event.event_name,
-                    event.event_category,
-                    event.event_type,
-                    event.aws_region,
-                    event.read_only,
-                    event.request_id,
-                    processed_ip,  # 처리된 IP 주소 사용
-                    event.user_agent,
-                    event.management_event,
-                    event.recipient_account_id,
-                    event.session_credential_from_console,
-                    event.shared_event_id,
-                    event.error_code,
-                    event.error_message,
-                    user_identity_json,
-                    tls_details_json,
-                    request_parameters_json,
-                    response_elements_json,
-                    insight_details_json,
-                    resources_json
-                ))
+            # 이벤트별 구문 대신 배치 전체 INSERT 시간을 기록
+            skipped_ids = []
+            with metrics.timer('logsmith_db_statement_seconds', statement='insert_rows'):
+                for event in log_data.records:
+                    events_row, cloudtrail_row = self._build_rows(event)
+                    cursor.execute(EVENTS_INSERT_SQL, events_row)
+                    cursor.execute(CLOUDTRAIL_INSERT_SQL, cloudtrail_row)
+                    if cursor.fetchone() is None:
+                        # 이미 저장된 eventID - 연결할 cloudtrail 행이 없는 events 행은 삭제
+                        skipped_ids.append(events_row[0])
+                if skipped_ids:
+                    cursor.execute(EVENTS_DELETE_SQL, (pg_array_literal(skipped_ids),))
             
-            conn.commit()
-            logger.info(f"PostgreSQL 저장 완료: {len(log_data.records)}개")
+            with metrics.timer('logsmith_db_statement_seconds', statement='commit'):
+                conn.commit()
+            self._remember_written([event.event_id for event in log_data.records])
+            inserted = len(log_data.records) - len(skipped_ids)
+            self.last_write_result = WriteResult(inserted=inserted, skipped=len(skipped_ids))
+            logger.info(f"PostgreSQL 저장 완료: 신규 {inserted}개, 중복 건너뜀 {len(skipped_ids)}개")
             return True
 
         except Exception as e:
@@ -193,12 +660,174 @@ class DirectRDSSender:
             if conn:
                 # 커넥션을 풀에 반환
                 self.connection_pool.putconn(conn)
+
+    def _send_logs_copy(self, log_data: CloudTrailLogData) -> bool:
+        """배치 전체를 COPY FROM STDIN으로 저장 (테이블당 1회 왕복)"""
+        try:
+            events_buffer, cloudtrail_buffer = self._encode_copy_buffers(log_data)
+        except Exception as e:
+            logger.error(f"COPY 입력 인코딩 오류: {e}")
+            return False
+
+        return self._copy_buffers(events_buffer, cloudtrail_buffer, [event.event_id for event in log_data.records])
+
+    def _copy_buffers(self, events_buffer: str, cloudtrail_buffer: str, event_ids: List[str]) -> bool:
+        """인코딩된 COPY 입력을 events → cloudtrail 순으로 저장"""
+        conn = None
+        try:
+            # 커넥션 풀에서 연결 가져오기
+            conn = self.connection_pool.getconn()
+
+            cursor = conn.cursor()
+
+            # events를 먼저 저장해야 cloudtrail의 외래키가 유효함
+            with metrics.timer('logsmith_db_statement_seconds', statement='copy_events'):
+                cursor.copy_expert(EVENTS_COPY_SQL, io.StringIO(events_buffer))
+            with metrics.timer('logsmith_db_statement_seconds', statement='copy_cloudtrail'):
+                cursor.copy_expert(CLOUDTRAIL_COPY_SQL, io.StringIO(cloudtrail_buffer))
+
+            with metrics.timer('logsmith_db_statement_seconds', statement='commit'):
+                conn.commit()
+            self._remember_written(event_ids)
+            self.last_write_result = WriteResult(inserted=len(event_ids), skipped=0)
+            logger.info(f"PostgreSQL COPY 저장 완료: {len(event_ids)}개")
+            return True
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            if getattr(e, 'pgcode', None) != errorcodes.UNIQUE_VIOLATION:
+                logger.error(f"PostgreSQL COPY 저장 오류: {e}")
+                return False
+        finally:
+            if conn:
+                # 커넥션을 풀에 반환
+                self.connection_pool.putconn(conn)
+
+        # 중복 체크 이후 다른 배치가 같은 eventID를 저장한 경우 - 스테이징 경로로 중복을 건너뛰어 저장
+        logger.warning("COPY 중 이미 저장된 eventID 발견, 중복을 건너뛰는 방식으로 다시 저장")
+        return self._copy_buffers_idempotent(events_buffer, cloudtrail_buffer, event_ids)
     
-    def check_existing_events(self, event_ids: list) -> set:
-        """기존에 저장된 eventID들 확인"""
+    def _send_logs_idempotent(self, log_data: CloudTrailLogData) -> bool:
+        """이미 저장된 eventID는 건너뛰는 일괄 저장 (cloudtrail.event_id 유니크 인덱스 필요)
+
+        1. events는 전부 COPY, cloudtrail은 임시 스테이징 테이블로 COPY
+        2. 스테이징 → cloudtrail INSERT ... ON CONFLICT DO NOTHING
+        3. cloudtrail에 들어가지 못한 행의 events 행 삭제 (고아 행 방지)
+        모두 한 트랜잭션이므로 다른 세션에는 최종 결과만 보입니다.
+        """
+        try:
+            events_buffer, cloudtrail_buffer = self._encode_copy_buffers(log_data)
+        except Exception as e:
+            logger.error(f"COPY 입력 인코딩 오류: {e}")
+            return False
+
+        return self._copy_buffers_idempotent(
+            events_buffer, cloudtrail_buffer, [event.event_id for event in log_data.records]
+        )
+
+    def _copy_buffers_idempotent(self, events_buffer: str, cloudtrail_buffer: str, event_ids: List[str]) -> bool:
+        """인코딩된 COPY 입력을 스테이징 테이블을 거쳐 저장 (중복 eventID 건너뜀)"""
+        conn = None
+        try:
+            # 커넥션 풀에서 연결 가져오기
+            conn = self.connection_pool.getconn()
+
+            cursor = conn.cursor()
+
+            with metrics.timer('logsmith_db_statement_seconds', statement='copy_events'):
+                cursor.copy_expert(EVENTS_COPY_SQL, io.StringIO(events_buffer))
+
+            cursor.execute(CLOUDTRAIL_STAGE_CREATE_SQL)
+            with metrics.timer('logsmith_db_statement_seconds', statement='stage_copy'):
+                cursor.copy_expert(CLOUDTRAIL_STAGE_COPY_SQL, io.StringIO(cloudtrail_buffer))
+
+            with metrics.timer('logsmith_db_statement_seconds', statement='stage_insert'):
+                cursor.execute(CLOUDTRAIL_STAGE_INSERT_SQL)
+                inserted_ids = {str(row[0]) for row in cursor.fetchall()}
+
+            # 건너뛴 행 = 스테이징한 행(COPY 입력 첫 컬럼 id) 중 RETURNING에 없는 행
+            skipped_ids = [
+                row_id for row_id in (line.partition('\t')[0] for line in cloudtrail_buffer.split('\n') if line)
+                if row_id not in inserted_ids
+            ]
+            if skipped_ids:
+                with metrics.timer('logsmith_db_statement_seconds', statement='stage_cleanup'):
+                    cursor.execute(EVENTS_DELETE_SQL, (pg_array_literal(skipped_ids),))
+
+            with metrics.timer('logsmith_db_statement_seconds', statement='commit'):
+                conn.commit()
+            # 건너뛴 eventID도 DB에 이미 존재하므로 캐시에 추가
+            self._remember_written(event_ids)
+            self.last_write_result = WriteResult(inserted=len(inserted_ids), skipped=len(skipped_ids))
+            logger.info(
+                f"PostgreSQL 저장 완료: 신규 {len(inserted_ids)}개, "
+                f"중복 건너뜀 {len(skipped_ids)}개"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"PostgreSQL 저장 오류: {e}")
+            if conn:
+                conn.rollback()
+            return False
+        finally:
+            if conn:
+                # 커넥션을 풀에 반환
+                self.connection_pool.putconn(conn)
+
+    def _encode_copy_buffers(self, log_data: CloudTrailLogData) -> Tuple[str, str]:
+        """배치를 events / cloudtrail COPY 입력 버퍼로 인코딩"""
+        events_lines = []
+        cloudtrail_lines = []
+        for event in log_data.records:
+            events_row, cloudtrail_row = self._build_rows(event)
+            events_lines.append(copy_line(events_row))
+            cloudtrail_lines.append(copy_line(cloudtrail_row))
+        return ''.join(events_lines), ''.join(cloudtrail_lines)
+
+    def _remember_written(self, event_ids: Iterable[str]):
+        """커밋된 eventID를 최근 저장 캐시에 추가"""
+        if self.recent_event_ids is not None:
+            self.recent_event_ids.add_many(event_ids)
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """최근 저장 eventID 캐시 통계 (비활성화 시 None)"""
+        if self.recent_event_ids is None:
+            return None
+        return self.recent_event_ids.stats()
+
+    def check_existing_events(
+        self,
+        event_ids: list,
+        time_range: Optional[Tuple[datetime, datetime]] = None
+    ) -> set:
+        """기존에 저장된 eventID들 확인
+
+        최근 이 프로세스가 저장한 ID는 캐시로 판정하고, 나머지만 DB에서 조회합니다.
+        time_range(이벤트 시간 최소, 최대)를 주면 그 범위의 파티션만 조회합니다.
+
+        Raises:
+            DuplicateCheckError: DB 조회 실패 시
+        """
         if not event_ids:
             return set()
 
+        cached_ids = set()
+        if self.recent_event_ids is not None:
+            cached_ids, event_ids = self.recent_event_ids.split_known(event_ids)
+            stats = self.recent_event_ids.stats()
+            logger.info(
+                f"eventID 캐시: {len(cached_ids)}개 적중, {len(event_ids)}개 DB 확인 필요 "
+                f"(누적 적중률 {stats['hit_rate']:.1%}, 크기 {stats['size']}/{stats['max_size']})"
+            )
+            if not event_ids:
+                return cached_ids
+
+        # 같은 ID가 여러 번 들어와도 한 번만 조회
+        event_ids = list(dict.fromkeys(event_ids))
+        chunk_size = max(1, settings.dedup_chunk_size)
+
         conn = None
         try:
             # 커넥션 풀에서 연결 가져오기
@@ -206,23 +835,28 @@ class DirectRDSSender:
 
             cursor = conn.cursor()
 
-            # eventID들을 IN 절로 한번에 조회
-            placeholders = ','.join(['%s'] * len(event_ids))
-            query = f"""
-                SELECT DISTINCT event_id
-                FROM cloudtrail
-                WHERE event_id IN ({placeholders})
-            """
+            # eventID 배열을 파라미터 하나로 바인딩하고, 대량 입력은 청크 단위로 조회
+            existing_events = set()
+            for start in range(0, len(event_ids), chunk_size):
+                chunk = event_ids[start:start + chunk_size]
+                with metrics.timer('logsmith_db_statement_seconds', statement='dedup_lookup'):
+                    if time_range:
+                        cursor.execute(EXISTING_EVENTS_IN_RANGE_SQL, (pg_array_literal(chunk), *time_range))
+                    else:
+                        cursor.execute(EXISTING_EVENTS_SQL, (pg_array_literal(chunk),))
+                    existing_events.update(row[0] for row in cursor.fetchall())
 
-            cursor.execute(query, event_ids)
-            existing_events = {row[0] for row in cursor.fetchall()}
+            conn.rollback()  # 읽기 전용 트랜잭션 종료
 
             logger.info(f"기존 이벤트 확인: {len(existing_events)}/{len(event_ids)}개 중복")
-            return existing_events
+            return cached_ids | existing_events
 
         except Exception as e:
+            # 조회 실패를 빈 결과로 처리하면 모든 이벤트가 신규로 판정되므로 호출자에게 알림
             logger.error(f"기존 이벤트 확인 오류: {e}")
-            return set()
+            if conn:
+                conn.rollback()
+            raise DuplicateCheckError(f"기존 이벤트 확인 실패: {e}") from e
         finally:
             if conn:
                 # 커넥션을 풀에 반환
@@ -2,15 +2,21 @@
 EC2에서 실행되는 CloudTrail 로그 수집 및 전송 서비스
 """
 
-import time
 import logging
 import signal
 import sys
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
+from .checkpoint import CheckpointStore
 from .cloud_trail import CloudTrailCollector
 from .s3_cloudtrail import S3CloudTrailCollector
-from .direct_rds import DirectRDSSender
+from .direct_rds import DirectRDSSender, RowBatch
+from .parquet_sink import ParquetSender
+from .senders import SenderFanout
+from .parse_pool import ParsePool
+from .pipeline import CollectionPipeline
+from .metrics import metrics
+from .scheduler import AdaptiveScheduler
 from .config import settings
 
 logger = logging.getLogger(__name__)
@@ -24,8 +30,40 @@ class EC2CloudTrailService:
         self.s3_collector = S3CloudTrailCollector(region=settings.aws_default_region) if s3_bucket_configs else None
         self.s3_bucket_configs = [cfg for cfg in (s3_bucket_configs or []) if cfg.get('enabled', False)]
         self.senders = self._initialize_senders()
+        # 전송자별 스레드에서 동시 전송 (제한 시간/재시도/스풀은 전송자마다 독립)
+        self.fanout = SenderFanout(self.senders)
         self.running = False
-        self.last_processed_times = {}  # 버킷별 마지막 처리 타임스탬프 {bucket_name: datetime}
+        # 마지막 파이프라인 실행 결과 (단계별 통계 확인용)
+        self.last_pipeline_result = None
+
+        # CPU 작업인 파싱을 워커 프로세스로 분산 (파이프라인 모드 전용)
+        self.parse_pool = None
+        if settings.parse_processes > 0 and settings.pipeline_enabled:
+            self.parse_pool = ParsePool(settings.parse_processes, group_id=self.senders[0].group_id)
+
+        # 버킷/prefix별 마지막 처리 타임스탬프 {checkpoint_key: datetime} - 재시작 시 파일에서 복원
+        self.checkpoint_store = CheckpointStore(settings.checkpoint_file)
+        checkpoints = self.checkpoint_store.load()
+        self.last_processed_times = {
+            key: entry['last_timestamp']
+            for key, entry in checkpoints.items()
+            if entry.get('last_timestamp')
+        }
+        # 버킷/prefix별 마지막 처리 S3 키 {checkpoint_key: str} - 다음 목록 조회의 StartAfter
+        self.last_processed_keys = {
+            key: entry['last_key']
+            for key, entry in checkpoints.items()
+            if entry.get('last_key')
+        }
+
+        # 운영 지표 내보내기 (METRICS_PORT / METRICS_JSON_FILE)
+        if settings.metrics_port:
+            try:
+                metrics.start_http_server(settings.metrics_port, settings.metrics_host)
+            except OSError as e:
+                logger.error(f"지표 HTTP 서버 시작 실패: {e}")
+        if settings.metrics_json_file:
+            metrics.start_json_dump(settings.metrics_json_file, settings.metrics_json_interval)
 
     def _initialize_senders(self) -> List:
         """전송자 초기화 - 환경변수에서 RDS 설정 읽기"""
@@ -40,6 +78,15 @@ class EC2CloudTrailService:
             logger.error(f"RDS 전송자 초기화 실패: {e}")
             raise
 
+        # Parquet 컬럼 파일 저장 (PARQUET_TARGET 설정 시)
+        if settings.parquet_target:
+            try:
+                senders.append(ParquetSender())
+                logger.info("Parquet 전송자 초기화 완료")
+            except Exception as e:
+                logger.error(f"Parquet 전송자 초기화 실패: {e}")
+                raise
+
         return senders
     
     def collect_and_send(
@@ -59,12 +106,20 @@ class EC2CloudTrailService:
             logger.info("S3에서 CloudTrail 로그 수집 시작...")
 
             # 배치 단위 처리로 효율적인 중복 제거
-            duplicate_checker = self.senders[0] if self.senders else None
+            duplicate_checker = self._duplicate_checker()
+
+            # 파이프라인 모드: 다운로드/중복 제거/저장을 겹쳐 실행하고 배치마다 체크포인트 반영
+            if settings.pipeline_enabled:
+                return self._collect_and_send_pipeline(duplicate_checker, event_names, start_time, end_time)
+
+            # 전송 성공 후에만 체크포인트에 반영할 버킷별 타임스탬프/키
+            updated_times = {}
+            updated_keys = {}
 
             # Once 모드: start_time/end_time 사용
             if start_time or end_time:
                 logger.info(f"Once 모드: {start_time} ~ {end_time}")
-                log_data, _ = self.s3_collector.collect_from_multiple_buckets_batch(
+                log_data, _, _ = self.s3_collector.collect_from_multiple_buckets_batch(
                     bucket_configs=self.s3_bucket_configs,
                     event_names=event_names,
                     duplicate_checker=duplicate_checker,
@@ -76,24 +131,21 @@ class EC2CloudTrailService:
             # Service 모드: 순차 처리
             else:
                 logger.info("Service 모드: 순차 처리")
-                log_data, updated_times = self.s3_collector.collect_from_multiple_buckets_batch(
+                log_data, updated_times, updated_keys = self.s3_collector.collect_from_multiple_buckets_batch(
                     bucket_configs=self.s3_bucket_configs,
                     event_names=event_names,
                     duplicate_checker=duplicate_checker,
                     batch_size=100,
                     start_time=None,
                     end_time=None,
-                    last_processed_times=self.last_processed_times
+                    last_processed_times=self.last_processed_times,
+                    last_processed_keys=self.last_processed_keys
                 )
 
-                # 마지막 처리 시간 업데이트
-                if updated_times:
-                    self.last_processed_times.update(updated_times)
-                    for bucket, timestamp in updated_times.items():
-                        logger.info(f"[{bucket}] 마지막 처리 시간: {timestamp}")
-            
             if log_data.total_events == 0:
                 logger.info("수집된 이벤트가 없습니다.")
+                # 전송할 이벤트가 없어도 처리한 파일 위치는 기록
+                self._commit_checkpoints(updated_times, updated_keys)
                 return True
                 
             logger.info(f"{log_data.total_events}개 이벤트 수집 완료")
@@ -111,36 +163,128 @@ class EC2CloudTrailService:
                 print("=" * 40)
             
             # 모든 전송자에게 로그 전송
-            success_count = 0
-            for i, sender in enumerate(self.senders):
-                try:
-                    if sender.send_logs(log_data):
-                        success_count += 1
-                        logger.info(f"전송자 {i+1} 전송 성공")
-                    else:
-                        logger.error(f"전송자 {i+1} 전송 실패")
-                except Exception as e:
-                    logger.error(f"전송자 {i+1} 오류: {e}")
-            
-            logger.info(f"전송 완료: {success_count}/{len(self.senders)}개 성공")
-            return success_count > 0
+            success = self._send_to_senders(log_data)
+
+            # 전송에 성공한 경우에만 마지막 처리 시간 업데이트 (실패 시 다음 사이클에 재수집)
+            if success:
+                self._commit_checkpoints(updated_times, updated_keys)
+                # 순차 모드는 버킷 구분 없이 합산
+                metrics.inc('logsmith_events_written_total', log_data.total_events, bucket='all')
+                metrics.record_event_time(
+                    max((event.event_datetime for event in log_data.records if event.event_datetime), default=None),
+                    bucket='all'
+                )
+
+            return success
             
         except Exception as e:
             logger.error(f"수집 및 전송 중 오류: {e}")
             return False
-    
+
+    def _duplicate_checker(self):
+        """저장 전 중복 체크에 사용할 전송자
+
+        모든 전송자가 중복을 직접 건너뛸 때만(idempotent 저장 모드 RDS만 사용) None을 반환합니다.
+        Parquet 등 중복을 거르지 못하는 전송자가 있으면 저장 모드와 관계없이 사전 중복 체크를 합니다.
+        """
+        if not self.senders or all(sender.handles_duplicates for sender in self.senders):
+            return None
+        return self.senders[0]
+
+    def _collect_and_send_pipeline(
+        self,
+        duplicate_checker,
+        event_names: Optional[List[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> bool:
+        """파이프라인으로 수집/전송 (Once 모드는 체크포인트를 기록하지 않음)"""
+        once_mode = bool(start_time or end_time)
+        if once_mode:
+            logger.info(f"Once 모드 (파이프라인): {start_time} ~ {end_time}")
+        else:
+            logger.info("Service 모드 (파이프라인)")
+
+        def commit(key: str, last_timestamp: Optional[datetime], last_key: Optional[str]):
+            self._commit_checkpoints(
+                {key: last_timestamp} if last_timestamp else {},
+                {key: last_key} if last_key else {}
+            )
+
+        pipeline = CollectionPipeline(
+            self.s3_collector,
+            send_batch=self._send_to_senders,
+            duplicate_checker=duplicate_checker,
+            on_commit=None if once_mode else commit,
+            parse_pool=self.parse_pool,
+            send_rows=self._send_rows_to_senders,
+            spool_unchecked=self._spool_unchecked
+        )
+        result = pipeline.run(
+            self.s3_bucket_configs,
+            event_names=event_names,
+            start_time=start_time,
+            end_time=end_time,
+            last_processed_times=None if once_mode else self.last_processed_times,
+            last_processed_keys=None if once_mode else self.last_processed_keys
+        )
+        self.last_pipeline_result = result
+        return result.success
+
+    def _send_to_senders(self, log_data) -> bool:
+        """모든 전송자에게 동시에 로그 전송 (모든 전송자가 저장 또는 스풀해야 True)"""
+        return self.fanout.send_logs(log_data)
+
+    def _send_rows_to_senders(self, rows: RowBatch) -> bool:
+        """파싱 프로세스가 인코딩한 행을 send_rows를 지원하는 전송자에게 동시에 전송"""
+        return self.fanout.send_rows(rows)
+
+    def _spool_unchecked(self, events) -> bool:
+        """중복 체크를 못 한 배치를 모든 전송자의 스풀에 기록 (스풀이 없는 전송자가 있으면 False)"""
+        return self.fanout.spool_unchecked(events)
+
+    def _replay_spools(self):
+        """스풀을 지원하는 전송자의 재전송 대기 배치 처리"""
+        self.fanout.replay_spools()
+
+    def _commit_checkpoints(self, updated_times: Dict[str, datetime], updated_keys: Dict[str, str]):
+        """마지막 처리 시간/키를 메모리와 체크포인트 파일에 반영"""
+        if not updated_times and not updated_keys:
+            return
+
+        self.last_processed_times.update(updated_times)
+        self.last_processed_keys.update(updated_keys)
+        for key, timestamp in updated_times.items():
+            logger.info(f"[{key}] 마지막 처리 시간: {timestamp}")
+
+        self.checkpoint_store.save({
+            key: {
+                'last_timestamp': self.last_processed_times.get(key),
+                'last_key': self.last_processed_keys.get(key)
+            }
+            for key in set(self.last_processed_times) | set(self.last_processed_keys)
+        })
+
     def start_service(
         self,
         event_names: Optional[List[str]] = None
     ):
         """서비스 시작"""
-        logger.info(f"EC2 CloudTrail 서비스 시작 (수집 간격: {settings.collection_interval}초)")
+        scheduler = AdaptiveScheduler()
+        if scheduler.adaptive:
+            logger.info(
+                f"EC2 CloudTrail 서비스 시작 (수집 간격: {scheduler.min_interval:.0f}~{scheduler.latency_target:.0f}초, "
+                f"적체 시 즉시 이어서 수집)"
+            )
+        else:
+            logger.info(f"EC2 CloudTrail 서비스 시작 (수집 간격: {settings.collection_interval}초)")
         
         self.running = True
         
         def signal_handler(signum, frame):
             logger.info("종료 신호 수신")
             self.running = False
+            scheduler.stop()
         
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
@@ -148,19 +292,40 @@ class EC2CloudTrailService:
         try:
             while self.running:
                 logger.info("수집 사이클 시작")
-                
-                self.collect_and_send(
+                if self.s3_collector:
+                    self.s3_collector.reset_listing_stats()
+
+                # DB 장애 중 스풀된 배치가 있으면 먼저 재전송
+                self._replay_spools()
+
+                checkpoints_before = (dict(self.last_processed_times), dict(self.last_processed_keys))
+                success = self.collect_and_send(
                     event_names=event_names
                 )
                 
                 if self.running:
-                    logger.info(f"{settings.collection_interval}초 대기")
-                    time.sleep(settings.collection_interval)
+                    new_files, backlog = self.s3_collector.listing_summary() if self.s3_collector else (0, False)
+                    # 체크포인트가 전진하지 않았으면 (다운로드/파싱이 모두 실패 등) 같은 파일을 바로 다시 조회하지 않음
+                    advanced = checkpoints_before != (dict(self.last_processed_times), dict(self.last_processed_keys))
+                    delay = scheduler.next_delay(success, new_files, backlog and advanced)
+                    if delay <= 0:
+                        logger.info(f"처리할 파일이 남아 있어 바로 다음 사이클 실행 (이번 사이클 {new_files}개 파일)")
+                        continue
+                    logger.info(f"{delay:.0f}초 대기")
+                    scheduler.wait(delay)
                     
         except KeyboardInterrupt:
             logger.info("키보드 인터럽트")
         except Exception as e:
             logger.error(f"서비스 실행 중 오류: {e}")
         finally:
+            self.shutdown()
             logger.info("서비스 종료")
+
+    def shutdown(self):
+        """파싱 프로세스와 전송자 스레드 종료 (진행 중인 전송은 끝날 때까지 대기)"""
+        if self.parse_pool:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
+        self.fanout.shutdown()
     
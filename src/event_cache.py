@@ -0,0 +1,80 @@
+"""
+최근 저장한 CloudTrail eventID 인메모리 캐시
+
+이 프로세스가 직접 저장한 eventID를 기억해 두었다가, 다음 사이클의 중복 체크에서
+DB 조회 없이 "이미 저장됨"으로 판정합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+
+class RecentEventIdCache:
+    """크기 제한(LRU) + 시간 제한(TTL)이 있는 eventID 캐시
+
+    저장에 성공한 eventID만 추가되므로 캐시에 있는 ID는 항상 DB에도 존재합니다.
+    캐시에 없는 ID는 판단할 수 없으므로 DB에서 확인해야 합니다.
+    """
+
+    def __init__(self, max_size: int = 200000, ttl_seconds: int = 86400):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[str, float]' = OrderedDict()  # eventID -> 저장 시각
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def add_many(self, event_ids: Iterable[str]) -> None:
+        """저장 완료된 eventID 추가"""
+        now = time.monotonic()
+        with self._lock:
+            for event_id in event_ids:
+                if not event_id:
+                    continue
+                self._entries[event_id] = now
+                self._entries.move_to_end(event_id)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def split_known(self, event_ids: Iterable[str]) -> Tuple[Set[str], List[str]]:
+        """eventID 목록을 (저장 확인된 ID, DB 확인이 필요한 ID)로 분리"""
+        known = set()
+        unknown = []
+        expire_before = time.monotonic() - self.ttl_seconds
+
+        with self._lock:
+            for event_id in event_ids:
+                written_at = self._entries.get(event_id)
+                if written_at is not None and written_at >= expire_before:
+                    known.add(event_id)
+                    self._entries.move_to_end(event_id)
+                    self.hits += 1
+                else:
+                    if written_at is not None:
+                        # 만료된 항목 정리
+                        del self._entries[event_id]
+                        self.evictions += 1
+                    unknown.append(event_id)
+                    self.misses += 1
+
+        return known, unknown
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 산정용 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
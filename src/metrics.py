@@ -0,0 +1,279 @@
+"""
+수집기 운영 지표
+
+카운터/게이지/히스토그램을 메모리에 모아 두고 두 가지 방식으로 내보냅니다.
+- METRICS_PORT: 로컬 HTTP 포트의 /metrics (Prometheus text format), /metrics.json
+- METRICS_JSON_FILE: METRICS_JSON_INTERVAL초마다 JSON 파일로 기록
+
+모든 지표 이름은 logsmith_ 접두사를 사용하며 버킷별 지표는 bucket 레이블을 가집니다.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .checkpoint import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 이름: (유형, 설명)
+METRIC_DEFINITIONS = {
+    'logsmith_s3_list_seconds': ('histogram', 'S3 ListObjectsV2 요청 지연 시간'),
+    'logsmith_s3_get_seconds': ('histogram', 'S3 GetObject 응답 헤더까지의 지연 시간'),
+    'logsmith_s3_bytes_total': ('counter', '다운로드한 S3 객체 바이트 (압축 상태)'),
+    'logsmith_object_cache_requests_total': ('counter', 'S3 객체 로컬 캐시 조회 수 (hit/miss)'),
+    'logsmith_object_cache_bytes': ('gauge', 'S3 객체 로컬 캐시 크기 (바이트)'),
+    'logsmith_decode_seconds': ('histogram', '파일당 gzip 해제 + JSON 디코딩 + 이벤트 변환 시간'),
+    'logsmith_events_parsed_total': ('counter', 'S3 파일에서 읽은 레코드 수'),
+    'logsmith_events_filtered_total': ('counter', '이벤트 이름 필터로 제외된 레코드 수'),
+    'logsmith_events_deduped_total': ('counter', '이미 저장된 것으로 판정되어 제외된 이벤트 수'),
+    'logsmith_events_written_total': ('counter', '저장에 성공한 이벤트 수'),
+    'logsmith_sender_seconds': ('histogram', '전송자별 배치 전송 시간 (재시도 포함)'),
+    'logsmith_sender_batches_total': ('counter', '전송자별 배치 결과 (success, failure, timeout, spooled)'),
+    'logsmith_sender_late_results_total': ('counter', '제한 시간을 넘긴 배치가 백그라운드에서 끝난 결과 (success, failure, spooled)'),
+    'logsmith_db_statement_seconds': ('histogram', 'DB 구문 실행 시간'),
+    'logsmith_db_pool_connections': ('gauge', 'DB 커넥션 풀 연결 수'),
+    'logsmith_pipeline_queue_depth': ('gauge', '파이프라인 단계 사이 큐에 대기 중인 배치 수'),
+    'logsmith_newest_event_timestamp_seconds': ('gauge', '저장된 가장 최근 eventTime (Unix 시간)'),
+    'logsmith_ingestion_lag_seconds': ('gauge', '현재 시각 - 저장된 가장 최근 eventTime'),
+    'logsmith_spool_bytes': ('gauge', '재전송 대기 중인 스풀 크기 (바이트)'),
+    'logsmith_spool_batches_total': ('counter', '스풀 배치 수 (spooled: 기록, replayed: 재전송, rejected: 저장 불가)'),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(
+        f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in items
+    ) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    __slots__ = ('bucket_counts', 'count', 'sum')
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.bucket_counts[idx] += 1
+
+
+class MetricsRegistry:
+    """스레드 안전한 메모리 지표 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        # 출력 시점에 값을 계산하는 게이지 {이름: 함수() -> {레이블: 값}}
+        self._gauge_callbacks: Dict[str, Callable[[], Dict[LabelKey, float]]] = {}
+        self._http_server: Optional[ThreadingHTTPServer] = None
+        self._json_thread: Optional[threading.Thread] = None
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """카운터 증가"""
+        if not value:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """게이지 설정"""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def set_max(self, name: str, value: float, **labels) -> None:
+        """게이지를 기존 값보다 클 때만 갱신"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            if value > series.get(key, float('-inf')):
+                series[key] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """히스토그램에 값 기록 (초 단위)"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """with 블록 실행 시간을 히스토그램에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def register_gauge_callback(self, name: str, callback: Callable[[], Dict[str, float]], label: str) -> None:
+        """출력 시점에 callback() -> {레이블 값: 값}으로 계산되는 게이지 등록"""
+        def collect() -> Dict[LabelKey, float]:
+            return {((label, str(value_label)),): value for value_label, value in callback().items()}
+
+        with self._lock:
+            self._gauge_callbacks[name] = collect
+
+    def record_event_time(self, newest_event_time: Optional[datetime], **labels) -> None:
+        """저장된 이벤트 중 가장 최근 eventTime 기록 (naive UTC) - 수집 지연 계산용"""
+        if newest_event_time is None:
+            return
+        timestamp = newest_event_time.replace(tzinfo=timezone.utc).timestamp()
+        self.set_max('logsmith_newest_event_timestamp_seconds', timestamp, **labels)
+
+    def _ingestion_lag(self, now: float) -> Dict[LabelKey, float]:
+        newest = self._gauges.get('logsmith_newest_event_timestamp_seconds', {})
+        return {key: max(0.0, now - timestamp) for key, timestamp in newest.items()}
+
+    def _collect_gauges(self) -> Dict[str, Dict[LabelKey, float]]:
+        """저장된 게이지 + 콜백 게이지 + 수집 지연 (lock 보유 상태에서 호출)"""
+        gauges = {name: dict(series) for name, series in self._gauges.items()}
+        for name, callback in self._gauge_callbacks.items():
+            try:
+                gauges[name] = callback()
+            except Exception as e:
+                logger.debug(f"지표 콜백 오류 ({name}): {e}")
+        lag = self._ingestion_lag(time.time())
+        if lag:
+            gauges['logsmith_ingestion_lag_seconds'] = lag
+        return gauges
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            gauges = self._collect_gauges()
+            series_by_name = {}
+            series_by_name.update(self._counters)
+            series_by_name.update(gauges)
+            series_by_name.update(self._histograms)
+
+            for name in sorted(series_by_name):
+                series = series_by_name[name]
+                metric_type, help_text = METRIC_DEFINITIONS.get(name, ('untyped', name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+
+                for key in sorted(series):
+                    value = series[key]
+                    if isinstance(value, _Histogram):
+                        for bound, bucket_count in zip(LATENCY_BUCKETS, value.bucket_counts):
+                            lines.append(f"{name}_bucket{_format_labels(key, ('le', str(bound)))} {bucket_count}")
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {value.count}")
+                        lines.append(f"{name}_sum{_format_labels(key)} {_format_value(value.sum)}")
+                        lines.append(f"{name}_count{_format_labels(key)} {value.count}")
+                    else:
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """JSON 직렬화 가능한 지표 스냅샷"""
+        result: Dict[str, List[Dict]] = {}
+        with self._lock:
+            gauges = self._collect_gauges()
+            for name, series in list(self._counters.items()) + list(gauges.items()):
+                result[name] = [{'labels': dict(key), 'value': value} for key, value in sorted(series.items())]
+            for name, series in self._histograms.items():
+                result[name] = [{
+                    'labels': dict(key),
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'avg': histogram.sum / histogram.count if histogram.count else 0.0,
+                } for key, histogram in sorted(series.items())]
+        return result
+
+    def start_http_server(self, port: int, host: str = '127.0.0.1') -> None:
+        """/metrics, /metrics.json을 제공하는 HTTP 서버를 백그라운드 스레드로 시작"""
+        if self._http_server is not None:
+            return
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] == '/metrics':
+                    body = registry.render_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path.split('?')[0] == '/metrics.json':
+                    body = json.dumps(registry.snapshot(), ensure_ascii=False).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 스크레이프 요청마다 로그를 남기지 않음
+                pass
+
+        self._http_server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._http_server.daemon_threads = True
+        threading.Thread(target=self._http_server.serve_forever, name='metrics-http', daemon=True).start()
+        logger.info(f"지표 HTTP 서버 시작: http://{host}:{port}/metrics")
+
+    def start_json_dump(self, path: str, interval: int = 60) -> None:
+        """interval초마다 지표 스냅샷을 JSON 파일로 기록"""
+        if self._json_thread is not None:
+            return
+
+        def dump_loop():
+            while True:
+                time.sleep(max(1, interval))
+                try:
+                    write_json_atomic(path, {
+                        'generated_at': datetime.now(timezone.utc).isoformat(),
+                        'metrics': self.snapshot()
+                    })
+                except Exception as e:
+                    logger.error(f"지표 JSON 기록 실패: {e}")
+
+        self._json_thread = threading.Thread(target=dump_loop, name='metrics-json', daemon=True)
+        self._json_thread.start()
+        logger.info(f"지표 JSON 기록 시작: {path} ({interval}초 간격)")
+
+    def stop(self) -> None:
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server = None
+
+
+# 글로벌 지표 저장소
+metrics = MetricsRegistry()
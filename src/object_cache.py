@@ -0,0 +1,158 @@
+"""
+다운로드한 S3 CloudTrail 객체 로컬 캐시
+
+--mode once로 겹치는 기간을 반복 조회할 때 같은 .json.gz 객체를 매번 S3에서 받지 않도록
+(버킷, 키, ETag)를 키로 압축 상태 그대로 로컬 디스크에 보관합니다.
+- ETag가 바뀐 객체(덮어쓴 객체)는 다른 캐시 항목이 되므로 오래된 내용을 읽지 않음
+- 전체 크기가 OBJECT_CACHE_MAX_BYTES를 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (LRU)
+- 사용 순서는 파일 수정 시각으로 기록하므로 재시작 후에도 유지
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectCache:
+    """크기 상한이 있는 (버킷, 키, ETag) 기준 디스크 캐시"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 캐시 파일 경로 → 크기 (앞쪽이 가장 오래 사용하지 않은 항목)
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._total_bytes = 0
+        self._load_entries()
+
+    def get(self, bucket: str, key: str, etag: Optional[str]) -> Optional[bytes]:
+        """캐시된 객체 본문 (없거나 ETag를 모르면 None)"""
+        path = self._entry_path(bucket, key, etag) if etag else None
+        data = None
+        if path is not None:
+            with self._lock:
+                cached = path in self._entries
+                if cached:
+                    self._entries.move_to_end(path)
+            if cached:
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                    os.utime(path)
+                except OSError as e:
+                    logger.warning(f"객체 캐시 읽기 실패, S3에서 다시 받음: {e}")
+                    self._discard(path)
+                    data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        metrics.inc('logsmith_object_cache_requests_total', result='miss' if data is None else 'hit')
+        return data
+
+    def put(self, bucket: str, key: str, etag: Optional[str], data: bytes) -> None:
+        """객체 본문 저장 후 상한을 넘으면 오래된 항목 삭제 (실패해도 수집은 계속)"""
+        if not etag or len(data) > self.max_bytes:
+            return
+
+        path = self._entry_path(bucket, key, etag)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 스레드/프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"객체 캐시 저장 실패: {e}")
+            return
+
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(path, 0)
+            self._entries[path] = len(data)
+            evicted = self._evict()
+        for evicted_path in evicted:
+            self._remove(evicted_path)
+        metrics.set('logsmith_object_cache_bytes', self._total_bytes)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+            }
+
+    def _entry_path(self, bucket: str, key: str, etag: str) -> str:
+        # ETag 앞뒤 따옴표 제거 (목록 조회/다운로드 응답 표기 차이 무시)
+        etag = etag.strip('"')
+        digest = hashlib.sha256(f"{bucket}\0{key}\0{etag}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.gz")
+
+    def _evict(self) -> list:
+        """상한 이하가 될 때까지 오래된 항목을 목록에서 제거하고 삭제할 경로 반환 (lock 보유 상태에서 호출)"""
+        evicted = []
+        while self._total_bytes > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(path)
+        return evicted
+
+    def _discard(self, path: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._entries.pop(path, 0)
+        self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _load_entries(self) -> None:
+        """디스크의 캐시 파일을 수정 시각 순으로 읽어 LRU 순서 복원"""
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith('.tmp'):
+                    # 기록 중 종료된 임시 파일
+                    self._remove(path)
+                    continue
+                found.append((stat.st_mtime, path, stat.st_size))
+
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._total_bytes += size
+        for path in self._evict():
+            self._remove(path)
+
+        metrics.set('logsmith_object_cache_bytes', self._total_bytes)
+        if self._entries:
+            logger.info(
+                f"객체 캐시 로드: {self.directory} ({len(self._entries)}개, {self._total_bytes / 1024 / 1024:.1f} MiB)"
+            )
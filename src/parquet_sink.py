@@ -0,0 +1,248 @@
+"""
+Parquet 컬럼 저장 전송자
+
+수집한 배치를 RDS와 별도로 압축된 Parquet 파일로 저장해 장기간 헌팅 쿼리를 DB 밖에서 실행할 수 있게 합니다.
+(Athena, DuckDB, Spark 등에서 date/account_id/region 파티션 조건으로 필요한 파일만 읽음)
+
+저장 위치: PARQUET_TARGET (로컬 디렉터리 또는 s3://버킷/prefix)
+    <대상>/date=YYYY-MM-DD/account_id=<수신 계정>/region=<리전>/part-<eventID 해시>.parquet
+    파일 이름은 파티션에 담긴 eventID로 정해지므로 같은 배치를 재시도/스풀 재전송하면 새 파일을 더하지 않고 덮어씁니다.
+컬럼: cloudtrail 테이블의 최상위 필드는 타입 있는 컬럼(event_time은 UTC timestamp, read_only 등은 bool),
+      userIdentity 주요 필드는 user_identity_* 컬럼으로 펼치고, 중첩 필드는 JSON 문자열로 보관합니다.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import boto3
+
+from .cloud_trail import CloudTrailLogData, parse_event_time
+from .config import settings
+from .direct_rds import CLOUDTRAIL_COLUMNS, RowBatch, build_rows, copy_line, parse_copy_line
+from .senders import Sender
+from .spool import DiskSpool
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# cloudtrail 행에서 bool로 저장할 컬럼
+BOOL_COLUMNS = ('read_only', 'management_event')
+
+# cloudtrail 행에서 JSON 문자열로 보관할 중첩 컬럼
+JSON_COLUMNS = ('user_identity', 'tls_details', 'request_parameters', 'response_elements', 'insight_details', 'resources')
+
+# user_identity JSON에서 펼칠 필드 {컬럼: userIdentity 키}
+USER_IDENTITY_FIELDS = {
+    'user_identity_type': 'type',
+    'user_identity_arn': 'arn',
+    'user_identity_account_id': 'accountId',
+    'user_identity_principal_id': 'principalId',
+    'user_identity_user_name': 'userName',
+    'user_identity_access_key_id': 'accessKeyId',
+}
+
+
+def parquet_schema():
+    """Parquet 파일 스키마 (파티션 컬럼 date/account_id/region은 경로로 표현되지만 파일에도 포함)"""
+    fields = [('group_id', pa.string())]
+    for column in CLOUDTRAIL_COLUMNS:
+        if column == 'id':
+            continue
+        if column == 'event_time':
+            fields.append((column, pa.timestamp('us', tz='UTC')))
+        elif column in BOOL_COLUMNS:
+            fields.append((column, pa.bool_()))
+        else:
+            fields.append((column, pa.string()))
+    fields.extend((column, pa.string()) for column in USER_IDENTITY_FIELDS)
+    return pa.schema(fields)
+
+
+class ParquetSender(Sender):
+    """배치를 date/account_id/region 파티션 Parquet 파일로 저장하는 전송자"""
+
+    name = 'parquet'
+    supports_rows = True
+
+    def __init__(self, target: Optional[str] = None, compression: Optional[str] = None):
+        """
+        Args:
+            target: 로컬 디렉터리 또는 s3://버킷/prefix (기본값: PARQUET_TARGET)
+            compression: Parquet 압축 코덱 (기본값: PARQUET_COMPRESSION)
+        """
+        if not PYARROW_AVAILABLE:
+            raise Exception("pyarrow 설치 필요")
+
+        self.target = (target or settings.parquet_target or '').rstrip('/')
+        if not self.target:
+            raise ValueError("PARQUET_TARGET이 설정되지 않았습니다")
+        self.compression = compression or settings.parquet_compression
+        self.group_id = settings.group_id
+        self.schema = parquet_schema()
+
+        self.s3_client = None
+        self.bucket = self.prefix = None
+        if self.target.startswith('s3://'):
+            self.bucket, _, self.prefix = self.target[len('s3://'):].partition('/')
+            self.s3_client = boto3.client(
+                's3',
+                region_name=settings.aws_default_region,
+                endpoint_url=settings.s3_endpoint_url
+            )
+        else:
+            os.makedirs(self.target, exist_ok=True)
+
+        # 저장 실패 배치 스풀 (RDS 스풀과 별도 디렉터리)
+        self.spool = None
+        if settings.spool_dir:
+            try:
+                self.spool = DiskSpool(os.path.join(settings.spool_dir, self.name), settings.spool_max_bytes)
+            except Exception as e:
+                logger.error(f"Parquet 스풀 초기화 실패, 스풀 없이 실행: {e}")
+
+        logger.info(f"Parquet 전송자 초기화: {self.target} (압축 {self.compression})")
+
+    def send_logs(self, log_data: CloudTrailLogData) -> bool:
+        """이벤트 목록을 Parquet 파일로 저장"""
+        return self._write([build_rows(event, self.group_id)[1] for event in log_data.records])
+
+    def send_rows(self, rows: RowBatch) -> bool:
+        """파싱 프로세스가 인코딩한 cloudtrail COPY 행을 복원해 Parquet 파일로 저장"""
+        return self._write([parse_copy_line(line) for line in rows.cloudtrail_lines])
+
+    def spool_batch(self, batch: Any, reason: str) -> bool:
+        """저장하지 못한 배치를 스풀에 기록 (이벤트 목록은 COPY 행으로 인코딩)"""
+        if self.spool is None:
+            return False
+        if not len(batch):
+            return True
+        rows = batch
+        if not isinstance(batch, RowBatch):
+            rows = RowBatch()
+            for event in batch:
+                events_row, cloudtrail_row = build_rows(event, self.group_id)
+                rows.append(event.event_id, event.event_datetime, copy_line(events_row), copy_line(cloudtrail_row))
+        if not self.spool.append(rows.to_record()):
+            return False
+        logger.warning(f"{reason}, {len(rows)}개 이벤트를 Parquet 스풀에 기록 (저장 위치 복구 후 재전송)")
+        return True
+
+    def replay_spool(self) -> int:
+        """스풀에 쌓인 배치를 오래된 순서로 다시 저장 (실패하면 중단)"""
+        if self.spool is None or not self.spool.has_pending():
+            return 0
+
+        def replay(record: Dict[str, Any]) -> bool:
+            return self._write([parse_copy_line(line) for line in RowBatch.from_record(record).cloudtrail_lines])
+
+        replayed = self.spool.replay(replay)
+        if replayed:
+            logger.info(f"Parquet 스풀 재전송 완료: 배치 {replayed}개")
+        return replayed
+
+    def _write(self, rows: List[Any]) -> bool:
+        if not rows:
+            return True
+        try:
+            written = 0
+            for (date, account_id, region), partition_rows in self._partition(rows).items():
+                table = pa.Table.from_pydict(self._columns(partition_rows), schema=self.schema)
+                buffer = io.BytesIO()
+                pq.write_table(table, buffer, compression=self.compression)
+                self._put(
+                    f"date={date}/account_id={account_id}/region={region}",
+                    self._file_name(partition_rows),
+                    buffer.getvalue()
+                )
+                written += len(partition_rows)
+            logger.info(f"Parquet 저장 완료: {written}개 이벤트")
+            return True
+        except Exception as e:
+            logger.error(f"Parquet 저장 오류: {e}")
+            return False
+
+    def _partition(self, rows: List[Any]) -> Dict[Tuple[str, str, str], List[Any]]:
+        """cloudtrail 행을 (날짜, 수신 계정, 리전)별로 분류"""
+        time_idx = CLOUDTRAIL_COLUMNS.index('event_time')
+        account_idx = CLOUDTRAIL_COLUMNS.index('recipient_account_id')
+        region_idx = CLOUDTRAIL_COLUMNS.index('aws_region')
+
+        partitions: Dict[Tuple[str, str, str], List[Any]] = {}
+        for row in rows:
+            event_time = row[time_idx] or ''
+            key = (
+                event_time[:10] if len(event_time) >= 10 else 'unknown',
+                row[account_idx] or 'unknown',
+                row[region_idx] or 'unknown'
+            )
+            partitions.setdefault(key, []).append(row)
+        return partitions
+
+    def _columns(self, rows: List[Any]) -> Dict[str, List[Any]]:
+        """cloudtrail 행 목록을 스키마 순서의 타입 있는 컬럼으로 변환"""
+        columns: Dict[str, List[Any]] = {name: [] for name in self.schema.names}
+        columns['group_id'] = [self.group_id] * len(rows)
+
+        for row in rows:
+            for column, value in zip(CLOUDTRAIL_COLUMNS, row):
+                if column == 'id':
+                    continue
+                if column == 'event_time':
+                    value = parse_event_time(value) if value else None
+                elif column in BOOL_COLUMNS:
+                    # build_rows는 bool, COPY 행은 't'/'f'
+                    value = None if value is None else value in (True, 't')
+                columns[column].append(value)
+
+            identity = self._user_identity(row[CLOUDTRAIL_COLUMNS.index('user_identity')])
+            for column, key in USER_IDENTITY_FIELDS.items():
+                value = identity.get(key)
+                columns[column].append(None if value is None else str(value))
+
+        return columns
+
+    @staticmethod
+    def _user_identity(value: Optional[str]) -> Dict[str, Any]:
+        if not value:
+            return {}
+        try:
+            identity = json.loads(value)
+        except ValueError:
+            return {}
+        return identity if isinstance(identity, dict) else {}
+
+    @staticmethod
+    def _file_name(rows: List[Any]) -> str:
+        """파티션 행의 eventID로 정한 파일 이름 (같은 행 묶음이면 항상 같은 이름)"""
+        event_id_idx = CLOUDTRAIL_COLUMNS.index('event_id')
+        digest = hashlib.sha256()
+        for row in rows:
+            digest.update((row[event_id_idx] or '').encode('utf-8'))
+            digest.update(b'\0')
+        return f"part-{digest.hexdigest()[:32]}.parquet"
+
+    def _put(self, partition: str, name: str, data: bytes) -> None:
+        """파티션 경로에 저장 (같은 이름의 파일이 있으면 덮어씀)"""
+
+        if self.s3_client is not None:
+            key = '/'.join(part for part in (self.prefix, partition, name) if part)
+            self.s3_client.put_object(Bucket=self.bucket, Key=key, Body=data)
+            return
+
+        directory = os.path.join(self.target, partition)
+        os.makedirs(directory, exist_ok=True)
+        # 쓰는 중인 파일을 쿼리 엔진이 읽지 않도록 임시 이름으로 쓴 뒤 교체
+        tmp_path = os.path.join(directory, f".{name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, name))
@@ -0,0 +1,63 @@
+"""
+프로세스 풀 기반 CloudTrail 로그 파싱
+
+gzip 해제 + JSON 디코딩 + 행 변환은 CPU 작업이라 스레드로는 GIL 때문에 코어 하나만 사용합니다.
+PARSE_PROCESSES > 0이면 다운로드 스레드가 받은 원본 바이트를 워커 프로세스로 보내고,
+워커는 CloudTrailEvent 객체 대신 COPY 입력 행(RowBatch)을 돌려줍니다.
+문자열 목록만 프로세스 간에 전달되므로 직렬화 비용이 작습니다.
+"""
+
+import io
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional
+
+from .cloud_trail import CloudTrailEvent
+from .cloudtrail_stream import iter_cloudtrail_records
+from .direct_rds import RowBatch, build_rows, copy_line
+
+logger = logging.getLogger(__name__)
+
+
+def parse_object_rows(data: bytes, group_id: str, event_names: Optional[List[str]] = None) -> RowBatch:
+    """CloudTrail 로그 파일(.json.gz) 바이트를 COPY 입력 행으로 변환 (워커 프로세스에서 실행)"""
+    rows = RowBatch()
+    for record in iter_cloudtrail_records(io.BytesIO(data)):
+        rows.parsed += 1
+
+        # 특정 이벤트만 필터링
+        if event_names and record.get('eventName') not in event_names:
+            continue
+
+        event = CloudTrailEvent.from_dict(record)
+        events_row, cloudtrail_row = build_rows(event, group_id)
+        rows.append(event.event_id, event.event_datetime, copy_line(events_row), copy_line(cloudtrail_row))
+
+    return rows
+
+
+class ParsePool:
+    """CloudTrail 로그 파싱 워커 프로세스 풀"""
+
+    def __init__(self, processes: int, group_id: str):
+        self.processes = max(1, processes)
+        self.group_id = group_id
+        # 다운로드 스레드가 실행 중인 부모 프로세스를 fork하지 않도록 spawn 사용
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        logger.info(f"파싱 프로세스 풀 생성: {self.processes}개")
+
+    def submit(self, data: bytes, event_names: Optional[List[str]] = None) -> Future:
+        """파일 하나의 파싱 작업 제출 (결과는 RowBatch)"""
+        return self._executor.submit(parse_object_rows, data, self.group_id, event_names)
+
+    def parse(self, data: bytes, event_names: Optional[List[str]] = None) -> RowBatch:
+        """파일 하나를 워커 프로세스에서 파싱하고 결과를 기다림"""
+        return self.submit(data, event_names).result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        logger.info("파싱 프로세스 풀 종료")
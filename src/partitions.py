@@ -0,0 +1,204 @@
+"""
+events / cloudtrail 시간 범위 파티션 관리
+
+sql/create_table_partitioned.sql 스키마에서 사용합니다.
+- 저장 전에 배치의 이벤트 시간에 해당하는 파티션이 없으면 만듭니다.
+- 현재 시점 이후 PARTITION_PREMAKE개 파티션을 미리 만들어 둡니다.
+- PARTITION_RETENTION_DAYS가 지난 파티션은 행 DELETE 대신 파티션 DROP으로 정리합니다.
+"""
+
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (테이블, 파티션 키 컬럼, 키가 timestamptz인지)
+PARTITIONED_TABLES = (
+    ('events', 'occurred_at', True),
+    ('cloudtrail', 'event_time', False),
+)
+
+# 여러 수집기가 동시에 같은 파티션을 만들지 않도록 직렬화
+PARTITION_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('inu_logsmith_partitions'))"
+
+PARTITION_CREATE_SQL = "CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)"
+
+PARTITION_LIST_SQL = """
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = %s::regclass
+"""
+
+PARTITION_DROP_SQL = "DROP TABLE IF EXISTS {partition}"
+
+# 파티션 생성/보존 기간 정리 주기 (초)
+MAINTENANCE_INTERVAL = 3600
+
+
+def event_time_range(event_times: Iterable[Optional[datetime]]) -> Optional[Tuple[datetime, datetime]]:
+    """이벤트 시간 목록의 (최소, 최대) - 시간을 알 수 없는 이벤트가 있으면 None"""
+    times = list(event_times)
+    if not times or any(value is None for value in times):
+        return None
+    return min(times), max(times)
+
+
+def utc_now() -> datetime:
+    """현재 UTC 시각 (CloudTrail 이벤트 시간과 같은 naive UTC)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class PartitionManager:
+    """일/월 단위 범위 파티션 생성 및 보존 기간 정리"""
+
+    def __init__(
+        self,
+        connection_pool,
+        interval: str = 'day',
+        premake: int = 3,
+        retention_days: int = 0
+    ):
+        if interval not in ('day', 'month'):
+            raise ValueError(f"지원하지 않는 PARTITION_INTERVAL: {interval} (day 또는 month)")
+
+        self.connection_pool = connection_pool
+        self.interval = interval
+        self.premake = max(0, premake)
+        self.retention_days = max(0, retention_days)
+        self._suffix_format = '%Y%m%d' if interval == 'day' else '%Y%m'
+        self._name_pattern = re.compile(r'_p(\d{8})$' if interval == 'day' else r'_p(\d{6})$')
+
+        # 이미 존재하는 것으로 확인된 파티션 시작 시각 (DB 조회 없이 판단)
+        self._known: Set[datetime] = set()
+        self._lock = threading.Lock()
+        self._next_maintenance = 0.0
+
+    def partition_start(self, value: datetime) -> datetime:
+        """value가 속한 파티션의 시작 시각"""
+        if self.interval == 'day':
+            return datetime(value.year, value.month, value.day)
+        return datetime(value.year, value.month, 1)
+
+    def next_start(self, start: datetime) -> datetime:
+        """다음 파티션의 시작 시각"""
+        if self.interval == 'day':
+            return start + timedelta(days=1)
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+    def partition_name(self, table: str, start: datetime) -> str:
+        return f"{table}_p{start.strftime(self._suffix_format)}"
+
+    def ensure_partitions(self, event_times: Iterable[Optional[datetime]]) -> None:
+        """이벤트 시간들이 들어갈 파티션을 준비 (없으면 생성, 실패 시 예외)"""
+        self._maybe_maintain()
+
+        starts = {self.partition_start(value) for value in event_times if value is not None}
+        with self._lock:
+            missing = starts - self._known
+        if missing:
+            self.create_partitions(missing)
+
+    def create_partitions(self, starts: Iterable[datetime]) -> None:
+        """지정한 시작 시각의 events / cloudtrail 파티션 생성"""
+        starts = sorted(set(starts))
+        conn = None
+        try:
+            conn = self.connection_pool.getconn()
+            cursor = conn.cursor()
+            cursor.execute(PARTITION_LOCK_SQL)
+
+            for start in starts:
+                end = self.next_start(start)
+                for table, _, is_timestamptz in PARTITIONED_TABLES:
+                    bounds = (start, end)
+                    if is_timestamptz:
+                        bounds = (start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc))
+                    cursor.execute(
+                        PARTITION_CREATE_SQL.format(partition=self.partition_name(table, start), table=table),
+                        bounds
+                    )
+
+            conn.commit()
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if conn:
+                self.connection_pool.putconn(conn)
+
+        with self._lock:
+            self._known.update(starts)
+        logger.info(f"파티션 준비 완료: {', '.join(start.strftime(self._suffix_format) for start in starts)}")
+
+    def drop_expired(self, now: Optional[datetime] = None) -> List[str]:
+        """보존 기간이 지난 파티션 DROP (retention_days가 0이면 아무것도 하지 않음)"""
+        if self.retention_days <= 0:
+            return []
+
+        cutoff = (now or utc_now()) - timedelta(days=self.retention_days)
+        dropped = []
+        conn = None
+        try:
+            conn = self.connection_pool.getconn()
+            cursor = conn.cursor()
+            cursor.execute(PARTITION_LOCK_SQL)
+
+            for table, _, _ in PARTITIONED_TABLES:
+                cursor.execute(PARTITION_LIST_SQL, (table,))
+                for (partition,) in cursor.fetchall():
+                    start = self._parse_partition_start(partition)
+                    # 파티션 전체가 보존 기간 밖일 때만 DROP
+                    if start is None or self.next_start(start) > cutoff:
+                        continue
+                    cursor.execute(PARTITION_DROP_SQL.format(partition=partition))
+                    dropped.append(partition)
+
+            conn.commit()
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if conn:
+                self.connection_pool.putconn(conn)
+
+        if dropped:
+            with self._lock:
+                self._known = {start for start in self._known if self.next_start(start) > cutoff}
+            logger.info(f"보존 기간({self.retention_days}일) 지난 파티션 {len(dropped)}개 삭제: {', '.join(dropped)}")
+        return dropped
+
+    def _parse_partition_start(self, partition: str) -> Optional[datetime]:
+        match = self._name_pattern.search(partition)
+        if not match:
+            return None
+        try:
+            return datetime.strptime(match.group(1), self._suffix_format)
+        except ValueError:
+            return None
+
+    def _premake_starts(self, now: datetime) -> List[datetime]:
+        """현재 파티션과 이후 premake개 파티션의 시작 시각"""
+        starts = [self.partition_start(now)]
+        for _ in range(self.premake):
+            starts.append(self.next_start(starts[-1]))
+        return starts
+
+    def _maybe_maintain(self) -> None:
+        """주기적으로 미래 파티션 생성 + 보존 기간 정리 (실패해도 저장은 계속)"""
+        with self._lock:
+            if time.monotonic() < self._next_maintenance:
+                return
+            self._next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+        try:
+            self.create_partitions(self._premake_starts(utc_now()))
+            self.drop_expired()
+        except Exception as e:
+            logger.error(f"파티션 유지보수 오류: {e}")
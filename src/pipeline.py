@@ -0,0 +1,481 @@
+"""
+S3 다운로드 → 중복 제거 → 저장 파이프라인
+
+세 단계를 별도 스레드에서 동시에 실행하고 단계 사이를 크기가 제한된 큐로 연결합니다.
+RDS 저장이 느리면 큐가 가득 차서 다운로드가 멈추므로(backpressure) 메모리 사용량은
+큐 크기 × 배치 크기로 제한됩니다.
+
+같은 prefix의 배치는 목록 순서대로 저장되며, 체크포인트는 저장에 성공한 배치까지만
+전진합니다. 배치 하나가 실패하면 해당 prefix의 이후 배치는 이번 사이클에서 버리고
+다음 사이클에 실패한 위치부터 다시 수집합니다.
+
+다음 배치의 중복 체크는 앞 배치의 저장(커밋)보다 먼저 실행될 수 있으므로, 중복 체크를 통과해
+저장 단계가 끝나지 않은 배치의 eventID는 DB 조회 결과와 관계없이 중복으로 제외합니다.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .checkpoint import checkpoint_key
+from .cloud_trail import CloudTrailEvent, CloudTrailLogData
+from .config import settings
+from .direct_rds import RowBatch
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 단계 종료 표시
+_DONE = object()
+
+
+@dataclass
+class PrefixBatch:
+    """prefix 하나에서 가져온 연속된 파일 묶음"""
+    key: str                                # 체크포인트 키 (버킷/prefix)
+    bucket: str
+    sequence: int                           # prefix 안에서의 배치 순번
+    files: int
+    events: Any                             # List[CloudTrailEvent] 또는 파싱 프로세스 모드의 RowBatch
+    last_timestamp: Optional[datetime]      # 이 배치까지 처리한 파일 타임스탬프
+    last_key: Optional[str]                 # 이 배치까지 처리한 S3 키
+    since_timestamp: Optional[datetime]     # 중복 판정 기준 (사이클 시작 시점의 체크포인트)
+    reserved_ids: List[str] = field(default_factory=list)  # 저장 단계가 끝날 때까지 다른 배치에서 제외할 eventID
+
+
+class InFlightEventIds:
+    """중복 체크를 통과했지만 아직 저장 단계가 끝나지 않은 eventID"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Set[str] = set()
+
+    def reserve(self, event_ids: List[str]) -> List[int]:
+        """저장 중이 아니고 목록 안에서 처음 나온 eventID의 위치 목록 (해당 eventID는 저장 중으로 등록)"""
+        keep = []
+        with self._lock:
+            for idx, event_id in enumerate(event_ids):
+                if event_id not in self._ids:
+                    self._ids.add(event_id)
+                    keep.append(idx)
+        return keep
+
+    def release(self, event_ids: List[str]) -> None:
+        with self._lock:
+            self._ids.difference_update(event_ids)
+
+
+@dataclass
+class StageStats:
+    """단계별 처리량/대기 시간 통계"""
+    name: str
+    batches: int = 0
+    files: int = 0
+    events: int = 0
+    busy_seconds: float = 0.0       # 실제 작업 시간
+    blocked_seconds: float = 0.0    # 다음 단계 큐가 가득 차서 대기한 시간 (backpressure)
+    max_queue_depth: int = 0        # 출력 큐 최대 깊이
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, files: int, events: int, seconds: float) -> None:
+        with self._lock:
+            self.batches += 1
+            self.files += files
+            self.events += events
+            self.busy_seconds += seconds
+
+    def summary(self, queue_size: Optional[int] = None) -> str:
+        rate = self.events / self.busy_seconds if self.busy_seconds > 0 else 0.0
+        text = (
+            f"{self.name}: 배치 {self.batches}개, 파일 {self.files}개, 이벤트 {self.events}개, "
+            f"작업 {self.busy_seconds:.2f}초 ({rate:,.0f} events/s), 대기 {self.blocked_seconds:.2f}초"
+        )
+        if queue_size is not None:
+            text += f", 큐 최대 {self.max_queue_depth}/{queue_size}"
+        return text
+
+
+@dataclass
+class PipelineResult:
+    """파이프라인 1회 실행 결과"""
+    events_written: int = 0
+    batches_written: int = 0
+    batches_dropped: int = 0
+    failed_keys: Set[str] = field(default_factory=set)
+    # 다운로드/파싱에 실패해 건너뛴 S3 키 {체크포인트 키: [S3 키]}
+    failed_files: Dict[str, List[str]] = field(default_factory=dict)
+    stats: Dict[str, StageStats] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return not self.failed_keys
+
+
+class CollectionPipeline:
+    """다운로드/중복 제거/저장 단계를 겹쳐 실행하는 수집 파이프라인
+
+    Args:
+        s3_collector: S3CloudTrailCollector
+        send_batch: CloudTrailLogData를 저장하고 성공 여부를 반환하는 함수
+        duplicate_checker: check_existing_events를 제공하는 객체 (None이면 중복 체크 생략)
+        on_commit: 배치 저장 성공 시 (체크포인트 키, 타임스탬프, S3 키)로 호출
+        parse_pool: ParsePool이 주어지면 워커 프로세스에서 파싱하고 RowBatch를 send_rows로 저장
+        send_rows: RowBatch를 저장하고 성공 여부를 반환하는 함수 (parse_pool 사용 시 필수)
+        spool_unchecked: 중복 체크가 실패한 배치(DB 장애)를 스풀에 기록하고 성공 여부를 반환하는 함수
+    """
+
+    def __init__(
+        self,
+        s3_collector,
+        send_batch: Callable[[CloudTrailLogData], bool],
+        duplicate_checker=None,
+        on_commit: Optional[Callable[[str, Optional[datetime], Optional[str]], None]] = None,
+        queue_size: Optional[int] = None,
+        files_per_batch: Optional[int] = None,
+        parse_pool=None,
+        send_rows: Optional[Callable[[RowBatch], bool]] = None,
+        spool_unchecked: Optional[Callable[[Any], bool]] = None
+    ):
+        if parse_pool is not None and send_rows is None:
+            raise ValueError("parse_pool 사용 시 send_rows가 필요합니다")
+
+        self.s3_collector = s3_collector
+        self.send_batch = send_batch
+        self.send_rows = send_rows
+        self.spool_unchecked = spool_unchecked
+        self.parse_pool = parse_pool
+        self.duplicate_checker = duplicate_checker
+        self.on_commit = on_commit
+        self.queue_size = max(1, queue_size or settings.pipeline_queue_size)
+        self.files_per_batch = max(1, files_per_batch or settings.pipeline_files_per_batch)
+
+    def run(
+        self,
+        bucket_configs: List[Dict[str, Any]],
+        event_names: Optional[List[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        last_processed_times: Optional[Dict[str, datetime]] = None,
+        last_processed_keys: Optional[Dict[str, str]] = None,
+        object_keys: Optional[Dict[str, List[str]]] = None
+    ) -> PipelineResult:
+        """버킷 설정의 모든 prefix를 파이프라인으로 수집/저장
+
+        object_keys({체크포인트 키: [S3 키]})를 주면 목록 조회 없이 해당 prefix의 지정한 파일만 수집합니다.
+        (실패한 파일 재시도용)
+        """
+        started = time.monotonic()
+
+        # Once 모드: start_time/end_time 사용
+        if start_time or end_time:
+            if end_time is None:
+                end_time = datetime.now()
+            if start_time is None:
+                start_time = end_time - timedelta(seconds=settings.collection_interval)
+
+        result = PipelineResult(stats={
+            'fetch': StageStats('다운로드'),
+            'dedup': StageStats('중복 제거'),
+            'write': StageStats('저장'),
+        })
+        failed_lock = threading.Lock()
+        in_flight = InFlightEventIds()
+        fetched_queue = queue.Queue(maxsize=self.queue_size)
+        deduped_queue = queue.Queue(maxsize=self.queue_size)
+
+        def mark_failed(key: str) -> None:
+            with failed_lock:
+                result.failed_keys.add(key)
+
+        def is_failed(key: str) -> bool:
+            with failed_lock:
+                return key in result.failed_keys
+
+        def mark_files_failed(key: str, obj_keys: List[str]) -> None:
+            with failed_lock:
+                result.failed_files.setdefault(key, []).extend(obj_keys)
+
+        # (버킷, prefix) 단위 다운로드 작업
+        targets = []
+        for config in bucket_configs:
+            for prefix in self.s3_collector._resolve_prefixes(config):
+                if object_keys is None or checkpoint_key(config['bucket_name'], prefix) in object_keys:
+                    targets.append((config, prefix))
+        if object_keys is not None:
+            resolved = {checkpoint_key(config['bucket_name'], prefix) for config, prefix in targets}
+            for key in set(object_keys) - resolved:
+                logger.error(f"[{key}] 설정된 prefix가 아니어서 지정한 파일을 수집하지 못함")
+                mark_failed(key)
+
+        dedup_thread = threading.Thread(
+            target=self._dedup_stage,
+            args=(fetched_queue, deduped_queue, result, in_flight, mark_failed, is_failed),
+            name='pipeline-dedup',
+            daemon=True
+        )
+        write_thread = threading.Thread(
+            target=self._write_stage,
+            args=(deduped_queue, result, in_flight, mark_failed, is_failed),
+            name='pipeline-write',
+            daemon=True
+        )
+        dedup_thread.start()
+        write_thread.start()
+
+        futures = [
+            self.s3_collector._scan_executor.submit(
+                self._fetch_stage,
+                config,
+                prefix,
+                fetched_queue,
+                result.stats['fetch'],
+                event_names,
+                start_time,
+                end_time,
+                (last_processed_times or {}).get(checkpoint_key(config['bucket_name'], prefix)),
+                (last_processed_keys or {}).get(checkpoint_key(config['bucket_name'], prefix)),
+                None if object_keys is None else object_keys[checkpoint_key(config['bucket_name'], prefix)],
+                mark_failed,
+                is_failed,
+                mark_files_failed
+            )
+            for config, prefix in targets
+        ]
+        for future in futures:
+            future.result()
+
+        fetched_queue.put(_DONE)
+        dedup_thread.join()
+        write_thread.join()
+
+        result.elapsed_seconds = time.monotonic() - started
+        self._log_summary(result)
+        return result
+
+    def _put(self, target: queue.Queue, item: Any, stats: StageStats, queue_name: str) -> None:
+        """큐에 넣고 대기 시간/큐 깊이 기록 (큐가 가득 차면 여기서 멈춤)"""
+        wait_started = time.monotonic()
+        target.put(item)
+        waited = time.monotonic() - wait_started
+        depth = target.qsize()
+        metrics.set('logsmith_pipeline_queue_depth', depth, queue=queue_name)
+        with stats._lock:
+            stats.blocked_seconds += waited
+            stats.max_queue_depth = max(stats.max_queue_depth, depth)
+
+    def _fetch_stage(
+        self,
+        config: Dict[str, Any],
+        prefix: str,
+        output: queue.Queue,
+        stats: StageStats,
+        event_names: Optional[List[str]],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        last_timestamp: Optional[datetime],
+        last_key: Optional[str],
+        object_keys: Optional[List[str]],
+        mark_failed: Callable[[str], None],
+        is_failed: Callable[[str], bool],
+        mark_files_failed: Callable[[str, List[str]], None]
+    ) -> None:
+        """prefix 하나의 파일 목록을 files_per_batch개씩 다운로드해 다음 단계로 전달 (object_keys를 주면 목록 조회 생략)"""
+        bucket_name = config['bucket_name']
+        key = checkpoint_key(bucket_name, prefix)
+
+        try:
+            objects = object_keys
+            if objects is None:
+                objects = self.s3_collector._list_s3_objects(
+                    bucket_name,
+                    prefix,
+                    start_time=start_time,
+                    end_time=end_time,
+                    last_timestamp=last_timestamp,
+                    max_files=config.get('max_files', 50),
+                    last_key=last_key
+                )
+
+            for sequence, offset in enumerate(range(0, len(objects), self.files_per_batch)):
+                if is_failed(key):
+                    # 앞 배치가 실패했으면 이후 배치는 다운로드하지 않음
+                    break
+
+                batch_keys = objects[offset:offset + self.files_per_batch]
+                batch_started = time.monotonic()
+                fetched = self.s3_collector._fetch_objects(
+                    bucket_name, batch_keys, event_names, config.get('max_workers'), parse_pool=self.parse_pool
+                )
+                events, batch_timestamp, batch_last_key = self.s3_collector._merge_fetched(
+                    fetched, merged=RowBatch() if self.parse_pool is not None else None
+                )
+                failed_files = [obj_key for obj_key, file_events in fetched if file_events is None]
+                if failed_files:
+                    mark_files_failed(key, failed_files)
+                stats.record(len(batch_keys), len(events), time.monotonic() - batch_started)
+
+                self._put(output, PrefixBatch(
+                    key=key,
+                    bucket=bucket_name,
+                    sequence=sequence,
+                    files=len(batch_keys),
+                    events=events,
+                    last_timestamp=batch_timestamp,
+                    last_key=batch_last_key,
+                    since_timestamp=last_timestamp
+                ), stats, 'fetched')
+
+        except Exception as e:
+            logger.error(f"[{key}] 다운로드 단계 오류: {e}")
+            mark_failed(key)
+
+    def _dedup_stage(
+        self,
+        source: queue.Queue,
+        output: queue.Queue,
+        result: PipelineResult,
+        in_flight: InFlightEventIds,
+        mark_failed: Callable[[str], None],
+        is_failed: Callable[[str], bool]
+    ) -> None:
+        """경계 이벤트 중복 체크 후 다음 단계로 전달 (도착 순서 유지)"""
+        stats = result.stats['dedup']
+
+        while True:
+            batch = source.get()
+            metrics.set('logsmith_pipeline_queue_depth', source.qsize(), queue='fetched')
+            if batch is _DONE:
+                output.put(_DONE)
+                return
+
+            if is_failed(batch.key):
+                output.put(batch)  # 저장 단계에서 버린 배치로 집계
+                continue
+
+            try:
+                dedup_started = time.monotonic()
+                before = len(batch.events)
+                if isinstance(batch.events, RowBatch):
+                    batch.events = self.s3_collector._filter_new_rows(
+                        batch.events, batch.since_timestamp, self.duplicate_checker
+                    )
+                elif batch.events:
+                    batch.events = self.s3_collector._filter_new_events(
+                        batch.events, batch.since_timestamp, self.duplicate_checker
+                    )
+                self._reserve(batch, in_flight)
+                stats.record(batch.files, len(batch.events), time.monotonic() - dedup_started)
+                metrics.inc('logsmith_events_deduped_total', before - len(batch.events), bucket=batch.bucket)
+            except Exception as e:
+                if self.spool_unchecked and self.spool_unchecked(batch.events):
+                    # 스풀 재전송 시 중복 체크하므로 여기서는 저장할 것이 없는 배치로 전달 (체크포인트는 전진)
+                    logger.warning(f"[{batch.key}] 중복 체크 실패, 배치를 스풀에 기록: {e}")
+                    batch.events = RowBatch() if isinstance(batch.events, RowBatch) else []
+                else:
+                    logger.error(f"[{batch.key}] 중복 체크 실패, 이번 사이클 중단: {e}")
+                    mark_failed(batch.key)
+
+            self._put(output, batch, stats, 'deduped')
+
+    def _write_stage(
+        self,
+        source: queue.Queue,
+        result: PipelineResult,
+        in_flight: InFlightEventIds,
+        mark_failed: Callable[[str], None],
+        is_failed: Callable[[str], bool]
+    ) -> None:
+        """배치를 저장하고 성공한 배치까지 체크포인트 전진"""
+        while True:
+            batch = source.get()
+            metrics.set('logsmith_pipeline_queue_depth', source.qsize(), queue='deduped')
+            if batch is _DONE:
+                return
+
+            try:
+                self._write_batch(batch, result, mark_failed, is_failed)
+            finally:
+                # 커밋된 eventID는 이후 DB 중복 체크로 확인 (실패/버린 배치는 다음 사이클에 다시 수집)
+                in_flight.release(batch.reserved_ids)
+
+    def _write_batch(
+        self,
+        batch: PrefixBatch,
+        result: PipelineResult,
+        mark_failed: Callable[[str], None],
+        is_failed: Callable[[str], bool]
+    ) -> None:
+        """배치 하나를 저장하고 성공하면 체크포인트 전진 (앞 배치가 실패한 prefix는 버림)"""
+        if is_failed(batch.key):
+            result.batches_dropped += 1
+            return
+
+        try:
+            write_started = time.monotonic()
+            success = True
+            if isinstance(batch.events, RowBatch):
+                success = self.send_rows(batch.events)
+            elif batch.events:
+                success = self.send_batch(CloudTrailLogData(records=batch.events))
+            result.stats['write'].record(batch.files, len(batch.events), time.monotonic() - write_started)
+        except Exception as e:
+            logger.error(f"[{batch.key}] 저장 단계 오류: {e}")
+            success = False
+
+        if not success:
+            logger.error(f"[{batch.key}] 배치 {batch.sequence} 저장 실패, 이후 배치는 다음 사이클에 재수집")
+            mark_failed(batch.key)
+            return
+
+        result.batches_written += 1
+        result.events_written += len(batch.events)
+        self._record_written(batch)
+
+        if self.on_commit and (batch.last_timestamp or batch.last_key):
+            try:
+                self.on_commit(batch.key, batch.last_timestamp, batch.last_key)
+            except Exception as e:
+                logger.error(f"[{batch.key}] 체크포인트 기록 오류: {e}")
+
+    @staticmethod
+    def _reserve(batch: PrefixBatch, in_flight: InFlightEventIds) -> None:
+        """저장 중인 다른 배치에 있거나 배치 안에서 반복되는 eventID를 제외하고 나머지를 저장 중으로 등록"""
+        if isinstance(batch.events, RowBatch):
+            event_ids = batch.events.event_ids
+        else:
+            event_ids = [event.event_id for event in batch.events]
+
+        keep = in_flight.reserve(event_ids)
+        if len(keep) < len(event_ids):
+            if isinstance(batch.events, RowBatch):
+                batch.events = batch.events.select(keep)
+            else:
+                batch.events = [batch.events[idx] for idx in keep]
+        batch.reserved_ids = [event_ids[idx] for idx in keep]
+
+    def _record_written(self, batch: PrefixBatch) -> None:
+        """저장 지표 + 버킷별 최신 eventTime (수집 지연) 기록"""
+        if not batch.events:
+            return
+        metrics.inc('logsmith_events_written_total', len(batch.events), bucket=batch.bucket)
+        if isinstance(batch.events, RowBatch):
+            event_times = [value for value in batch.events.event_times if value is not None]
+        else:
+            event_times = [event.event_datetime for event in batch.events if event.event_datetime is not None]
+        if event_times:
+            metrics.record_event_time(max(event_times), bucket=batch.bucket)
+
+    def _log_summary(self, result: PipelineResult) -> None:
+        logger.info(
+            f"파이프라인 완료: {result.events_written}개 이벤트 저장, 배치 {result.batches_written}개 "
+            f"(버림 {result.batches_dropped}개, 실패 prefix {len(result.failed_keys)}개), "
+            f"{result.elapsed_seconds:.2f}초"
+        )
+        logger.info(f"  {result.stats['fetch'].summary(self.queue_size)}")
+        logger.info(f"  {result.stats['dedup'].summary(self.queue_size)}")
+        logger.info(f"  {result.stats['write'].summary()}")
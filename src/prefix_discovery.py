@@ -0,0 +1,82 @@
+"""
+CloudTrail 로그 prefix 자동 탐색
+
+버킷 설정에 prefix가 없을 때 버킷 안의 모든 계정 × 리전 CloudTrail 경로를 찾습니다.
+
+    단일 계정 트레일: AWSLogs/{account_id}/CloudTrail/{region}/
+    조직 트레일:     AWSLogs/{org_id}/{account_id}/CloudTrail/{region}/
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CloudTrailPrefixDiscovery:
+    """Delimiter 목록 조회로 CloudTrail prefix를 탐색하고 TTL 동안 캐시"""
+
+    def __init__(self, s3_client, ttl_seconds: int = 3600, base_prefix: str = 'AWSLogs/'):
+        self.s3_client = s3_client
+        self.ttl_seconds = ttl_seconds
+        self.base_prefix = base_prefix
+        self._cache: Dict[Tuple[str, Optional[str]], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def discover(self, bucket_name: str, region: Optional[str] = None) -> List[str]:
+        """버킷의 CloudTrail 로그 prefix 목록 (region 지정 시 해당 리전만)"""
+        cache_key = (bucket_name, region)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached and cached[0] > now:
+                return list(cached[1])
+
+        prefixes = self._discover(bucket_name, region)
+        logger.info(f"[{bucket_name}] CloudTrail prefix {len(prefixes)}개 탐색")
+
+        with self._lock:
+            self._cache[cache_key] = (now + self.ttl_seconds, prefixes)
+
+        return list(prefixes)
+
+    def invalidate(self, bucket_name: Optional[str] = None) -> None:
+        """캐시 무효화 (bucket_name이 없으면 전체)"""
+        with self._lock:
+            if bucket_name is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if key[0] == bucket_name]:
+                    del self._cache[key]
+
+    def _discover(self, bucket_name: str, region: Optional[str]) -> List[str]:
+        prefixes = []
+
+        for top_prefix in self._list_common_prefixes(bucket_name, self.base_prefix):
+            name = top_prefix[len(self.base_prefix):].rstrip('/')
+
+            # 조직 트레일이면 한 단계 아래가 계정 ID
+            if name.startswith('o-'):
+                account_prefixes = self._list_common_prefixes(bucket_name, top_prefix)
+            else:
+                account_prefixes = [top_prefix]
+
+            for account_prefix in account_prefixes:
+                cloudtrail_prefix = f"{account_prefix}CloudTrail/"
+                for region_prefix in self._list_common_prefixes(bucket_name, cloudtrail_prefix):
+                    if region and region_prefix != f"{cloudtrail_prefix}{region}/":
+                        continue
+                    prefixes.append(region_prefix)
+
+        return sorted(prefixes)
+
+    def _list_common_prefixes(self, bucket_name: str, prefix: str) -> List[str]:
+        """prefix 바로 아래 '디렉터리' 목록"""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        common_prefixes = []
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix, Delimiter='/'):
+            common_prefixes.extend(item['Prefix'] for item in page.get('CommonPrefixes', []))
+        return common_prefixes
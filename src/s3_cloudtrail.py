@@ -1,16 +1,101 @@
 import boto3
-import json
-import gzip
+import io
+import itertools
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from .cloud_trail import CloudTrailLogData, CloudTrailEvent
+from typing import List, Optional, Dict, Any, Tuple
+from botocore.config import Config
+from .checkpoint import checkpoint_key
+from .cloud_trail import CloudTrailLogData, CloudTrailEvent, parse_event_time
+from .cloudtrail_stream import iter_cloudtrail_records
 from .config import settings
+from .direct_rds import RowBatch
+from .metrics import metrics
+from .object_cache import ObjectCache
+from .partitions import event_time_range
+from .prefix_discovery import CloudTrailPrefixDiscovery
+
+# 마지막 처리 시간 이후 이 시간이 지난 이벤트는 중복 체크 없이 신규로 판정
+BOUNDARY_MARGIN = timedelta(hours=1)
+
+
+def classify_boundary_events(
+    events: List[CloudTrailEvent],
+    last_timestamp: Optional[datetime],
+    boundary_margin: timedelta = BOUNDARY_MARGIN
+) -> Tuple[List[CloudTrailEvent], List[CloudTrailEvent]]:
+    """이벤트를 (확실히 새로운 이벤트, 중복 체크가 필요한 경계 이벤트)로 한 번에 분류
+
+    from_dict에서 파싱해 둔 event_datetime을 사용하며, 첫 실행(last_timestamp 없음)이면 전체가 경계 이벤트입니다.
+    """
+    if not last_timestamp:
+        return [], list(events)
+
+    boundary_time = last_timestamp + boundary_margin
+    definite_new_events = []
+    boundary_events = []
+
+    for event in events:
+        event_time = event.event_datetime
+        if event_time is None:
+            event_time = parse_event_time(event.event_time)
+        if event_time is not None and event_time > boundary_time:
+            definite_new_events.append(event)
+        else:
+            boundary_events.append(event)
+
+    return definite_new_events, boundary_events
+
 
 class S3CloudTrailCollector:
     def __init__(self, region: str = 'ap-northeast-2'):
         self.region = region
-        self.s3_client = boto3.client('s3', region_name=region)
+        # 동시 다운로드 수만큼 HTTP 커넥션 확보
+        self.s3_client = boto3.client(
+            's3',
+            region_name=region,
+            endpoint_url=settings.s3_endpoint_url,
+            config=Config(max_pool_connections=max(10, settings.s3_max_workers))
+        )
+        # 전체 버킷이 공유하는 다운로드 워커 풀 (전역 동시성 상한)
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.s3_max_workers),
+            thread_name_prefix='s3-fetch'
+        )
+        # prefix(계정 × 리전) 단위 병렬 수집 풀 - 다운로드 풀과 분리해 교착 방지
+        self._scan_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.prefix_scan_workers),
+            thread_name_prefix='s3-scan'
+        )
+        self.prefix_discovery = CloudTrailPrefixDiscovery(
+            self.s3_client,
+            ttl_seconds=settings.prefix_discovery_ttl
+        )
+        # 사이클 동안 prefix별 목록 조회 결과 {checkpoint_key: (매칭 파일 수, max_files)} - 스케줄러가 적체 판단에 사용
+        self._listing_stats: Dict[str, Tuple[int, int]] = {}
+        self._listing_lock = threading.Lock()
+        # 다운로드한 객체 로컬 캐시 (OBJECT_CACHE_DIR 설정 시) 및 목록 조회에서 받은 ETag {(버킷, 키): ETag}
+        self.object_cache = (
+            ObjectCache(settings.object_cache_dir, settings.object_cache_max_bytes)
+            if settings.object_cache_dir else None
+        )
+        self._listed_etags: Dict[Tuple[str, str], str] = {}
+
+    def reset_listing_stats(self) -> None:
+        """사이클 시작 전 목록 조회 통계 초기화"""
+        with self._listing_lock:
+            self._listing_stats = {}
+            self._listed_etags = {}
+
+    def listing_summary(self) -> Tuple[int, bool]:
+        """(이번 사이클에 조회된 파일 수, max_files에 걸려 남은 파일이 있는 prefix가 있는지)"""
+        with self._listing_lock:
+            files = sum(matched for matched, _ in self._listing_stats.values())
+            backlog = any(matched >= max_files for matched, max_files in self._listing_stats.values())
+        return files, backlog
     
     def _extract_datetime_from_filename(self, filename: str) -> Optional[datetime]:
         """
@@ -52,7 +137,7 @@ class S3CloudTrailCollector:
             prefix = self._find_cloudtrail_prefix(bucket_name, region)
         
         # S3 객체 목록 가져오기
-        objects = self._list_s3_objects(bucket_name, prefix, start_time, end_time, max_files)
+        objects = self._list_s3_objects(bucket_name, prefix, start_time, end_time, max_files=max_files)
         
         all_events = []
         for obj_key in objects:
@@ -104,6 +189,130 @@ class S3CloudTrailCollector:
 
         return prefixes
 
+    def _cloudtrail_filename_stem(self, prefix: str) -> Optional[str]:
+        """prefix에서 로그 파일명 앞부분 추출
+
+        AWSLogs/{account_id}/CloudTrail/{region}/ → {account_id}_CloudTrail_{region}_
+        (조직 트레일 AWSLogs/{org_id}/{account_id}/CloudTrail/{region}/ 도 동일)
+        """
+        parts = prefix.rstrip('/').split('/')
+        if len(parts) >= 3 and parts[-2] == 'CloudTrail':
+            return f"{parts[-3]}_CloudTrail_{parts[-1]}_"
+        return None
+
+    def _start_after_key(
+        self,
+        date_prefix: str,
+        filename_stem: Optional[str],
+        since: Optional[datetime] = None,
+        last_key: Optional[str] = None
+    ) -> Optional[str]:
+        """날짜 prefix 안에서 목록 조회를 시작할 StartAfter 키
+
+        같은 날짜 prefix 안의 키는 파일명 타임스탬프 순으로 정렬되므로
+        마지막으로 처리한 키(또는 시작 시각에 해당하는 파일명) 이후부터 조회하면 됩니다.
+        """
+        if last_key and last_key.startswith(date_prefix):
+            return last_key
+
+        if since and filename_stem and date_prefix.endswith(since.strftime('%Y/%m/%d/')):
+            # 예: ..._CloudTrail_ap-northeast-2_20250903T0905 → 09:05 이후 파일부터
+            return f"{date_prefix}{filename_stem}{since.strftime('%Y%m%dT%H%M')}"
+
+        return None
+
+    def _iter_s3_keys(
+        self,
+        bucket_name: str,
+        prefix: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        last_timestamp: Optional[datetime] = None,
+        last_key: Optional[str] = None,
+        scan_stats: Optional[Dict[str, int]] = None
+    ):
+        """조건에 맞는 CloudTrail 로그 키를 키 순서대로 반환 (페이지는 필요한 만큼만 조회)"""
+        if scan_stats is None:
+            scan_stats = {}
+        scan_stats.setdefault('list_calls', 0)
+        scan_stats.setdefault('total_files', 0)
+
+        once_mode = bool(start_time or end_time)
+        filename_stem = self._cloudtrail_filename_stem(prefix)
+
+        # 날짜 기반 prefix 생성
+        date_prefixes = self._generate_date_prefixes(prefix, start_time, end_time, last_timestamp)
+        print(f"날짜 기반 prefix {len(date_prefixes)}개 생성")
+
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+
+        # 각 날짜별 prefix에서 파일 검색
+        for date_prefix in date_prefixes:
+            start_after = self._start_after_key(
+                date_prefix,
+                filename_stem,
+                since=start_time if once_mode else last_timestamp,
+                last_key=last_key
+            )
+            print(f"  검색 중: {date_prefix}" + (f" (StartAfter={start_after.split('/')[-1]})" if start_after else ""))
+
+            # 마지막 처리 키가 이 prefix 안에 있으면 분 단위 파일 시각 대신 키로 이어서 조회
+            # (같은 분의 파일이 max_files에서 잘려도 나머지를 다음 사이클에 처리)
+            resume_by_key = bool(last_key and last_key.startswith(date_prefix))
+
+            params = {'Bucket': bucket_name, 'Prefix': date_prefix}
+            if start_after:
+                params['StartAfter'] = start_after
+
+            past_end = False
+            pages = iter(paginator.paginate(**params))
+            while True:
+                # 페이지 하나 = ListObjectsV2 요청 하나
+                with metrics.timer('logsmith_s3_list_seconds', bucket=bucket_name):
+                    page = next(pages, None)
+                if page is None:
+                    break
+                scan_stats['list_calls'] += 1
+
+                for obj in page.get('Contents', []):
+                    key = obj['Key']
+                    scan_stats['total_files'] += 1
+
+                    if not key.endswith('.json.gz'):
+                        continue
+
+                    file_datetime = self._extract_datetime_from_filename(key.split('/')[-1])
+                    if not file_datetime:
+                        continue
+
+                    # Once 모드: 시간 범위 필터 (last_key가 있으면 범위 안에서 이어서 조회 - 백필 재개용)
+                    if once_mode:
+                        if last_key and key <= last_key:
+                            continue
+                        if start_time and file_datetime < start_time:
+                            continue
+                        if end_time and file_datetime > end_time:
+                            # 이후 키는 모두 범위 밖 (같은 계정/리전 prefix는 시간순 정렬)
+                            if filename_stem:
+                                past_end = True
+                                break
+                            continue
+
+                    # Service 모드: 마지막 처리 키 이후, 키가 없는 prefix는 마지막 시간 이후
+                    elif resume_by_key:
+                        if key <= last_key:
+                            continue
+                    elif last_timestamp and file_datetime <= last_timestamp:
+                        continue
+
+                    if self.object_cache is not None and obj.get('ETag'):
+                        with self._listing_lock:
+                            self._listed_etags[(bucket_name, key)] = obj['ETag']
+                    yield key
+
+                if past_end:
+                    break
+
     def _list_s3_objects(
         self,
         bucket_name: str,
@@ -111,92 +320,57 @@ class S3CloudTrailCollector:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         last_timestamp: Optional[datetime] = None,
-        max_files: int = 50
+        max_files: int = 50,
+        last_key: Optional[str] = None
     ) -> List[str]:
-        """시간 범위 또는 마지막 타임스탬프 이후 S3 객체 목록 반환"""
+        """시간 범위 또는 마지막 처리 키 이후 S3 객체 목록 반환 (최대 max_files개)
+
+        Service 모드에서는 마지막으로 처리한 키부터 StartAfter로 이어서 조회하므로
+        하루 중 어느 시점이든 사이클당 LIST 호출 수가 일정합니다.
+        """
 
         objects = []
+        scan_stats = {}
 
         try:
             print(f"S3 검색 시작: bucket={bucket_name}, prefix={prefix}")
 
             # 검색 모드 출력
             if start_time or end_time:
-                print(f"[Once 모드] 시간 범위: {start_time} ~ {end_time}")
-            elif last_timestamp:
-                print(f"[Service 모드] 마지막 처리 이후: {last_timestamp}")
+                print(f"[Once 모드] 시간 범위: {start_time} ~ {end_time}" + (f" ({last_key} 이후)" if last_key else ""))
+            elif last_key or last_timestamp:
+                print(f"[Service 모드] 마지막 처리 이후: {last_timestamp} ({last_key or '키 없음'})")
             else:
                 print(f"[첫 실행] 최대 {max_files}개 파일 처리")
 
-            # 날짜 기반 prefix 생성
-            date_prefixes = self._generate_date_prefixes(prefix, start_time, end_time, last_timestamp)
-            print(f"날짜 기반 prefix {len(date_prefixes)}개 생성")
-
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-
-            total_files = 0
-            matched_files = 0
-
-            # 각 날짜별 prefix에서 파일 검색
-            for date_prefix in date_prefixes:
-                print(f"  검색 중: {date_prefix}")
-
-                try:
-                    pages = paginator.paginate(Bucket=bucket_name, Prefix=date_prefix)
-
-                    for page in pages:
-                        if 'Contents' in page:
-                            for obj in page['Contents']:
-                                key = obj['Key']
-                                total_files += 1
-
-                                if key.endswith('.json.gz'):
-                                    filename = key.split('/')[-1]
-                                    file_datetime = self._extract_datetime_from_filename(filename)
-
-                                    if file_datetime:
-                                        # Once 모드: 시간 범위 필터
-                                        if start_time or end_time:
-                                            if start_time <= file_datetime <= end_time:
-                                                objects.append(key)
-                                                matched_files += 1
-
-                                        # Service 모드: 마지막 시간 이후
-                                        elif last_timestamp:
-                                            if file_datetime > last_timestamp:
-                                                objects.append(key)
-                                                matched_files += 1
-
-                                        # 첫 실행: 모든 파일
-                                        else:
-                                            objects.append(key)
-                                            matched_files += 1
-
-                                        # max_files 제한
-                                        if len(objects) >= max_files:
-                                            break
-
-                        if len(objects) >= max_files:
-                            break
-
-                except Exception as e:
-                    print(f"  {date_prefix} 검색 오류: {e}")
-                    continue
-
-                if len(objects) >= max_files:
-                    break
-
-            print(f"S3 검색 결과: 전체 {total_files}개 파일 중 {matched_files}개 매칭")
-            if matched_files > 0:
-                print(f"첫 번째 매칭 파일: {objects[0]}")
-                if matched_files > 1:
-                    print(f"마지막 매칭 파일: {objects[-1]}")
+            keys = self._iter_s3_keys(
+                bucket_name,
+                prefix,
+                start_time=start_time,
+                end_time=end_time,
+                last_timestamp=last_timestamp,
+                last_key=last_key,
+                scan_stats=scan_stats
+            )
+            # max_files개를 채우면 더 이상 페이지를 요청하지 않음
+            for key in itertools.islice(keys, max_files):
+                objects.append(key)
 
         except Exception as e:
+            # 목록 조회가 중간에 실패하면 그때까지의 키만 처리 (체크포인트는 처리한 키까지만 진행)
             print(f"S3 검색 오류: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+
+        with self._listing_lock:
+            self._listing_stats[checkpoint_key(bucket_name, prefix)] = (len(objects), max_files)
+
+        print(
+            f"S3 검색 결과: 전체 {scan_stats.get('total_files', 0)}개 파일 중 {len(objects)}개 매칭 "
+            f"(LIST 요청 {scan_stats.get('list_calls', 0)}회)"
+        )
+        if objects:
+            print(f"첫 번째 매칭 파일: {objects[0]}")
+            if len(objects) > 1:
+                print(f"마지막 매칭 파일: {objects[-1]}")
 
         return objects
     
@@ -209,31 +383,122 @@ class S3CloudTrailCollector:
     ) -> List[CloudTrailEvent]:
         """S3 객체에서 CloudTrail 이벤트 추출"""
         
-        # S3에서 파일 다운로드
-        response = self.s3_client.get_object(Bucket=bucket_name, Key=object_key)
-        
-        # gzip 압축 해제
-        with gzip.GzipFile(fileobj=response['Body']) as gz_file:
-            content = gz_file.read().decode('utf-8')
-        
-        # JSON 파싱
-        data = json.loads(content)
+        # S3에서 파일 다운로드 (로컬 캐시에 있으면 캐시에서 읽음)
+        body = self._get_object_body(bucket_name, object_key)
         
+        # gzip 압축 해제 + JSON 파싱을 레코드 단위로 스트리밍 (파일 전체를 메모리에 올리지 않음)
+        decode_started = time.perf_counter()
+        parsed = filtered = skipped = 0
         events = []
-        for record in data.get('Records', []):
+        for record in iter_cloudtrail_records(body):
+            parsed += 1
+
             # 특정 이벤트만 필터링
             if event_names and record.get('eventName') not in event_names:
+                filtered += 1
                 continue
             
             # 기존 eventID 중복 체크
             event_id = record.get('eventID')
             if existing_event_ids and event_id in existing_event_ids:
+                skipped += 1
                 continue
             
             event = CloudTrailEvent.from_dict(record)
             events.append(event)
+
+        metrics.observe('logsmith_decode_seconds', time.perf_counter() - decode_started, bucket=bucket_name)
+        metrics.inc('logsmith_events_parsed_total', parsed, bucket=bucket_name)
+        metrics.inc('logsmith_events_filtered_total', filtered, bucket=bucket_name)
+        metrics.inc('logsmith_events_deduped_total', skipped, bucket=bucket_name)
         
         return events
+
+    def _process_s3_object_rows(
+        self,
+        bucket_name: str,
+        object_key: str,
+        parse_pool,
+        event_names: Optional[List[str]] = None
+    ) -> RowBatch:
+        """S3 객체를 내려받아 파싱 프로세스에서 COPY 입력 행으로 변환"""
+        data = self._get_object_body(bucket_name, object_key).read()
+
+        # 워커 대기 시간 포함
+        with metrics.timer('logsmith_decode_seconds', bucket=bucket_name):
+            rows = parse_pool.parse(data, event_names)
+        metrics.inc('logsmith_events_parsed_total', rows.parsed, bucket=bucket_name)
+        metrics.inc('logsmith_events_filtered_total', rows.parsed - len(rows), bucket=bucket_name)
+        return rows
+
+    def _get_object_body(self, bucket_name: str, object_key: str):
+        """S3 객체 본문 (파일 객체)
+
+        캐시를 사용하지 않으면 스트리밍 Body를 그대로 반환하고, 사용하면 목록 조회 때 받은 ETag로
+        캐시를 먼저 확인한 뒤 없으면 내려받아 캐시에 저장합니다.
+        """
+        cache = self.object_cache
+        if cache is not None:
+            with self._listing_lock:
+                etag = self._listed_etags.pop((bucket_name, object_key), None)
+            data = cache.get(bucket_name, object_key, etag)
+            if data is not None:
+                return io.BytesIO(data)
+
+        with metrics.timer('logsmith_s3_get_seconds', bucket=bucket_name):
+            response = self.s3_client.get_object(Bucket=bucket_name, Key=object_key)
+        if cache is None:
+            metrics.inc('logsmith_s3_bytes_total', response.get('ContentLength', 0), bucket=bucket_name)
+            return response['Body']
+
+        data = response['Body'].read()
+        metrics.inc('logsmith_s3_bytes_total', len(data), bucket=bucket_name)
+        cache.put(bucket_name, object_key, response.get('ETag') or etag, data)
+        return io.BytesIO(data)
+
+    def _fetch_objects(
+        self,
+        bucket_name: str,
+        object_keys: List[str],
+        event_names: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        parse_pool=None
+    ) -> List[Tuple[str, Any]]:
+        """S3 객체들을 병렬로 다운로드/파싱
+
+        버킷별 동시 처리 수는 max_workers, 전체 동시 처리 수는 S3_MAX_WORKERS로 제한됩니다.
+        parse_pool(ParsePool)이 주어지면 파싱은 워커 프로세스에서 하고 RowBatch를 반환합니다.
+
+        Returns:
+            list: 입력 순서 그대로의 [(obj_key, 이벤트 목록 또는 RowBatch)], 처리 실패한 파일은 None
+        """
+        workers = max(1, min(max_workers or settings.s3_max_workers, settings.s3_max_workers))
+        bucket_slots = threading.BoundedSemaphore(workers)
+
+        def fetch(obj_key: str):
+            try:
+                if parse_pool is not None:
+                    return self._process_s3_object_rows(bucket_name, obj_key, parse_pool, event_names)
+                return self._process_s3_object(bucket_name, obj_key, event_names)
+            except Exception as e:
+                # 파일 단위 오류 격리: 실패한 파일만 건너뜀
+                print(f"  파일 처리 오류 ({obj_key}): {e}")
+                return None
+            finally:
+                bucket_slots.release()
+
+        futures = []
+        for obj_key in object_keys:
+            bucket_slots.acquire()
+            futures.append(self._fetch_executor.submit(fetch, obj_key))
+
+        results = []
+        for idx, (obj_key, future) in enumerate(zip(object_keys, futures), 1):
+            results.append((obj_key, future.result()))
+            if idx % 10 == 0:
+                print(f"  진행: {idx}/{len(object_keys)} 파일 처리 완료")
+
+        return results
     
     def collect_from_multiple_buckets_batch(
         self,
@@ -243,53 +508,90 @@ class S3CloudTrailCollector:
         end_time: Optional[datetime] = None,
         event_names: Optional[List[str]] = None,
         batch_size: int = 100,
-        last_processed_times: Optional[Dict[str, datetime]] = None
-    ) -> tuple[CloudTrailLogData, Dict[str, datetime]]:
+        last_processed_times: Optional[Dict[str, datetime]] = None,
+        last_processed_keys: Optional[Dict[str, str]] = None
+    ) -> tuple[CloudTrailLogData, Dict[str, datetime], Dict[str, str]]:
         """여러 S3 버킷에서 배치 단위로 로그 수집
 
         Args:
-            last_processed_times: 버킷별 마지막 처리 타임스탬프 {bucket_name: datetime}
+            last_processed_times: 버킷/prefix별 마지막 처리 타임스탬프 {checkpoint_key: datetime}
+            last_processed_keys: 버킷/prefix별 마지막 처리 S3 키 {checkpoint_key: str}
 
         Returns:
-            tuple: (CloudTrailLogData, {bucket_name: last_timestamp})
+            tuple: (CloudTrailLogData, {checkpoint_key: last_timestamp}, {checkpoint_key: last_key})
         """
 
         all_events = []
         updated_times = {}
+        updated_keys = {}
 
         if last_processed_times is None:
             last_processed_times = {}
+        if last_processed_keys is None:
+            last_processed_keys = {}
 
+        # (버킷, prefix) 단위 수집 작업 목록 - prefix가 없으면 계정 × 리전 prefix 자동 탐색
+        targets = []
         for config in bucket_configs:
-            bucket_name = config['bucket_name']
-            prefix = config.get('prefix')
-            region = config.get('region')
-            max_files = config.get('max_files', 50)
+            for prefix in self._resolve_prefixes(config):
+                targets.append((config, prefix))
 
+        def collect(target):
+            config, prefix = target
+            bucket_name = config['bucket_name']
+            key = checkpoint_key(bucket_name, prefix)
+            return key, self._collect_bucket_batch(
+                bucket_name=bucket_name,
+                prefix=prefix,
+                region=config.get('region'),
+                start_time=start_time,
+                end_time=end_time,
+                event_names=event_names,
+                max_files=config.get('max_files', 50),
+                duplicate_checker=duplicate_checker,
+                batch_size=batch_size,
+                last_timestamp=last_processed_times.get(key),
+                max_workers=config.get('max_workers'),
+                last_key=last_processed_keys.get(key)
+            )
+
+        # prefix별로 병렬 수집, 결과는 작업 순서대로 합침
+        futures = [self._scan_executor.submit(collect, target) for target in targets]
+
+        for (config, prefix), future in zip(targets, futures):
             try:
-                events, last_timestamp = self._collect_bucket_batch(
-                    bucket_name=bucket_name,
-                    prefix=prefix,
-                    region=region,
-                    start_time=start_time,
-                    end_time=end_time,
-                    event_names=event_names,
-                    max_files=max_files,
-                    duplicate_checker=duplicate_checker,
-                    batch_size=batch_size,
-                    last_timestamp=last_processed_times.get(bucket_name)
-                )
+                key, (events, last_timestamp, last_key) = future.result()
                 all_events.extend(events)
 
-                # 마지막 타임스탬프 저장
+                # 마지막 타임스탬프/키 저장
                 if last_timestamp:
-                    updated_times[bucket_name] = last_timestamp
+                    updated_times[key] = last_timestamp
+                if last_key:
+                    updated_keys[key] = last_key
 
             except Exception as e:
-                print(f"Error collecting from bucket {bucket_name}: {e}")
+                print(f"Error collecting from bucket {config['bucket_name']} ({prefix}): {e}")
                 continue
 
-        return CloudTrailLogData(records=all_events), updated_times
+        return CloudTrailLogData(records=all_events), updated_times, updated_keys
+
+    def _resolve_prefixes(self, config: Dict[str, Any]) -> List[str]:
+        """버킷 설정의 수집 대상 prefix 목록"""
+        if config.get('prefix'):
+            return [config['prefix']]
+
+        bucket_name = config['bucket_name']
+        try:
+            prefixes = self.prefix_discovery.discover(bucket_name, config.get('region'))
+        except Exception as e:
+            print(f"[{bucket_name}] CloudTrail prefix 탐색 오류: {e}")
+            prefixes = []
+
+        if not prefixes:
+            # 표준 경로가 아니면 기존 방식으로 하나만 탐지
+            prefixes = [self._find_cloudtrail_prefix(bucket_name, config.get('region'))]
+
+        return prefixes
 
     def _collect_bucket_batch(
         self,
@@ -302,8 +604,10 @@ class S3CloudTrailCollector:
         max_files: int = 10,
         duplicate_checker=None,
         batch_size: int = 100,
-        last_timestamp: Optional[datetime] = None
-    ) -> tuple[List[CloudTrailEvent], Optional[datetime]]:
+        last_timestamp: Optional[datetime] = None,
+        max_workers: Optional[int] = None,
+        last_key: Optional[str] = None
+    ) -> tuple[List[CloudTrailEvent], Optional[datetime], Optional[str]]:
         """S3 버킷에서 최적화된 배치 처리
 
         개선 사항:
@@ -312,7 +616,7 @@ class S3CloudTrailCollector:
         3. 한 번의 쿼리로 전체 중복 체크
 
         Returns:
-            tuple: (이벤트 목록, 마지막 처리 파일 타임스탬프)
+            tuple: (이벤트 목록, 마지막 처리 파일 타임스탬프, 마지막 처리 S3 키)
         """
 
         # Once 모드: start_time/end_time 사용
@@ -332,67 +636,82 @@ class S3CloudTrailCollector:
             start_time=start_time,
             end_time=end_time,
             last_timestamp=last_timestamp,
-            max_files=max_files
+            max_files=max_files,
+            last_key=last_key
         )
 
         if not objects:
-            return [], None
+            return [], None, None
 
         print(f"총 {len(objects)}개 파일 처리 시작...")
 
-        # ===== 1단계: 모든 파일에서 이벤트 수집 (DB 접근 없음) =====
-        all_events = []
-        file_timestamps = []
+        # ===== 1단계: 모든 파일에서 이벤트 수집 (DB 접근 없음, 병렬 다운로드) =====
+        fetched = self._fetch_objects(bucket_name, objects, event_names, max_workers)
+        all_events, last_file_timestamp, last_processed_key = self._merge_fetched(fetched)
 
-        for idx, obj_key in enumerate(objects, 1):
-            try:
-                if idx % 10 == 0:
-                    print(f"  진행: {idx}/{len(objects)} 파일 처리 중...")
+        print(f"1단계 완료: {len(all_events)}개 이벤트 수집됨")
+
+        if not all_events:
+            # 이벤트가 없어도 처리한 파일 위치는 반환 (같은 파일 재조회 방지)
+            return [], last_file_timestamp, last_processed_key
 
-                # S3 파일에서 이벤트 추출
-                file_events = self._process_s3_object(bucket_name, obj_key, event_names)
+        # ===== 2~3단계: 시간 기반 분류 후 경계 이벤트만 중복 체크 =====
+        final_events = self._filter_new_events(all_events, last_timestamp, duplicate_checker)
+        metrics.inc('logsmith_events_deduped_total', len(all_events) - len(final_events), bucket=bucket_name)
 
-                if file_events:
-                    all_events.extend(file_events)
+        print(f"최종: {len(final_events)}개 신규 이벤트 반환")
+        return final_events, last_file_timestamp, last_processed_key
 
-                # 파일 타임스탬프 추출
-                filename = obj_key.split('/')[-1]
-                file_time = self._extract_datetime_from_filename(filename)
-                if file_time:
-                    file_timestamps.append(file_time)
+    def _merge_fetched(
+        self,
+        fetched: List[Tuple[str, Any]],
+        merged=None
+    ) -> Tuple[Any, Optional[datetime], Optional[str]]:
+        """_fetch_objects 결과를 (이벤트 목록, 마지막 파일 타임스탬프, 마지막 처리 S3 키)로 합침
 
-            except Exception as e:
-                print(f"  파일 처리 오류 ({obj_key}): {e}")
+        merged에 RowBatch()를 넘기면 파일별 RowBatch를 하나로 합칩니다.
+        """
+        all_events = [] if merged is None else merged
+        file_timestamps = []
+        last_processed_key = None
+
+        for obj_key, file_events in fetched:
+            # 처리 실패한 파일은 타임스탬프에도 반영하지 않음
+            if file_events is None:
                 continue
 
-        print(f"1단계 완료: {len(all_events)}개 이벤트 수집됨")
+            if file_events:
+                all_events.extend(file_events)
 
-        if not all_events:
-            return [], None
+            # 목록 순서상 마지막으로 처리한 키 (다음 사이클 StartAfter)
+            last_processed_key = obj_key
 
-        # ===== 2단계: 시간 기반 스마트 필터링 =====
-        # 마지막 처리 시간보다 충분히 나중 파일은 중복 가능성 낮음
-        boundary_margin = timedelta(hours=1)  # 경계 여유 시간
+            # 파일 타임스탬프 추출
+            filename = obj_key.split('/')[-1]
+            file_time = self._extract_datetime_from_filename(filename)
+            if file_time:
+                file_timestamps.append(file_time)
 
-        if last_timestamp:
-            boundary_time = last_timestamp + boundary_margin
+        # 마지막 처리 타임스탬프
+        last_file_timestamp = max(file_timestamps) if file_timestamps else None
+        return all_events, last_file_timestamp, last_processed_key
 
-            # 확실히 새로운 이벤트와 경계 이벤트 분리
-            definite_new_events = [
-                e for e in all_events
-                if self._extract_datetime_from_filename(e.event_id) and
-                   self._parse_event_time(e.event_time) > boundary_time
-            ]
-            boundary_events = [
-                e for e in all_events
-                if e not in definite_new_events
-            ]
+    def _filter_new_events(
+        self,
+        events: List[CloudTrailEvent],
+        last_timestamp: Optional[datetime],
+        duplicate_checker=None
+    ) -> List[CloudTrailEvent]:
+        """마지막 처리 시간 기준으로 분류한 뒤 경계 이벤트만 한 번의 조회로 중복 체크
 
+        조회 실패 시 DuplicateCheckError가 그대로 전파됩니다.
+        """
+        # ===== 2단계: 시간 기반 스마트 필터링 =====
+        # 마지막 처리 시간보다 충분히 나중 이벤트는 중복 가능성 낮음
+        definite_new_events, boundary_events = classify_boundary_events(events, last_timestamp)
+
+        if last_timestamp:
             print(f"2단계: 확실히 새로운 이벤트 {len(definite_new_events)}개, 경계 이벤트 {len(boundary_events)}개")
-        else:
-            # 첫 실행이거나 타임스탬프 없으면 전체를 경계로 간주
-            definite_new_events = []
-            boundary_events = all_events
 
         # ===== 3단계: 한 번의 쿼리로 중복 체크 =====
         final_events = []
@@ -406,8 +725,12 @@ class S3CloudTrailCollector:
         if boundary_events and duplicate_checker:
             event_ids = [event.event_id for event in boundary_events]
 
-            print(f"3-2단계: {len(event_ids)}개 이벤트 ID 중복 체크 (1회 쿼리)...")
-            existing_ids = duplicate_checker.check_existing_events(event_ids)
+            print(f"3-2단계: {len(event_ids)}개 이벤트 ID 중복 체크...")
+            # 조회 실패 시 예외가 전파되어 이 버킷은 체크포인트 갱신 없이 다음 사이클에 재시도됨
+            existing_ids = duplicate_checker.check_existing_events(
+                event_ids,
+                time_range=event_time_range(event.event_datetime for event in boundary_events)
+            )
 
             # 중복되지 않은 이벤트만 필터링
             new_events = [
@@ -421,19 +744,43 @@ class S3CloudTrailCollector:
             # duplicate_checker 없으면 전부 추가
             final_events.extend(boundary_events)
 
-        # 마지막 처리 타임스탬프
-        last_file_timestamp = max(file_timestamps) if file_timestamps else None
+        return final_events
 
-        print(f"최종: {len(final_events)}개 신규 이벤트 반환")
-        return final_events, last_file_timestamp
+    def _filter_new_rows(
+        self,
+        rows: RowBatch,
+        last_timestamp: Optional[datetime],
+        duplicate_checker=None
+    ) -> RowBatch:
+        """_filter_new_events의 RowBatch 버전 (파싱 프로세스 모드)"""
+        boundary_indices = list(range(len(rows)))
+        if last_timestamp:
+            boundary_time = last_timestamp + BOUNDARY_MARGIN
+            boundary_indices = [
+                idx for idx, event_time in enumerate(rows.event_times)
+                if event_time is None or event_time <= boundary_time
+            ]
+            print(f"2단계: 확실히 새로운 이벤트 {len(rows) - len(boundary_indices)}개, 경계 이벤트 {len(boundary_indices)}개")
+
+        if not boundary_indices or not duplicate_checker:
+            return rows
+
+        print(f"3-2단계: {len(boundary_indices)}개 이벤트 ID 중복 체크...")
+        # 조회 실패 시 예외가 전파되어 이 버킷은 체크포인트 갱신 없이 다음 사이클에 재시도됨
+        existing_ids = duplicate_checker.check_existing_events(
+            [rows.event_ids[idx] for idx in boundary_indices],
+            time_range=event_time_range(rows.event_times[idx] for idx in boundary_indices)
+        )
+        if not existing_ids:
+            return rows
+
+        duplicate_indices = {idx for idx in boundary_indices if rows.event_ids[idx] in existing_ids}
+        print(f"3-2단계 완료: {len(boundary_indices) - len(duplicate_indices)}/{len(boundary_indices)}개 신규 이벤트")
+        return rows.select(idx for idx in range(len(rows)) if idx not in duplicate_indices)
 
     def _parse_event_time(self, event_time_str: str) -> datetime:
         """이벤트 시간 문자열을 datetime으로 파싱"""
-        try:
-            # CloudTrail 이벤트 시간 형식: 2025-08-12T06:30:00Z
-            return datetime.strptime(event_time_str.replace('Z', '+00:00'), '%Y-%m-%dT%H:%M:%S%z').replace(tzinfo=None)
-        except:
-            return datetime.min
+        return parse_event_time(event_time_str) or datetime.min
 
     def collect_from_multiple_buckets(
         self,
@@ -0,0 +1,82 @@
+"""
+수집 사이클 간격 조절
+
+고정 간격(COLLECTION_INTERVAL) 대기 대신 직전 사이클 결과에 따라 다음 사이클까지의 대기 시간을 정합니다.
+- 적체: max_files에 걸려 남은 파일이 있고 체크포인트가 전진했으면 대기 없이 바로 다음 사이클 실행
+- 새 파일 있음: 최소 간격(SCHEDULER_MIN_INTERVAL)으로 수집
+- 새 파일 없음: 간격을 SCHEDULER_BACKOFF_FACTOR배씩 늘려 지연 목표(SCHEDULER_LATENCY_TARGET)까지
+- 실패: 같은 방식으로 늘려 RDS/S3 장애 중 재시도 폭주 방지
+
+대기는 threading.Event로 하므로 stop()(SIGTERM) 즉시 깨어납니다.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveScheduler:
+    """직전 사이클 결과로 다음 수집까지의 대기 시간을 정하는 스케줄러"""
+
+    def __init__(
+        self,
+        min_interval: Optional[float] = None,
+        latency_target: Optional[float] = None,
+        backoff_factor: Optional[float] = None,
+        adaptive: Optional[bool] = None
+    ):
+        """
+        Args:
+            min_interval: 새 파일이 있을 때의 간격 (기본값: SCHEDULER_MIN_INTERVAL)
+            latency_target: 최대 간격 = 새 로그가 수집되기까지 허용하는 최대 지연 (기본값: SCHEDULER_LATENCY_TARGET, 없으면 COLLECTION_INTERVAL)
+            backoff_factor: 새 파일이 없을 때 간격 증가 배수 (기본값: SCHEDULER_BACKOFF_FACTOR)
+            adaptive: False면 항상 COLLECTION_INTERVAL 대기 (기본값: SCHEDULER_ADAPTIVE)
+        """
+        self.adaptive = settings.scheduler_adaptive if adaptive is None else adaptive
+        self.latency_target = float(latency_target or settings.scheduler_latency_target or settings.collection_interval)
+        self.min_interval = min(float(min_interval or settings.scheduler_min_interval), self.latency_target)
+        self.backoff_factor = max(1.0, backoff_factor or settings.scheduler_backoff_factor)
+
+        self.interval = self.min_interval
+        self._stop_event = threading.Event()
+
+    def next_delay(self, success: bool, new_files: int, backlog: bool) -> float:
+        """직전 사이클 결과로 다음 사이클까지 대기할 시간(초) 계산
+
+        backlog는 남은 파일이 있고 이번 사이클에 체크포인트가 전진했을 때만 True로 전달합니다.
+        """
+        if not self.adaptive:
+            return float(settings.collection_interval)
+
+        if not success:
+            # 실패가 이어지면 간격을 늘림 (적체가 있어도 바로 재시도하지 않음)
+            self.interval = min(self.interval * self.backoff_factor, self.latency_target)
+            return self.interval
+
+        if backlog:
+            self.interval = self.min_interval
+            return 0.0
+
+        if new_files:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff_factor, self.latency_target)
+        return self.interval
+
+    def wait(self, seconds: float) -> bool:
+        """seconds초 대기 (stop() 호출 시 즉시 반환), 중단되었으면 False"""
+        if seconds <= 0:
+            return not self._stop_event.is_set()
+        return not self._stop_event.wait(seconds)
+
+    def stop(self) -> None:
+        """대기 중인 wait()를 깨우고 이후 대기를 모두 건너뜀"""
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
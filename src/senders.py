@@ -0,0 +1,293 @@
+"""
+전송자 인터페이스와 동시 전송
+
+모든 전송자(RDS, Parquet 등)는 Sender를 구현하고, SenderFanout이 배치를 전송자별 스레드에서 동시에 전송합니다.
+- 전송자별 제한 시간(SENDER_TIMEOUT 또는 전송자의 timeout): 느린 전송자를 기다리느라 다른 전송자/사이클이 늘어나지 않음
+- 전송자별 재시도(SENDER_RETRIES): 실패한 전송자만 재시도
+- 전송자별 스풀: 재시도 후에도 실패하면 해당 전송자의 스풀에 기록하고 이후 재전송
+- 여러 스레드에서 동시에 보낸 배치는 전송자 스레드에서 차례로 처리하며, 차례를 기다리다 제한 시간을 넘기면 바로 스풀에 기록
+- 제한 시간을 넘긴 전송은 백그라운드에서 계속 진행하며(실패 시 스풀), 끝날 때까지 같은 전송자의 새 배치는 바로 스풀에 기록
+- 저장에 성공하면 쌓인 스풀을 전송자 스레드에서 이어서 재전송 (전송 제한 시간에 포함되지 않음)
+- 모든 전송자가 저장 또는 스풀해야 배치 성공 (하나라도 확인하지 못하면 체크포인트를 전진시키지 않음)
+- 전송자별 성공/실패/제한 시간 초과/스풀 건수(배치마다 하나)와 지연 시간을 지표로 기록,
+  제한 시간을 넘긴 배치가 나중에 끝난 결과는 late_* 로 따로 기록
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import settings
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Sender(ABC):
+    """수집한 배치를 저장하는 전송자"""
+
+    # 지표/로그에 표시할 이름 (전송자마다 고유)
+    name = 'sender'
+    # 전송 제한 시간 (초, None이면 SENDER_TIMEOUT)
+    timeout: Optional[float] = None
+    # 저장 시 중복 eventID를 직접 건너뛰는지 (True면 파이프라인의 중복 체크 생략)
+    handles_duplicates = False
+    # 파싱 프로세스가 인코딩한 RowBatch를 send_rows로 저장할 수 있는지
+    supports_rows = False
+
+    @abstractmethod
+    def send_logs(self, log_data) -> bool:
+        """CloudTrailLogData 저장, 성공 여부 반환 (실패 시 스풀하지 않고 False - 재시도/스풀은 SenderFanout이 처리)"""
+
+    def send_rows(self, rows) -> bool:
+        """파싱 프로세스가 인코딩한 RowBatch 저장, 성공 여부 반환 (supports_rows = True인 전송자가 구현)"""
+        return False
+
+    def spool_batch(self, batch: Any, reason: str) -> bool:
+        """저장하지 못한 배치(이벤트 목록 또는 RowBatch)를 스풀에 기록, 스풀이 없으면 False"""
+        return False
+
+    def replay_spool(self) -> int:
+        """스풀에 쌓인 배치 재전송, 재전송한 배치 수 반환"""
+        return 0
+
+    @property
+    def has_spool(self) -> bool:
+        return getattr(self, 'spool', None) is not None
+
+
+class SenderFanout:
+    """배치를 여러 전송자에게 동시에 전송하고 전송자별 결과를 집계"""
+
+    def __init__(
+        self,
+        senders: List[Sender],
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None
+    ):
+        """
+        Args:
+            senders: 전송자 목록
+            timeout: 전송자별 제한 시간 기본값 (초, 기본값: SENDER_TIMEOUT)
+            retries: 실패 시 재시도 횟수 (기본값: SENDER_RETRIES)
+            retry_backoff: 첫 재시도 대기 시간, 재시도마다 2배 (초, 기본값: SENDER_RETRY_BACKOFF)
+        """
+        self.senders = senders
+        self.timeout = float(timeout or settings.sender_timeout)
+        self.retries = max(0, settings.sender_retries if retries is None else retries)
+        self.retry_backoff = settings.sender_retry_backoff if retry_backoff is None else retry_backoff
+
+        # 전송자별 단일 스레드 - 멈춘 전송자가 다른 전송자의 스레드를 점유하지 않고,
+        # 여러 스레드(백필 구간 등)에서 동시에 보낸 배치는 전송자 스레드에서 차례로 처리
+        self._executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"sender-{sender.name}")
+            for sender in senders
+        ]
+        # 제한 시간을 넘겨 백그라운드에서 계속 진행 중인 전송 (끝날 때까지 같은 전송자의 새 배치는 바로 스풀)
+        self._stalled: List[Optional[Future]] = [None] * len(senders)
+        # 대기 중이거나 진행 중인 스풀 재전송 (같은 전송자에 중복 제출하지 않음)
+        self._replaying: List[Optional[Future]] = [None] * len(senders)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {
+            sender.name: {
+                'success': 0, 'failure': 0, 'timeout': 0, 'spooled': 0,
+                'late_success': 0, 'late_failure': 0, 'late_spooled': 0, 'last_seconds': None
+            }
+            for sender in senders
+        }
+
+    def send_logs(self, log_data) -> bool:
+        """모든 전송자에게 CloudTrailLogData 전송 (모든 전송자가 저장 또는 스풀해야 True)"""
+        return self._fan_out(
+            lambda sender: sender.send_logs(log_data),
+            spool_batch=log_data.records,
+            size=len(log_data.records),
+            senders=list(range(len(self.senders)))
+        )
+
+    def send_rows(self, rows) -> bool:
+        """send_rows를 지원하는 전송자에게 RowBatch 전송 (대상 전송자가 모두 저장 또는 스풀해야 True)"""
+        targets = []
+        for idx, sender in enumerate(self.senders):
+            if sender.supports_rows:
+                targets.append(idx)
+            else:
+                logger.warning(f"전송자 {sender.name}는 인코딩된 행 전송을 지원하지 않아 건너뜀 (PARSE_PROCESSES=0 필요)")
+        return self._fan_out(lambda sender: sender.send_rows(rows), spool_batch=rows, size=len(rows), senders=targets)
+
+    def spool_unchecked(self, batch) -> bool:
+        """중복 체크를 못 한 배치를 모든 전송자의 스풀에 기록 (스풀이 없는 전송자가 있으면 False)"""
+        if not all(sender.has_spool for sender in self.senders):
+            return False
+        return all(sender.spool_batch(batch, "중복 체크 불가(DB 장애)") for sender in self.senders)
+
+    def replay_spools(self) -> None:
+        """전송자별 스풀 재전송 후 제한 시간까지 대기 (제한 시간을 넘겨 진행 중인 전송자는 건너뜀)"""
+        futures = []
+        for idx, sender in enumerate(self.senders):
+            if not sender.has_spool or self._is_stalled(idx):
+                continue
+            futures.append((sender, self._schedule_replay(idx)))
+
+        for sender, future in futures:
+            try:
+                future.result(timeout=self._timeout_for(sender))
+            except FutureTimeoutError:
+                logger.warning(f"전송자 {sender.name} 스풀 재전송이 제한 시간을 넘어 백그라운드에서 계속 진행")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """전송자별 누적 결과 {이름: {success, failure, timeout, spooled, late_*, last_seconds}}
+
+        배치마다 결과는 하나만 집계합니다. 제한 시간을 넘긴 배치는 timeout으로 집계하고,
+        백그라운드에서 끝난 결과는 late_success / late_spooled / late_failure로 따로 집계합니다.
+        """
+        with self._lock:
+            return {name: dict(values) for name, values in self._stats.items()}
+
+    def shutdown(self) -> None:
+        """진행 중인 전송/재전송이 끝날 때까지 기다린 뒤 전송자 스레드 종료 (대기 중인 재전송은 취소)"""
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _fan_out(self, send: Callable[[Sender], bool], spool_batch: Any, size: int, senders: List[int]) -> bool:
+        if not senders:
+            return False
+
+        started = time.monotonic()
+        futures = {}
+        results: Dict[int, str] = {}
+        latencies: Dict[int, float] = {}
+        for idx in senders:
+            sender = self.senders[idx]
+            # 멈춤 확인과 제출을 함께 잠가 동시에 들어온 호출이 서로의 상태를 덮어쓰지 않게 함
+            with self._lock:
+                stalled = self._running(self._stalled[idx])
+                if not stalled:
+                    futures[idx] = self._executors[idx].submit(self._deliver, sender, send, spool_batch)
+            if stalled:
+                # 제한 시간을 넘긴 전송이 아직 끝나지 않은 전송자는 기다리지 않고 스풀에 기록
+                results[idx] = self._spool(sender, spool_batch, f"전송자 {sender.name} 이전 전송이 제한 시간을 넘겨 진행 중")
+                self._record(sender, results[idx])
+
+        for idx, future in futures.items():
+            sender = self.senders[idx]
+            remaining = started + self._timeout_for(sender) - time.monotonic()
+            try:
+                results[idx], latencies[idx] = future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                if future.cancel():
+                    # 같은 전송자의 앞선 배치를 기다리다 시작하지 못함 - 전송자 스레드에 쌓아 두지 않고 바로 스풀
+                    results[idx] = self._spool(sender, spool_batch, f"전송자 {sender.name} 전송 대기 중 제한 시간 초과")
+                else:
+                    results[idx] = 'timeout'
+                    with self._lock:
+                        self._stalled[idx] = future
+                    future.add_done_callback(lambda done, idx=idx: self._record_late(idx, done))
+                    logger.error(
+                        f"전송자 {sender.name} 제한 시간({self._timeout_for(sender):.0f}초) 초과, "
+                        f"백그라운드에서 계속 진행 (실패 시 스풀)"
+                    )
+            except Exception as e:
+                results[idx] = 'failure'
+                logger.error(f"전송자 {sender.name} 전송 오류: {e}")
+            self._record(sender, results[idx])
+            if results[idx] == 'success' and sender.has_spool:
+                # 저장이 다시 되면 쌓인 스풀을 전송자 스레드에서 이어서 재전송 (이번 배치 결과/제한 시간과 무관)
+                self._schedule_replay(idx)
+
+        logger.info(
+            f"전송 완료 ({size}개 이벤트): "
+            + ", ".join(
+                f"{self.senders[idx].name} {results[idx]}"
+                + (f" {latencies[idx]:.2f}초" if idx in latencies else "")
+                for idx in senders
+            )
+        )
+        # 한 전송자라도 저장/스풀을 확인하지 못하면(실패, 제한 시간 초과) 체크포인트를 전진시키지 않음
+        return all(result in ('success', 'spooled') for result in results.values())
+
+    def _deliver(self, sender: Sender, send: Callable[[Sender], bool], spool_batch: Any) -> Tuple[str, float]:
+        """전송자 스레드에서 전송 + 재시도, 모두 실패하면 스풀 (결과: success, spooled, failure와 소요 시간)"""
+        started = time.monotonic()
+        delay = self.retry_backoff
+        result = 'failure'
+        for attempt in range(self.retries + 1):
+            try:
+                if send(sender):
+                    result = 'success'
+                    break
+                logger.error(f"전송자 {sender.name} 전송 실패 (시도 {attempt + 1}/{self.retries + 1})")
+            except Exception as e:
+                logger.error(f"전송자 {sender.name} 오류 (시도 {attempt + 1}/{self.retries + 1}): {e}")
+            if attempt < self.retries:
+                time.sleep(delay)
+                delay *= 2
+
+        if result == 'failure':
+            result = self._spool(sender, spool_batch, f"전송자 {sender.name} 저장 실패")
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._stats[sender.name]['last_seconds'] = elapsed
+        metrics.observe('logsmith_sender_seconds', elapsed, sender=sender.name)
+        return result, elapsed
+
+    @staticmethod
+    def _spool(sender: Sender, batch: Any, reason: str) -> str:
+        """배치를 전송자 스풀에 기록 (결과: spooled 또는 failure)"""
+        try:
+            return 'spooled' if sender.spool_batch(batch, reason) else 'failure'
+        except Exception as e:
+            logger.error(f"전송자 {sender.name} 스풀 기록 오류: {e}")
+            return 'failure'
+
+    def _schedule_replay(self, idx: int) -> Future:
+        """전송자 스레드에 스풀 재전송 제출 (이미 대기/진행 중이면 그 작업 반환)"""
+        sender = self.senders[idx]
+        with self._lock:
+            if not self._running(self._replaying[idx]):
+                self._replaying[idx] = self._executors[idx].submit(self._replay, sender)
+            return self._replaying[idx]
+
+    @staticmethod
+    def _replay(sender: Sender) -> int:
+        try:
+            return sender.replay_spool()
+        except Exception as e:
+            logger.error(f"전송자 {sender.name} 스풀 재전송 오류: {e}")
+            return 0
+
+    def _record(self, sender: Sender, result: str) -> None:
+        with self._lock:
+            self._stats[sender.name][result] += 1
+        metrics.inc('logsmith_sender_batches_total', sender=sender.name, result=result)
+
+    def _record_late(self, idx: int, future: Future) -> None:
+        """제한 시간을 넘긴 배치가 백그라운드에서 끝난 결과 집계 (배치 결과는 이미 timeout으로 집계됨)"""
+        sender = self.senders[idx]
+        try:
+            result = future.result()[0]
+        except Exception:
+            result = 'failure'
+        with self._lock:
+            self._stats[sender.name][f"late_{result}"] += 1
+            if self._stalled[idx] is future:
+                self._stalled[idx] = None
+        metrics.inc('logsmith_sender_late_results_total', sender=sender.name, result=result)
+        logger.info(f"전송자 {sender.name} 제한 시간을 넘긴 전송 종료: {result}")
+
+    def _is_stalled(self, idx: int) -> bool:
+        with self._lock:
+            return self._running(self._stalled[idx])
+
+    @staticmethod
+    def _running(future: Optional[Future]) -> bool:
+        return future is not None and not future.done()
+
+    def _timeout_for(self, sender: Sender) -> float:
+        return float(sender.timeout or self.timeout)
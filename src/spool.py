@@ -0,0 +1,204 @@
+"""
+RDS 저장 실패 배치 로컬 스풀
+
+RDS 장애(페일오버, 자격증명 교체, 점검) 중 저장에 실패한 배치를 로컬 디스크에 기록해 두고
+DB가 정상화되면 다시 저장합니다. 같은 S3 객체를 다시 다운로드/파싱하지 않아도 됩니다.
+
+파일 형식: spool-<순번>.bin 세그먼트에 프레임을 이어 씀 (append-only)
+    프레임 = 헤더(매직 4바이트, 본문 길이 4바이트, CRC32 4바이트) + zlib 압축된 JSON 본문
+    본문 = {"ids": [...], "times": [...], "events": COPY 입력, "cloudtrail": COPY 입력}
+기록 중 종료되어 끝이 잘린 프레임은 읽을 때 CRC로 걸러집니다 (해당 배치는 스풀 성공으로 처리되지 않았으므로 손실 없음).
+"""
+
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+FRAME_MAGIC = b'LSP1'
+FRAME_HEADER = struct.Struct('>4sII')  # 매직, 본문 길이, CRC32
+
+# 세그먼트 파일 하나의 최대 크기 (넘으면 새 세그먼트)
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+SEGMENT_PATTERN = re.compile(r'^spool-(\d{8})\.bin$')
+REJECTED_FILE = 'rejected.bin'
+
+
+def encode_frame(record: Dict[str, Any]) -> bytes:
+    """레코드를 프레임 바이트로 인코딩"""
+    payload = zlib.compress(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return FRAME_HEADER.pack(FRAME_MAGIC, len(payload), zlib.crc32(payload)) + payload
+
+
+def iter_frames(path: str, offset: int = 0) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """세그먼트 파일의 (프레임 시작 위치, 다음 프레임 위치, 레코드)를 순서대로 반환 (손상된 프레임에서 중단)"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            start = f.tell()
+            header = f.read(FRAME_HEADER.size)
+            if not header:
+                return
+            if len(header) < FRAME_HEADER.size:
+                logger.warning(f"스풀 프레임 헤더 잘림: {path}@{start}")
+                return
+
+            magic, length, crc = FRAME_HEADER.unpack(header)
+            payload = f.read(length)
+            if magic != FRAME_MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+                logger.warning(f"손상된 스풀 프레임 이후 건너뜀: {path}@{start}")
+                return
+
+            yield start, f.tell(), json.loads(zlib.decompress(payload).decode('utf-8'))
+
+
+class DiskSpool:
+    """크기 상한이 있는 append-only 배치 스풀"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        # 이 프로세스에서 이어 쓰는 세그먼트 (재시작 시 이전 세그먼트에 이어 쓰지 않음)
+        self._active_path: Optional[str] = None
+        self._active_file = None
+        # 세그먼트별 재전송 완료 위치 (재시작 시에는 처음부터 - 재전송 시 중복 체크로 건너뜀)
+        self._replay_offsets: Dict[str, int] = {}
+        self._next_sequence = max(self._sequences(), default=0) + 1
+        self._update_gauge()
+
+        pending = self.pending_bytes()
+        if pending:
+            logger.info(f"스풀에 재전송 대기 중인 배치 있음: {directory} ({pending / 1024 / 1024:.1f} MiB)")
+
+    def append(self, record: Dict[str, Any]) -> bool:
+        """레코드를 디스크에 기록 (fsync까지 완료되면 True, 상한 초과/오류 시 False)"""
+        frame = encode_frame(record)
+        with self._lock:
+            if self.pending_bytes() + len(frame) > self.max_bytes:
+                logger.error(f"스풀 용량 상한({self.max_bytes / 1024 / 1024:.0f} MiB) 초과, 배치를 스풀하지 않음")
+                return False
+
+            try:
+                if self._active_file is None or self._active_file.tell() + len(frame) > SEGMENT_BYTES:
+                    self._rotate()
+                position = self._active_file.tell()
+                try:
+                    self._active_file.write(frame)
+                    self._active_file.flush()
+                    os.fsync(self._active_file.fileno())
+                except Exception:
+                    # 일부만 기록된 프레임 제거
+                    self._active_file.truncate(position)
+                    self._active_file.seek(position)
+                    raise
+            except Exception as e:
+                logger.error(f"스풀 기록 실패: {e}")
+                return False
+
+        metrics.inc('logsmith_spool_batches_total', action='spooled')
+        self._update_gauge()
+        return True
+
+    def replay(self, handler: Callable[[Dict[str, Any]], bool]) -> int:
+        """오래된 순서로 레코드를 handler에 전달 (handler가 False를 반환하면 중단), 처리한 레코드 수 반환
+
+        다른 스레드에서 재전송 중이면 바로 0을 반환합니다.
+        """
+        if not self._replay_lock.acquire(blocking=False):
+            return 0
+
+        replayed = 0
+        try:
+            with self._lock:
+                # 이어 쓰던 세그먼트도 재전송 대상이 되도록 닫음 (이후 기록은 새 세그먼트로)
+                self._close_active()
+                segments = [self._segment_path(sequence) for sequence in sorted(self._sequences())]
+
+            for path in segments:
+                offset = self._replay_offsets.get(path, 0)
+                for _, next_offset, record in iter_frames(path, offset):
+                    if not handler(record):
+                        return replayed
+                    self._replay_offsets[path] = next_offset
+                    replayed += 1
+                    metrics.inc('logsmith_spool_batches_total', action='replayed')
+
+                # 세그먼트 전체 재전송 완료 (손상된 꼬리는 버림)
+                os.remove(path)
+                self._replay_offsets.pop(path, None)
+                self._update_gauge()
+            return replayed
+        finally:
+            self._update_gauge()
+            self._replay_lock.release()
+
+    def reject(self, record: Dict[str, Any]) -> None:
+        """재전송해도 저장되지 않는 레코드를 rejected.bin으로 옮김 (수동 확인용)"""
+        with open(os.path.join(self.directory, REJECTED_FILE), 'ab') as f:
+            f.write(encode_frame(record))
+            f.flush()
+            os.fsync(f.fileno())
+        metrics.inc('logsmith_spool_batches_total', action='rejected')
+
+    def pending_bytes(self) -> int:
+        """재전송 대기 중인 세그먼트 크기 합계"""
+        total = 0
+        for sequence in self._sequences():
+            path = self._segment_path(sequence)
+            try:
+                total += os.path.getsize(path) - self._replay_offsets.get(path, 0)
+            except OSError:
+                continue
+        return total
+
+    def has_pending(self) -> bool:
+        return self.pending_bytes() > 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_active()
+
+    def _sequences(self) -> List[int]:
+        sequences = []
+        for name in os.listdir(self.directory):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                sequences.append(int(match.group(1)))
+        return sequences
+
+    def _segment_path(self, sequence: int) -> str:
+        return os.path.join(self.directory, f"spool-{sequence:08d}.bin")
+
+    def _rotate(self) -> None:
+        """새 세그먼트 열기 (lock 보유 상태에서 호출)"""
+        self._close_active()
+        self._active_path = self._segment_path(self._next_sequence)
+        self._next_sequence += 1
+        self._active_file = open(self._active_path, 'ab')
+
+    def _close_active(self) -> None:
+        """이어 쓰던 세그먼트 닫기, 비어 있으면 삭제 (lock 보유 상태에서 호출)"""
+        if self._active_file is None:
+            return
+        empty = self._active_file.tell() == 0
+        self._active_file.close()
+        if empty:
+            os.remove(self._active_path)
+        self._active_file = None
+        self._active_path = None
+
+    def _update_gauge(self) -> None:
+        metrics.set('logsmith_spool_bytes', self.pending_bytes())
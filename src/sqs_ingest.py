@@ -0,0 +1,235 @@
+"""
+S3 이벤트 알림(SQS) 기반 수집
+
+주기적으로 S3 목록을 조회하는 대신 새 로그 파일 알림을 SQS에서 받아 바로 처리합니다.
+지원하는 메시지 형식:
+- S3 이벤트 알림 (ObjectCreated:*), SNS로 전달된 경우 포함
+- CloudTrail 로그 전달 SNS 알림 ({"s3Bucket": ..., "s3ObjectKey": [...]})
+- EventBridge S3 Object Created 이벤트
+
+메시지는 파일 처리 + 저장에 성공한 뒤에만 삭제하므로, 실패한 메시지는 가시성 제한 시간이 지나면 다시 수신됩니다.
+같은 파일이 다시 전달되어도 저장 전 중복 체크(또는 idempotent 저장)로 중복 저장되지 않습니다.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote_plus
+
+import boto3
+
+from .cloud_trail import CloudTrailLogData
+from .config import settings
+from .direct_rds import RowBatch
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 수신 오류 시 재시도 대기 (초)
+ERROR_BACKOFF_SECONDS = 5
+
+
+def parse_notification(body: str) -> Optional[List[Tuple[str, str]]]:
+    """SQS 메시지 본문에서 (버킷, 키) 목록 추출
+
+    Returns:
+        list: 알림에 포함된 S3 객체 (생성 이벤트가 아니면 빈 목록), 형식을 알 수 없으면 None
+    """
+    try:
+        message = json.loads(body)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(message, dict):
+        return None
+
+    # SNS → SQS 구독이면 실제 알림은 Message 문자열 안에 있음
+    if message.get('Type') == 'Notification' and isinstance(message.get('Message'), str):
+        return parse_notification(message['Message'])
+
+    # S3 연결 테스트 메시지
+    if message.get('Event') == 's3:TestEvent':
+        return []
+
+    # CloudTrail 로그 전달 SNS 알림
+    if 's3Bucket' in message and 's3ObjectKey' in message:
+        return [(message['s3Bucket'], key) for key in message['s3ObjectKey']]
+
+    # EventBridge S3 이벤트 (키는 URL 인코딩되지 않음)
+    if message.get('source') == 'aws.s3' and isinstance(message.get('detail'), dict):
+        if message.get('detail-type') != 'Object Created':
+            return []
+        detail = message['detail']
+        return [(detail['bucket']['name'], detail['object']['key'])]
+
+    # S3 이벤트 알림 (키는 URL 인코딩됨, 공백은 '+')
+    if isinstance(message.get('Records'), list):
+        objects = []
+        for record in message['Records']:
+            if record.get('eventSource') != 'aws:s3' or not record.get('eventName', '').startswith('ObjectCreated:'):
+                continue
+            objects.append((record['s3']['bucket']['name'], unquote_plus(record['s3']['object']['key'])))
+        return objects
+
+    return None
+
+
+class SqsIngestor:
+    """SQS 알림을 받아 S3 로그 파일을 처리하는 수집기"""
+
+    def __init__(self, service, queue_url: Optional[str] = None):
+        """
+        Args:
+            service: EC2CloudTrailService (S3 수집기, 전송자, 파싱 프로세스 풀을 공유)
+            queue_url: SQS 큐 URL (기본값: SQS_QUEUE_URL)
+        """
+        self.service = service
+        self.queue_url = queue_url or settings.sqs_queue_url
+        if not self.queue_url:
+            raise ValueError("SQS_QUEUE_URL이 설정되지 않았습니다")
+
+        self.sqs_client = boto3.client(
+            'sqs',
+            region_name=settings.aws_default_region,
+            endpoint_url=settings.sqs_endpoint_url
+        )
+        # 수집 대상 버킷 설정 {버킷: 설정}
+        self.bucket_configs = {config['bucket_name']: config for config in service.s3_bucket_configs}
+        self.running = False
+
+    def run(self, event_names: Optional[List[str]] = None) -> None:
+        """stop()이 호출될 때까지 롱 폴링으로 메시지 처리"""
+        self.running = True
+        logger.info(f"SQS 수집 시작: {self.queue_url} (대기 {settings.sqs_wait_time_seconds}초)")
+
+        while self.running:
+            try:
+                self.poll_once(event_names)
+            except Exception as e:
+                logger.error(f"SQS 수집 오류: {e}")
+                time.sleep(ERROR_BACKOFF_SECONDS)
+
+        logger.info("SQS 수집 종료")
+
+    def stop(self) -> None:
+        """진행 중인 롱 폴링(최대 SQS_WAIT_TIME_SECONDS)이 끝나면 종료"""
+        self.running = False
+
+    def poll_once(self, event_names: Optional[List[str]] = None) -> int:
+        """메시지를 한 번 수신해 처리하고 삭제한 메시지 수 반환"""
+        params = {
+            'QueueUrl': self.queue_url,
+            'MaxNumberOfMessages': max(1, min(settings.sqs_max_messages, 10)),
+            'WaitTimeSeconds': settings.sqs_wait_time_seconds,
+        }
+        if settings.sqs_visibility_timeout > 0:
+            params['VisibilityTimeout'] = settings.sqs_visibility_timeout
+
+        messages = self.sqs_client.receive_message(**params).get('Messages', [])
+        if not messages:
+            return 0
+
+        # 메시지별 처리 대상 객체 (버킷별로 모아 한 번에 처리)
+        message_objects: Dict[str, Set[Tuple[str, str]]] = {}
+        keys_by_bucket: Dict[str, List[str]] = {}
+        deletable = []
+
+        for message in messages:
+            objects = parse_notification(message.get('Body', ''))
+            if objects is None:
+                # 삭제하지 않음 - 재수신 한도를 넘으면 DLQ로 이동 (redrive 정책)
+                logger.error(f"알 수 없는 SQS 메시지 형식: {message.get('MessageId')}")
+                continue
+
+            targets = {(bucket, key) for bucket, key in objects if self._is_target(bucket, key)}
+            if not targets:
+                # 로그 파일이 아닌 객체(Digest 등) 또는 테스트 메시지
+                deletable.append(message)
+                continue
+
+            message_objects[message['ReceiptHandle']] = targets
+            for bucket, key in targets:
+                bucket_keys = keys_by_bucket.setdefault(bucket, [])
+                if key not in bucket_keys:
+                    bucket_keys.append(key)
+
+        failed = set()
+        for bucket, keys in keys_by_bucket.items():
+            failed.update((bucket, key) for key in self._process_bucket(bucket, keys, event_names))
+
+        # 모든 객체가 저장된 메시지만 삭제
+        for message in messages:
+            targets = message_objects.get(message['ReceiptHandle'])
+            if targets and not (targets & failed):
+                deletable.append(message)
+
+        self._delete_messages(deletable)
+        logger.info(
+            f"SQS 메시지 {len(messages)}개 수신, 파일 {sum(len(keys) for keys in keys_by_bucket.values())}개 "
+            f"(실패 {len(failed)}개), 메시지 {len(deletable)}개 삭제"
+        )
+        return len(deletable)
+
+    def _is_target(self, bucket: str, key: str) -> bool:
+        """설정된 버킷/prefix의 CloudTrail 로그 파일인지 확인"""
+        config = self.bucket_configs.get(bucket)
+        if config is None or not key.endswith('.json.gz') or '/CloudTrail-Digest/' in key:
+            return False
+        prefix = config.get('prefix')
+        return not prefix or key.startswith(prefix)
+
+    def _process_bucket(self, bucket: str, keys: List[str], event_names: Optional[List[str]]) -> List[str]:
+        """버킷 하나의 파일을 다운로드 → 중복 제거 → 저장하고 실패한 키 목록 반환"""
+        s3_collector = self.service.s3_collector
+        parse_pool = self.service.parse_pool
+        fetched = s3_collector._fetch_objects(
+            bucket, keys, event_names, self.bucket_configs[bucket].get('max_workers'), parse_pool=parse_pool
+        )
+        failed = [key for key, result in fetched if result is None]
+        events, _, _ = s3_collector._merge_fetched(fetched, merged=RowBatch() if parse_pool is not None else None)
+
+        try:
+            # 알림은 순서/중복 보장이 없으므로 모든 이벤트를 중복 체크 대상으로 처리
+            duplicate_checker = self.service._duplicate_checker()
+            if isinstance(events, RowBatch):
+                events = s3_collector._filter_new_rows(events, None, duplicate_checker)
+            elif events:
+                events = s3_collector._filter_new_events(events, None, duplicate_checker)
+
+            success = True
+            if isinstance(events, RowBatch):
+                success = self.service._send_rows_to_senders(events) if events else True
+            elif events:
+                success = self.service._send_to_senders(CloudTrailLogData(records=events))
+        except Exception as e:
+            logger.error(f"[{bucket}] SQS 알림 파일 처리 실패: {e}")
+            success = False
+
+        if not success:
+            return list(keys)
+
+        if events:
+            metrics.inc('logsmith_events_written_total', len(events), bucket=bucket)
+            metrics.record_event_time(self._newest_event_time(events), bucket=bucket)
+        return failed
+
+    @staticmethod
+    def _newest_event_time(events: Any):
+        if isinstance(events, RowBatch):
+            times = [value for value in events.event_times if value is not None]
+        else:
+            times = [event.event_datetime for event in events if event.event_datetime is not None]
+        return max(times) if times else None
+
+    def _delete_messages(self, messages: List[Dict[str, Any]]) -> None:
+        if not messages:
+            return
+        response = self.sqs_client.delete_message_batch(
+            QueueUrl=self.queue_url,
+            Entries=[
+                {'Id': str(idx), 'ReceiptHandle': message['ReceiptHandle']}
+                for idx, message in enumerate(messages)
+            ]
+        )
+        for failure in response.get('Failed', []):
+            logger.error(f"SQS 메시지 삭제 실패: {failure.get('Message')} (다시 수신되면 중복 체크로 건너뜀)")
@@ -0,0 +1,17 @@
+"""
+pytest 공통 설정
+
+저장소 루트를 import 경로에 추가하고, src.config가 필수로 요구하는 RDS 설정에 테스트용 값을 지정합니다.
+(DB가 필요한 테스트는 없으며 실제 연결은 만들지 않음)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+for name, value in {
+    'RDS_HOST': 'localhost', 'RDS_PORT': '5432', 'RDS_DATABASE': 'postgres',
+    'RDS_USER': 'postgres', 'RDS_PASSWORD': 'test', 'GROUP_ID': '00000000-0000-0000-0000-000000000000',
+}.items():
+    os.environ.setdefault(name, value)
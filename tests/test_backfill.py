@@ -0,0 +1,141 @@
+"""백필: 구간 분할, 진행 위치 재개, 다운로드/파싱 실패 파일 재시도와 구간 실패 기록 확인"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src import backfill
+from src.backfill import BackfillRunner
+from src.pipeline import PipelineResult, StageStats
+
+KEY = 'bucket/AWSLogs/'
+
+
+class FakeS3:
+    """S3 파일 목록과 다운로드 실패 파일을 흉내 냄 (파일 하나 = 이벤트 하나)"""
+
+    def __init__(self, files, broken=()):
+        self.files = sorted(files)
+        self.broken = set(broken)
+        self.listed_after = []
+
+
+class FakePipeline:
+    """CollectionPipeline 대신 FakeS3의 파일을 처리 (실패 파일도 진행 위치는 지나감)"""
+
+    s3 = None
+
+    def __init__(self, s3_collector, on_commit=None, **kwargs):
+        self.on_commit = on_commit
+
+    def run(self, bucket_configs, event_names=None, start_time=None, end_time=None,
+            last_processed_keys=None, object_keys=None):
+        s3 = FakePipeline.s3
+        if object_keys is not None:
+            objects = list(object_keys[KEY])
+        else:
+            last_key = (last_processed_keys or {}).get(KEY)
+            s3.listed_after.append(last_key)
+            objects = [name for name in s3.files if last_key is None or name > last_key]
+            objects = objects[:bucket_configs[0]['max_files']]
+
+        result = PipelineResult(stats={'fetch': StageStats('다운로드')})
+        result.stats['fetch'].files = len(objects)
+        for name in objects:
+            if name in s3.broken:
+                result.failed_files.setdefault(KEY, []).append(name)
+                continue
+            result.events_written += 1
+            if self.on_commit:
+                self.on_commit(KEY, None, name)
+        return result
+
+
+class FakeService:
+    s3_bucket_configs = [{'bucket_name': 'bucket', 'prefix': 'AWSLogs/', 'enabled': True}]
+    s3_collector = None
+    parse_pool = None
+
+    def _send_to_senders(self, log_data):
+        return True
+
+    def _send_rows_to_senders(self, rows):
+        return True
+
+    def _spool_unchecked(self, batch):
+        return False
+
+    def _duplicate_checker(self):
+        return None
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setattr(backfill, 'CollectionPipeline', FakePipeline)
+    FakePipeline.s3 = FakeS3([f'file-{n}' for n in range(5)])
+    return FakePipeline.s3
+
+
+def make_runner(tmp_path, shard='day'):
+    return BackfillRunner(FakeService(), shard=shard, workers=1, state_file=str(tmp_path / 'backfill.json'), files_per_pass=2)
+
+
+def shard_state(tmp_path, shard_id='2025-09-01'):
+    with open(tmp_path / 'backfill.json', encoding='utf-8') as f:
+        return json.load(f)['shards'][shard_id]
+
+
+def test_plan_splits_on_day_and_hour_boundaries(tmp_path):
+    days = make_runner(tmp_path).plan(datetime(2025, 9, 1, 12), datetime(2025, 9, 3, 6))
+    assert days == [
+        (datetime(2025, 9, 1, 12), datetime(2025, 9, 1, 23, 59, 59)),
+        (datetime(2025, 9, 2), datetime(2025, 9, 2, 23, 59, 59)),
+        (datetime(2025, 9, 3), datetime(2025, 9, 3, 6)),
+    ]
+
+    hours = make_runner(tmp_path, shard='hour').plan(datetime(2025, 9, 1, 10, 30), datetime(2025, 9, 1, 12))
+    assert [shard_start for shard_start, _ in hours] == [
+        datetime(2025, 9, 1, 10, 30), datetime(2025, 9, 1, 11), datetime(2025, 9, 1, 12)
+    ]
+
+
+def test_shard_runs_pass_by_pass_and_is_skipped_when_done(tmp_path, s3):
+    runner = make_runner(tmp_path)
+    assert runner.run(datetime(2025, 9, 1), datetime(2025, 9, 1, 23, 59, 59))
+
+    # 2개씩 조회하며 마지막으로 저장한 파일 다음부터 이어서 조회
+    assert s3.listed_after == [None, 'file-1', 'file-3', 'file-4']
+    state = shard_state(tmp_path)
+    assert (state['status'], state['events'], state['cursor']) == ('done', 5, {KEY: 'file-4'})
+
+    s3.listed_after.clear()
+    assert make_runner(tmp_path).run(datetime(2025, 9, 1), datetime(2025, 9, 1, 23, 59, 59))
+    assert s3.listed_after == []
+
+
+def test_interrupted_shard_resumes_from_cursor(tmp_path, s3):
+    runner = make_runner(tmp_path)
+    runner._update_shard('2025-09-01', status='stopped', event_names=[], cursor={KEY: 'file-2'}, events=3)
+
+    assert runner.run(datetime(2025, 9, 1), datetime(2025, 9, 1, 23, 59, 59))
+    assert s3.listed_after[0] == 'file-2'
+    assert shard_state(tmp_path)['events'] == 5
+
+
+def test_failed_file_behind_cursor_fails_the_shard_until_retried(tmp_path, s3):
+    s3.broken = {'file-2'}
+    assert not make_runner(tmp_path).run(datetime(2025, 9, 1), datetime(2025, 9, 1, 23, 59, 59))
+
+    # 진행 위치는 끝까지 갔지만 실패 파일이 남아 있으므로 완료가 아님
+    state = shard_state(tmp_path)
+    assert (state['status'], state['cursor'], state['failed_files']) == ('failed', {KEY: 'file-4'}, {KEY: ['file-2']})
+    assert state['events'] == 4
+
+    # 파일이 복구되면 다시 실행할 때 실패 파일만 다시 수집하고 완료
+    s3.broken = set()
+    s3.listed_after.clear()
+    assert make_runner(tmp_path).run(datetime(2025, 9, 1), datetime(2025, 9, 1, 23, 59, 59))
+    state = shard_state(tmp_path)
+    assert (state['status'], state['events'], state['failed_files']) == ('done', 5, {})
+    assert s3.listed_after == ['file-4']
@@ -0,0 +1,60 @@
+"""build_rows: cloudtrail 행의 JSON 컬럼이 원본 필드를 잃지 않는지 확인"""
+
+import json
+
+from src.cloud_trail import CloudTrailEvent
+from src.direct_rds import CLOUDTRAIL_COLUMNS, build_rows
+
+USER_IDENTITY = {
+    'type': 'AssumedRole',
+    'principalId': 'AROAEXAMPLE:session',
+    'arn': 'arn:aws:sts::123456789012:assumed-role/Admin/session',
+    'accountId': '123456789012',
+    'accessKeyId': 'ASIAEXAMPLE',
+    'invokedBy': 'cloudformation.amazonaws.com',
+    'sessionContext': {
+        'sessionIssuer': {
+            'type': 'Role',
+            'arn': 'arn:aws:iam::123456789012:role/Admin',
+            'userName': 'Admin',
+        },
+        'attributes': {'creationDate': '2025-09-03T09:00:00Z', 'mfaAuthenticated': 'false'},
+    },
+}
+
+
+def column(row, name):
+    return row[CLOUDTRAIL_COLUMNS.index(name)]
+
+
+def make_event(**overrides):
+    record = {
+        'eventID': 'event-1',
+        'eventTime': '2025-09-03T09:00:00Z',
+        'eventSource': 'sts.amazonaws.com',
+        'eventName': 'AssumeRole',
+        'awsRegion': 'ap-northeast-2',
+        'sourceIPAddress': '203.0.113.10',
+        'userIdentity': USER_IDENTITY,
+        'requestParameters': {'roleSessionName': 'session'},
+        'responseElements': None,
+    }
+    record.update(overrides)
+    return CloudTrailEvent.from_dict(record)
+
+
+def test_user_identity_keeps_every_nested_field():
+    _, cloudtrail_row = build_rows(make_event(), 'group')
+
+    assert json.loads(column(cloudtrail_row, 'user_identity')) == USER_IDENTITY
+
+
+def test_rows_share_uuid_and_keep_event_id():
+    events_row, cloudtrail_row = build_rows(make_event(), 'group')
+
+    assert events_row[0] == cloudtrail_row[0]
+    assert column(cloudtrail_row, 'event_id') == 'event-1'
+    assert json.loads(column(cloudtrail_row, 'request_parameters')) == {'roleSessionName': 'session'}
+    # 비어 있는 resources / insightDetails는 NULL
+    assert column(cloudtrail_row, 'resources') is None
+    assert column(cloudtrail_row, 'insight_details') is None
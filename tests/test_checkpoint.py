@@ -0,0 +1,75 @@
+"""체크포인트 저장소: 원자적 교체(실패 시 이전 파일 유지, 임시 파일 정리)와 로드 확인"""
+
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from src import checkpoint
+from src.checkpoint import CheckpointStore, checkpoint_key, write_json_atomic
+
+KEY = checkpoint_key('trail-bucket', 'AWSLogs/123456789012/CloudTrail/ap-northeast-2/')
+
+
+def leftover_temp_files(directory):
+    return [name for name in os.listdir(directory) if name.startswith('.tmp-')]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'state' / 'checkpoints.json'))
+    checkpoints = {KEY: {'last_timestamp': datetime(2025, 9, 3, 9, 5), 'last_key': 'AWSLogs/.../a.json.gz'}}
+
+    assert store.save(checkpoints)
+    assert store.load() == checkpoints
+    assert leftover_temp_files(tmp_path / 'state') == []
+
+
+def test_missing_or_corrupt_file_loads_empty(tmp_path):
+    path = tmp_path / 'checkpoints.json'
+    assert CheckpointStore(str(path)).load() == {}
+
+    path.write_text('{"version": 1, "checkpoints": {', encoding='utf-8')
+    assert CheckpointStore(str(path)).load() == {}
+
+
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch):
+    path = tmp_path / 'checkpoints.json'
+    store = CheckpointStore(str(path))
+    previous = {KEY: {'last_timestamp': datetime(2025, 9, 3, 9, 0), 'last_key': 'old.json.gz'}}
+    store.save(previous)
+
+    def fail_midway(data, f, **kwargs):
+        f.write('{"version": 1, "checkp')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(checkpoint.json, 'dump', fail_midway)
+    assert not store.save({KEY: {'last_timestamp': datetime(2025, 9, 3, 9, 5), 'last_key': 'new.json.gz'}})
+    monkeypatch.undo()
+
+    assert store.load() == previous
+    assert leftover_temp_files(tmp_path) == []
+
+
+def test_failed_rename_keeps_previous_file(tmp_path, monkeypatch):
+    path = tmp_path / 'state.json'
+    write_json_atomic(str(path), {'n': 1})
+
+    def fail_replace(src, dst):
+        raise OSError('rename failed')
+
+    monkeypatch.setattr(checkpoint.os, 'replace', fail_replace)
+    with pytest.raises(OSError):
+        write_json_atomic(str(path), {'n': 2})
+    monkeypatch.undo()
+
+    assert json.loads(path.read_text(encoding='utf-8')) == {'n': 1}
+    assert leftover_temp_files(tmp_path) == []
+
+
+def test_write_replaces_whole_file(tmp_path):
+    path = tmp_path / 'state.json'
+    write_json_atomic(str(path), {'shards': {str(n): {'status': 'done'} for n in range(100)}})
+    write_json_atomic(str(path), {'shards': {}})
+
+    assert json.loads(path.read_text(encoding='utf-8')) == {'shards': {}}
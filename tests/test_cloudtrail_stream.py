@@ -0,0 +1,63 @@
+"""CloudTrail 스트리밍 파서: 청크 경계와 관계없이 json.loads와 같은 결과를 내는지 확인"""
+
+import gzip
+import io
+import json
+
+import pytest
+
+from src.cloudtrail_stream import iter_cloudtrail_records
+
+# 숫자/리터럴/문자열 이스케이프/멀티바이트 문자가 청크 경계에서 잘리는 경우를 모두 포함
+DOCUMENT = {
+    'Records': [
+        {
+            'eventVersion': '1.08',
+            'eventID': f'event-{i}',
+            'eventTime': '2025-09-03T09:05:00Z',
+            'userIdentity': {'type': 'IAMUser', 'sessionContext': {'attributes': {'mfaAuthenticated': 'false'}}},
+            'requestParameters': {'key': 'k\t"x"\\\n', 'name': '한글 이름', 'count': 12345678901234567890},
+            'responseElements': None,
+            'readOnly': True,
+            'managementEvent': False,
+            'latency': 0.5,
+            'size': -2.5e10,
+            'ratio': 1E-3,
+            'zero': 0,
+            'negativeZero': -0.0,
+            'values': [1, 2.25, -7, [], {}],
+        }
+        for i in range(3)
+    ],
+    'digestVersion': 10.25,
+}
+
+CHUNK_SIZES = [1, 2, 3, 5, 7, 13, 64, 64 * 1024]
+
+
+def gzipped(document, **dumps_options) -> bytes:
+    return gzip.compress(json.dumps(document, **dumps_options).encode('utf-8'))
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('dumps_options', [{}, {'ensure_ascii': False, 'indent': 1}])
+def test_records_match_json_loads(chunk_size, dumps_options):
+    data = gzipped(DOCUMENT, **dumps_options)
+    expected = json.loads(gzip.decompress(data))['Records']
+
+    assert list(iter_cloudtrail_records(io.BytesIO(data), chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 64 * 1024])
+def test_empty_records(chunk_size):
+    assert list(iter_cloudtrail_records(io.BytesIO(gzipped({'Records': []})), chunk_size=chunk_size)) == []
+
+
+@pytest.mark.parametrize('text', [
+    b'{"Records": [{"a": 1}',
+    b'{"Records": [{"a": 1}] "x": 1}',
+    b'{"Records": [{"a": 1}]} trailing',
+])
+def test_malformed_document_raises(text):
+    with pytest.raises(ValueError):
+        list(iter_cloudtrail_records(io.BytesIO(gzip.compress(text)), chunk_size=2))
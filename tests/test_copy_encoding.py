@@ -0,0 +1,64 @@
+"""COPY text 인코딩: 탭/개행/역슬래시/NULL이 섞인 값이 한 줄로 인코딩되고 그대로 복원되는지 확인"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from src.cloud_trail import CloudTrailEvent
+from src.direct_rds import CLOUDTRAIL_COLUMNS, RowBatch, build_rows, copy_line, copy_value, parse_copy_line
+
+
+@pytest.mark.parametrize('value, encoded', [
+    (None, '\\N'),
+    (True, 't'),
+    (False, 'f'),
+    (42, '42'),
+    ('tab\there', 'tab\\there'),
+    ('line\nbreak\r', 'line\\nbreak\\r'),
+    ('C:\\Windows', 'C:\\\\Windows'),
+    # 문자열 '\N'은 NULL과 구분되어야 함
+    ('\\N', '\\\\N'),
+    (datetime(2025, 9, 3, 9, 0, tzinfo=timezone.utc), '2025-09-03T09:00:00+00:00'),
+])
+def test_copy_value(value, encoded):
+    assert copy_value(value) == encoded
+
+
+def test_copy_line_round_trip():
+    values = ['plain', 'tab\tand\nnewline', 'back\\slash\\N', None, '', '\\N', 'trailing\\']
+    line = copy_line(values)
+
+    # 값 안의 제어문자는 모두 이스케이프되므로 한 행은 정확히 한 줄
+    assert line.endswith('\n') and line.count('\n') == 1
+    assert line.count('\t') == len(values) - 1
+    assert parse_copy_line(line) == values
+
+
+def test_event_row_round_trip_keeps_json_with_control_characters():
+    event = CloudTrailEvent.from_dict({
+        'eventID': 'event-1',
+        'eventTime': '2025-09-03T09:00:00Z',
+        'eventSource': 'ssm.amazonaws.com',
+        'eventName': 'SendCommand',
+        'awsRegion': 'ap-northeast-2',
+        'sourceIPAddress': '203.0.113.10',
+        'userAgent': 'aws-cli/2.0\tPython',
+        'requestParameters': {'commands': ['echo "a\tb"\nwhoami', 'dir C:\\Users']},
+    })
+    _, cloudtrail_row = build_rows(event, 'group')
+
+    parsed = parse_copy_line(copy_line(cloudtrail_row))
+    request_parameters = parsed[CLOUDTRAIL_COLUMNS.index('request_parameters')]
+    assert json.loads(request_parameters) == {'commands': ['echo "a\tb"\nwhoami', 'dir C:\\Users']}
+    assert parsed[CLOUDTRAIL_COLUMNS.index('event_id')] == 'event-1'
+
+
+def test_row_batch_record_round_trip():
+    batch = RowBatch()
+    batch.append('a', datetime(2025, 9, 3, 9), copy_line(['1', 'x\ny']), copy_line(['a', None]))
+    batch.append('b', None, copy_line(['2', 'z']), copy_line(['b', 'tab\t']))
+
+    restored = RowBatch.from_record(json.loads(json.dumps(batch.to_record())))
+    assert restored == batch
+    assert [parse_copy_line(line) for line in restored.events_lines] == [['1', 'x\ny'], ['2', 'z']]
@@ -0,0 +1,127 @@
+"""중복 체크: eventID 배열을 청크 단위 ANY(%s) 조회로 확인하고 실패를 호출자에게 알리는지 확인"""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('psycopg2')
+
+from src import direct_rds  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.direct_rds import (  # noqa: E402
+    EXISTING_EVENTS_IN_RANGE_SQL, EXISTING_EVENTS_SQL, DirectRDSSender, DuplicateCheckError, pg_array_literal
+)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        if self.conn.fail:
+            raise RuntimeError('connection lost')
+        self.conn.executed.append((sql, params))
+        literal = params[0]
+        self.rows = [(event_id,) for event_id in sorted(self.conn.existing) if f'"{event_id}"' in literal]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, existing, fail=False):
+        self.existing = existing
+        self.fail = fail
+        self.executed = []
+        self.rollbacks = 0
+        self.closed = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    """ThreadedConnectionPool 대신 하나의 가짜 연결을 빌려주는 풀"""
+
+    connection = None
+
+    def __init__(self, *args, **kwargs):
+        self.returned = 0
+
+    def getconn(self):
+        return FakePool.connection
+
+    def putconn(self, conn, close=False):
+        self.returned += 1
+
+    def closeall(self):
+        pass
+
+
+@pytest.fixture
+def sender(monkeypatch):
+    monkeypatch.setattr(settings, 'spool_dir', '')
+    monkeypatch.setattr(settings, 'event_id_cache_size', 0)
+    monkeypatch.setattr(settings, 'dedup_chunk_size', 3)
+    monkeypatch.setattr(direct_rds.pool, 'ThreadedConnectionPool', FakePool)
+    FakePool.connection = FakeConnection(existing={'id-2', 'id-5', 'id-7'})
+    return DirectRDSSender()
+
+
+def test_lookup_is_chunked_and_deduplicated(sender):
+    event_ids = ['id-1', 'id-2', 'id-3', 'id-2', 'id-4', 'id-5', 'id-6', 'id-7']
+
+    assert sender.check_existing_events(event_ids) == {'id-2', 'id-5', 'id-7'}
+
+    executed = FakePool.connection.executed
+    # 중복 제거 후 7개 → 3개씩 3번 조회, 순서 유지
+    assert [sql for sql, _ in executed] == [EXISTING_EVENTS_SQL] * 3
+    assert [params[0] for _, params in executed] == [
+        pg_array_literal(['id-1', 'id-2', 'id-3']),
+        pg_array_literal(['id-4', 'id-5', 'id-6']),
+        pg_array_literal(['id-7']),
+    ]
+    assert FakePool.connection.rollbacks == 1
+    # 빌린 연결은 반납되어 유휴 상태로 집계
+    assert sender.connection_pool.counts() == {'used': 0, 'idle': 1}
+
+
+def test_time_range_limits_lookup(sender):
+    time_range = (datetime(2025, 9, 3, 9, 0), datetime(2025, 9, 3, 9, 5))
+
+    assert sender.check_existing_events(['id-1', 'id-2'], time_range=time_range) == {'id-2'}
+    assert FakePool.connection.executed == [
+        (EXISTING_EVENTS_IN_RANGE_SQL, (pg_array_literal(['id-1', 'id-2']), *time_range))
+    ]
+
+
+def test_lookup_failure_raises(sender):
+    FakePool.connection.fail = True
+
+    with pytest.raises(DuplicateCheckError):
+        sender.check_existing_events(['id-1'])
+    assert FakePool.connection.rollbacks == 1
+    # 빌린 연결은 반납되어 유휴 상태로 집계
+    assert sender.connection_pool.counts() == {'used': 0, 'idle': 1}
+
+
+def test_empty_input_skips_db(sender):
+    assert sender.check_existing_events([]) == set()
+    assert FakePool.connection.executed == []
+
+
+def test_recent_cache_hits_skip_db(sender, monkeypatch):
+    monkeypatch.setattr(settings, 'event_id_cache_size', 100)
+    cached_sender = DirectRDSSender()
+    cached_sender._remember_written(['id-1', 'id-2'])
+
+    assert cached_sender.check_existing_events(['id-1', 'id-2']) == {'id-1', 'id-2'}
+    assert FakePool.connection.executed == []
+
+
+def test_pg_array_literal_escapes_quotes_and_backslashes():
+    assert pg_array_literal(['a', 'b"c', 'd\\e']) == '{"a","b\\"c","d\\\\e"}'
@@ -0,0 +1,97 @@
+"""S3 객체 캐시: (버킷, 키, ETag) 적중, LRU 삭제 순서, 재시작 후 순서 복원, 수집기 다운로드 경로 확인"""
+
+import io
+import os
+
+from src.object_cache import ObjectCache
+from src.s3_cloudtrail import S3CloudTrailCollector
+
+
+def test_hit_requires_same_etag(tmp_path):
+    cache = ObjectCache(str(tmp_path), max_bytes=1024)
+    cache.put('bucket', 'a.json.gz', '"etag-1"', b'first')
+
+    # 목록 조회(따옴표 포함)와 다운로드 응답 표기 차이는 같은 항목
+    assert cache.get('bucket', 'a.json.gz', 'etag-1') == b'first'
+    # 덮어쓴 객체(ETag 변경), 다른 버킷, ETag를 모르는 경우는 미적중
+    assert cache.get('bucket', 'a.json.gz', '"etag-2"') is None
+    assert cache.get('other', 'a.json.gz', '"etag-1"') is None
+    assert cache.get('bucket', 'a.json.gz', None) is None
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 3)
+
+
+def test_least_recently_used_entry_is_evicted_first(tmp_path):
+    cache = ObjectCache(str(tmp_path), max_bytes=30)
+    for name in 'abc':
+        cache.put('bucket', name, name, name.encode() * 10)
+
+    # a를 사용했으므로 상한을 넘기면 b부터 삭제
+    assert cache.get('bucket', 'a', 'a') == b'a' * 10
+    cache.put('bucket', 'd', 'd', b'd' * 10)
+
+    assert cache.get('bucket', 'b', 'b') is None
+    assert [cache.get('bucket', name, name) is not None for name in 'acd'] == [True, True, True]
+    assert cache.stats()['bytes'] == 30
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 3
+
+
+def test_objects_larger_than_cache_or_without_etag_are_not_stored(tmp_path):
+    cache = ObjectCache(str(tmp_path), max_bytes=10)
+    cache.put('bucket', 'big', 'etag', b'x' * 11)
+    cache.put('bucket', 'no-etag', None, b'x')
+
+    assert cache.stats()['entries'] == 0
+
+
+def test_restart_restores_usage_order_and_removes_partial_files(tmp_path):
+    cache = ObjectCache(str(tmp_path), max_bytes=20)
+    cache.put('bucket', 'old', 'e', b'o' * 10)
+    cache.put('bucket', 'new', 'e', b'n' * 10)
+    # 사용 순서는 파일 수정 시각으로 기록됨
+    os.utime(cache._entry_path('bucket', 'old', 'e'), (1000, 1000))
+    os.utime(cache._entry_path('bucket', 'new', 'e'), (2000, 2000))
+    partial = tmp_path / 'ab' / 'partial.tmp'
+    partial.parent.mkdir(exist_ok=True)
+    partial.write_bytes(b'half')
+
+    restarted = ObjectCache(str(tmp_path), max_bytes=20)
+    assert not partial.exists()
+    assert restarted.stats()['entries'] == 2
+
+    restarted.put('bucket', 'newest', 'e', b'x' * 10)
+    assert restarted.get('bucket', 'old', 'e') is None
+    assert restarted.get('bucket', 'new', 'e') == b'n' * 10
+
+
+class FakeS3Client:
+    def __init__(self, objects):
+        self.objects = objects
+        self.gets = 0
+
+    def get_object(self, Bucket, Key):
+        self.gets += 1
+        body, etag = self.objects[Key]
+        return {'Body': io.BytesIO(body), 'ETag': etag, 'ContentLength': len(body)}
+
+
+def test_collector_downloads_only_on_miss_or_changed_etag(tmp_path):
+    collector = S3CloudTrailCollector()
+    collector.object_cache = ObjectCache(str(tmp_path), max_bytes=1024)
+    collector.s3_client = FakeS3Client({'a.json.gz': (b'v1', '"etag-1"')})
+
+    def listed_body(etag):
+        # 목록 조회 단계에서 기록한 ETag로 캐시 확인
+        collector._listed_etags[('bucket', 'a.json.gz')] = etag
+        return collector._get_object_body('bucket', 'a.json.gz').read()
+
+    try:
+        assert listed_body('"etag-1"') == b'v1'
+        assert listed_body('"etag-1"') == b'v1'
+        assert collector.s3_client.gets == 1
+
+        collector.s3_client.objects['a.json.gz'] = (b'v2', '"etag-2"')
+        assert listed_body('"etag-2"') == b'v2'
+        assert collector.s3_client.gets == 2
+    finally:
+        collector._fetch_executor.shutdown()
+        collector._scan_executor.shutdown()
@@ -0,0 +1,106 @@
+"""Parquet 저장: date/account_id/region 파티션 경로, eventID로 정한 파일 이름, 타입 있는 컬럼 확인"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+from src.cloud_trail import CloudTrailEvent, CloudTrailLogData  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.direct_rds import RowBatch, build_rows, copy_line  # noqa: E402
+from src.parquet_sink import ParquetSender  # noqa: E402
+
+
+def make_event(event_id, event_time='2025-09-03T09:00:00Z', account='111111111111', region='ap-northeast-2'):
+    return CloudTrailEvent.from_dict({
+        'eventID': event_id,
+        'eventTime': event_time,
+        'eventSource': 's3.amazonaws.com',
+        'eventName': 'GetObject',
+        'awsRegion': region,
+        'sourceIPAddress': '203.0.113.10',
+        'recipientAccountId': account,
+        'readOnly': True,
+        'managementEvent': False,
+        'userIdentity': {'type': 'IAMUser', 'arn': f'arn:aws:iam::{account}:user/alice', 'userName': 'alice'},
+        'requestParameters': {'bucketName': 'logs', 'key': 'a\tb'},
+    })
+
+
+@pytest.fixture
+def sender(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'spool_dir', '')
+    return ParquetSender(target=str(tmp_path))
+
+
+def parquet_files(root):
+    return sorted(str(path.relative_to(root)) for path in root.rglob('*.parquet'))
+
+
+def test_events_are_split_into_date_account_region_partitions(sender, tmp_path):
+    events = [
+        make_event('a'),
+        make_event('b', event_time='2025-09-03T23:59:59Z'),
+        make_event('c', event_time='2025-09-04T00:00:00Z'),
+        make_event('d', account='222222222222', region='us-east-1'),
+    ]
+    assert sender.send_logs(CloudTrailLogData(events))
+
+    files = parquet_files(tmp_path)
+    assert [path.rsplit('/', 1)[0] for path in files] == [
+        'date=2025-09-03/account_id=111111111111/region=ap-northeast-2',
+        'date=2025-09-03/account_id=222222222222/region=us-east-1',
+        'date=2025-09-04/account_id=111111111111/region=ap-northeast-2',
+    ]
+    table = pq.read_table(tmp_path / files[0])
+    assert table.column('event_id').to_pylist() == ['a', 'b']
+
+
+def test_resending_the_same_batch_overwrites_instead_of_adding_files(sender, tmp_path):
+    events = [make_event('a'), make_event('b')]
+    assert sender.send_logs(CloudTrailLogData(events))
+    first = parquet_files(tmp_path)
+
+    assert sender.send_logs(CloudTrailLogData(events))
+    assert parquet_files(tmp_path) == first
+    assert len(first) == 1 and first[0].split('/')[-1].startswith('part-')
+
+    # 다른 eventID 묶음은 같은 파티션의 새 파일
+    assert sender.send_logs(CloudTrailLogData([make_event('c')]))
+    assert len(parquet_files(tmp_path)) == 2
+    assert not list(tmp_path.rglob('*.tmp'))
+
+
+def test_columns_are_typed_and_user_identity_is_flattened(sender, tmp_path):
+    assert sender.send_logs(CloudTrailLogData([make_event('a')]))
+    row = pq.read_table(tmp_path / parquet_files(tmp_path)[0]).to_pylist()[0]
+
+    assert row['event_time'] == datetime(2025, 9, 3, 9, tzinfo=timezone.utc)
+    assert (row['read_only'], row['management_event']) == (True, False)
+    assert (row['user_identity_type'], row['user_identity_user_name']) == ('IAMUser', 'alice')
+    assert row['group_id'] == settings.group_id
+    assert 'a\\tb' in row['request_parameters']
+
+
+def test_rows_from_parse_processes_produce_the_same_file(sender, tmp_path):
+    events = [make_event('a'), make_event('b')]
+    assert sender.send_logs(CloudTrailLogData(events))
+    from_events = parquet_files(tmp_path)
+    expected = pq.read_table(tmp_path / from_events[0]).to_pylist()
+
+    rows = RowBatch()
+    for event in events:
+        events_row, cloudtrail_row = build_rows(event, settings.group_id)
+        rows.append(event.event_id, event.event_datetime, copy_line(events_row), copy_line(cloudtrail_row))
+    assert sender.send_rows(rows)
+
+    assert parquet_files(tmp_path) == from_events
+    assert pq.read_table(tmp_path / from_events[0]).to_pylist() == expected
+
+
+def test_event_without_time_or_account_goes_to_unknown_partition(sender, tmp_path):
+    event = make_event('a', account=None)
+    event.event_time = ''
+    assert sender.send_logs(CloudTrailLogData([event]))
+    assert parquet_files(tmp_path)[0].startswith('date=unknown/account_id=unknown/region=ap-northeast-2/')
@@ -0,0 +1,123 @@
+"""시간 범위 파티션: 일/월 경계, 생성 범위, 이미 만든 파티션 재사용, 보존 기간 DROP 확인"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.partitions import PARTITION_LIST_SQL, PartitionManager, event_time_range
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        self.result = [(name,) for name in self.conn.partitions.get(params[0], [])] if sql == PARTITION_LIST_SQL else []
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self, partitions=None):
+        self.partitions = partitions or {}
+        self.executed = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn):
+        pass
+
+
+def make_manager(interval='day', retention_days=0, partitions=None):
+    conn = FakeConnection(partitions)
+    manager = PartitionManager(FakePool(conn), interval=interval, premake=2, retention_days=retention_days)
+    # 유지보수(미래 파티션 생성/정리)는 각 테스트에서 직접 호출
+    manager._next_maintenance = float('inf')
+    return manager, conn
+
+
+def created(conn):
+    return [(sql.split()[5], params) for sql, params in conn.executed if sql.startswith('CREATE TABLE')]
+
+
+@pytest.mark.parametrize('interval, value, start, next_start', [
+    ('day', datetime(2025, 9, 3, 23, 59, 59), datetime(2025, 9, 3), datetime(2025, 9, 4)),
+    ('day', datetime(2025, 12, 31, 12), datetime(2025, 12, 31), datetime(2026, 1, 1)),
+    ('month', datetime(2025, 1, 31, 23), datetime(2025, 1, 1), datetime(2025, 2, 1)),
+    ('month', datetime(2024, 2, 29), datetime(2024, 2, 1), datetime(2024, 3, 1)),
+    ('month', datetime(2025, 12, 15), datetime(2025, 12, 1), datetime(2026, 1, 1)),
+])
+def test_partition_bounds(interval, value, start, next_start):
+    manager, _ = make_manager(interval)
+    assert manager.partition_start(value) == start
+    assert manager.next_start(start) == next_start
+
+
+def test_ensure_partitions_creates_missing_partitions_once():
+    manager, conn = make_manager()
+    manager.ensure_partitions([datetime(2025, 9, 3, 9), datetime(2025, 9, 3, 23), datetime(2025, 9, 4, 0, 0, 1), None])
+
+    utc = timezone.utc
+    assert created(conn) == [
+        ('events_p20250903', (datetime(2025, 9, 3, tzinfo=utc), datetime(2025, 9, 4, tzinfo=utc))),
+        ('cloudtrail_p20250903', (datetime(2025, 9, 3), datetime(2025, 9, 4))),
+        ('events_p20250904', (datetime(2025, 9, 4, tzinfo=utc), datetime(2025, 9, 5, tzinfo=utc))),
+        ('cloudtrail_p20250904', (datetime(2025, 9, 4), datetime(2025, 9, 5))),
+    ]
+
+    # 이미 만든 파티션은 DB 조회 없이 건너뜀
+    conn.executed.clear()
+    manager.ensure_partitions([datetime(2025, 9, 4, 12)])
+    assert conn.executed == []
+
+
+def test_premake_starts_cover_current_and_future_partitions():
+    manager, _ = make_manager('month')
+    assert manager._premake_starts(datetime(2025, 11, 20)) == [
+        datetime(2025, 11, 1), datetime(2025, 12, 1), datetime(2026, 1, 1)
+    ]
+
+
+def test_drop_expired_only_drops_partitions_entirely_past_retention():
+    partitions = {
+        'events': ['events_p20250830', 'events_p20250831', 'events_p20250901', 'events_default'],
+        'cloudtrail': ['cloudtrail_p20250830', 'cloudtrail_p20250901'],
+    }
+    manager, conn = make_manager(retention_days=3, partitions=partitions)
+
+    # 기준 시각 09-03 12:00 → 08-31 12:00 이전 데이터만 보존 기간 밖 (08-31 파티션은 일부가 남아 있음)
+    dropped = manager.drop_expired(now=datetime(2025, 9, 3, 12))
+
+    assert dropped == ['events_p20250830', 'cloudtrail_p20250830']
+    assert conn.commits == 1
+
+
+def test_drop_expired_is_disabled_without_retention():
+    manager, conn = make_manager(partitions={'events': ['events_p20000101']})
+    assert manager.drop_expired(now=datetime(2025, 9, 3)) == []
+    assert conn.executed == []
+
+
+def test_event_time_range_requires_every_time():
+    assert event_time_range([datetime(2025, 9, 3, 9), datetime(2025, 9, 1)]) == (datetime(2025, 9, 1), datetime(2025, 9, 3, 9))
+    assert event_time_range([datetime(2025, 9, 3), None]) is None
+    assert event_time_range([]) is None
@@ -0,0 +1,137 @@
+"""파이프라인: prefix별 저장 순서, 실패 배치 이후 처리 중단, 저장 중인 배치와 다음 배치의 중복 제거 확인"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from src.cloud_trail import CloudTrailEvent
+from src.pipeline import CollectionPipeline
+
+BUCKET_CONFIGS = [{'bucket_name': 'bucket', 'prefix': 'AWSLogs/', 'max_files': 50}]
+KEY = 'bucket/AWSLogs/'
+
+
+def make_event(event_id):
+    return CloudTrailEvent.from_dict({
+        'eventID': event_id,
+        'eventTime': '2025-09-03T09:00:00Z',
+        'eventSource': 's3.amazonaws.com',
+        'eventName': 'GetObject',
+        'awsRegion': 'ap-northeast-2',
+        'sourceIPAddress': '203.0.113.10',
+    })
+
+
+class FakeCollector:
+    """S3 파일 {키: eventID 목록}과 저장된 eventID를 조회하는 중복 체크를 흉내 냄"""
+
+    def __init__(self, files):
+        self.files = files
+        self.stored = set()
+        self.checked = []
+        self._scan_executor = ThreadPoolExecutor(max_workers=2)
+
+    def _resolve_prefixes(self, config):
+        return [config['prefix']]
+
+    def _list_s3_objects(self, bucket_name, prefix, **kwargs):
+        return sorted(self.files)
+
+    def _fetch_objects(self, bucket_name, keys, event_names, max_workers, parse_pool=None):
+        return [(key, [make_event(event_id) for event_id in self.files[key]]) for key in keys]
+
+    def _merge_fetched(self, fetched, merged=None):
+        events = [event for _, file_events in fetched for event in file_events]
+        return events, datetime(2025, 9, 3, 9), fetched[-1][0]
+
+    def _filter_new_events(self, events, last_timestamp, duplicate_checker=None):
+        self.checked.append([event.event_id for event in events])
+        return [event for event in events if event.event_id not in self.stored]
+
+
+class Writer:
+    """저장 순서를 기록하고, 지정한 순번의 저장을 실패시키거나 다음 배치의 중복 체크까지 붙잡아 둠"""
+
+    def __init__(self, collector, fail_on=None, hold_first_until=None):
+        self.collector = collector
+        self.fail_on = fail_on
+        self.hold_first_until = hold_first_until
+        self.written = []
+
+    def __call__(self, log_data):
+        event_ids = [event.event_id for event in log_data.records]
+        if self.hold_first_until is not None and not self.written:
+            assert self.hold_first_until()
+        if len(self.written) == self.fail_on:
+            self.written.append(None)
+            return False
+        self.written.append(event_ids)
+        self.collector.stored.update(event_ids)
+        return True
+
+
+def make_pipeline(collector, writer, commits):
+    return CollectionPipeline(
+        collector,
+        send_batch=writer,
+        send_rows=None,
+        on_commit=lambda key, timestamp, last_key: commits.append(last_key),
+        queue_size=4,
+        files_per_batch=1
+    )
+
+
+@pytest.fixture
+def collector():
+    collector = FakeCollector({f'file-{n}': [f'event-{n}'] for n in range(4)})
+    yield collector
+    collector._scan_executor.shutdown()
+
+
+def test_batches_are_written_in_listing_order(collector):
+    writer = Writer(collector)
+    commits = []
+    result = make_pipeline(collector, writer, commits).run(BUCKET_CONFIGS)
+
+    assert result.success
+    assert writer.written == [['event-0'], ['event-1'], ['event-2'], ['event-3']]
+    assert commits == ['file-0', 'file-1', 'file-2', 'file-3']
+    assert result.events_written == 4
+
+
+def test_failed_batch_drops_later_batches_and_stops_checkpoint(collector):
+    writer = Writer(collector, fail_on=1)
+    commits = []
+    result = make_pipeline(collector, writer, commits).run(BUCKET_CONFIGS)
+
+    assert not result.success
+    assert result.failed_keys == {KEY}
+    # 실패한 배치 이후는 저장하지 않고 체크포인트도 실패 직전에서 멈춤
+    assert writer.written == [['event-0'], None]
+    assert commits == ['file-0']
+
+
+def test_event_in_batch_still_being_written_is_not_written_again():
+    # 같은 eventID가 연속된 두 파일에 있고, 두 번째 배치의 중복 체크가 첫 배치 커밋 전에 실행됨
+    collector = FakeCollector({'file-0': ['event-a', 'event-b'], 'file-1': ['event-b', 'event-c', 'event-c']})
+    second_checked = threading.Event()
+    original_filter = collector._filter_new_events
+
+    def filter_new_events(events, last_timestamp, duplicate_checker=None):
+        kept = original_filter(events, last_timestamp, duplicate_checker)
+        if len(collector.checked) == 2:
+            second_checked.set()
+        return kept
+
+    collector._filter_new_events = filter_new_events
+    writer = Writer(collector, hold_first_until=lambda: second_checked.wait(2.0))
+    try:
+        result = make_pipeline(collector, writer, []).run(BUCKET_CONFIGS)
+    finally:
+        collector._scan_executor.shutdown()
+
+    assert result.success
+    assert writer.written == [['event-a', 'event-b'], ['event-c']]
+    assert result.events_written == 3
@@ -0,0 +1,186 @@
+"""RDS 저장: 배치 안에서 반복되거나 이미 저장된 eventID가 저장 실패로 이어지지 않는지 확인"""
+
+import pytest
+
+pytest.importorskip('psycopg2')
+
+from src import direct_rds  # noqa: E402
+from src.cloud_trail import CloudTrailEvent, CloudTrailLogData  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.direct_rds import (  # noqa: E402
+    CLOUDTRAIL_COPY_SQL, CLOUDTRAIL_INSERT_SQL, CLOUDTRAIL_STAGE_COPY_SQL, CLOUDTRAIL_STAGE_INSERT_SQL, EVENTS_DELETE_SQL,
+    EVENTS_INSERT_SQL, DirectRDSSender, parse_copy_line, pg_array_literal
+)
+
+
+class UniqueViolation(Exception):
+    pgcode = '23505'
+
+
+class FakeCursor:
+    """cloudtrail 유니크 인덱스(event_id)를 흉내 내는 커서"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def copy_expert(self, sql, buffer):
+        lines = [line for line in buffer.getvalue().split('\n') if line]
+        self.conn.copied.append((sql, lines))
+        if sql == CLOUDTRAIL_COPY_SQL:
+            event_ids = [parse_copy_line(line)[1] for line in lines]
+            if len(set(event_ids)) < len(event_ids) or self.conn.stored & set(event_ids):
+                raise UniqueViolation('duplicate key value violates unique constraint')
+            self.conn.stored.update(event_ids)
+        if sql == CLOUDTRAIL_STAGE_COPY_SQL:
+            self.conn.staged = [parse_copy_line(line) for line in lines]
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        if sql == CLOUDTRAIL_STAGE_INSERT_SQL:
+            self.result = [(row[0],) for row in self.conn.staged if row[1] not in self.conn.stored]
+            self.conn.stored.update(row[1] for row in self.conn.staged)
+        elif sql == CLOUDTRAIL_INSERT_SQL:
+            event_id = params[1]
+            self.result = [] if event_id in self.conn.stored else [(params[0],)]
+            self.conn.stored.add(event_id)
+        else:
+            self.result = []
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self, stored=()):
+        self.stored = set(stored)
+        self.staged = []
+        self.copied = []
+        self.executed = []
+        self.commits = 0
+        self.closed = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    connection = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def getconn(self):
+        return FakePool.connection
+
+    def putconn(self, conn, close=False):
+        pass
+
+    def closeall(self):
+        pass
+
+
+def make_events(*event_ids):
+    return [
+        CloudTrailEvent.from_dict({
+            'eventID': event_id,
+            'eventTime': '2025-09-03T09:00:00Z',
+            'eventSource': 's3.amazonaws.com',
+            'eventName': 'GetObject',
+            'awsRegion': 'ap-northeast-2',
+            'sourceIPAddress': '203.0.113.10',
+        })
+        for event_id in event_ids
+    ]
+
+
+def make_sender(monkeypatch, mode, stored=()):
+    monkeypatch.setattr(settings, 'spool_dir', '')
+    monkeypatch.setattr(settings, 'event_id_cache_size', 0)
+    monkeypatch.setattr(settings, 'rds_partitioning', False)
+    monkeypatch.setattr(settings, 'rds_write_mode', mode)
+    monkeypatch.setattr(direct_rds.pool, 'ThreadedConnectionPool', FakePool)
+    FakePool.connection = FakeConnection(stored)
+    return DirectRDSSender()
+
+
+def copied_event_ids(sql):
+    return [
+        parse_copy_line(line)[1]
+        for copied_sql, lines in FakePool.connection.copied if copied_sql == sql
+        for line in lines
+    ]
+
+
+def deleted_ids():
+    return [params for sql, params in FakePool.connection.executed if sql == EVENTS_DELETE_SQL]
+
+
+@pytest.mark.parametrize('mode', ['copy', 'row', 'idempotent'])
+def test_repeated_event_id_in_batch_is_written_once(monkeypatch, mode):
+    sender = make_sender(monkeypatch, mode)
+
+    assert sender.send_logs(CloudTrailLogData(make_events('a', 'b', 'a', 'c', 'b')))
+    assert (sender.last_write_result.inserted, sender.last_write_result.skipped) == (3, 2)
+    assert FakePool.connection.stored == {'a', 'b', 'c'}
+    assert FakePool.connection.commits == 1
+
+
+def test_repeated_event_id_in_row_batch_is_written_once(monkeypatch):
+    sender = make_sender(monkeypatch, 'copy')
+    rows = sender._encode_rows(make_events('a', 'b', 'a'))
+
+    assert sender.send_rows(rows)
+    assert copied_event_ids(CLOUDTRAIL_COPY_SQL) == ['a', 'b']
+    assert (sender.last_write_result.inserted, sender.last_write_result.skipped) == (2, 1)
+
+
+def test_copy_conflict_with_stored_event_falls_back_to_staging(monkeypatch):
+    # 사전 중복 체크 이후 다른 배치가 'b'를 저장한 경우
+    sender = make_sender(monkeypatch, 'copy', stored={'b'})
+
+    assert sender.send_logs(CloudTrailLogData(make_events('a', 'b', 'c')))
+    assert copied_event_ids(CLOUDTRAIL_STAGE_COPY_SQL) == ['a', 'b', 'c']
+    assert (sender.last_write_result.inserted, sender.last_write_result.skipped) == (2, 1)
+    # 건너뛴 행의 events 행은 같은 트랜잭션에서 삭제
+    skipped_id = FakePool.connection.staged[1][0]
+    assert deleted_ids() == [(pg_array_literal([skipped_id]),)]
+
+
+def test_row_insert_skips_stored_event_and_removes_orphan(monkeypatch):
+    sender = make_sender(monkeypatch, 'row', stored={'b'})
+    events = make_events('a', 'b')
+
+    assert sender.send_logs(CloudTrailLogData(events))
+    assert (sender.last_write_result.inserted, sender.last_write_result.skipped) == (1, 1)
+    events_ids = [params[0] for sql, params in FakePool.connection.executed if sql == EVENTS_INSERT_SQL]
+    assert deleted_ids() == [(pg_array_literal([events_ids[1]]),)]
+
+
+def test_idempotent_mode_resending_a_batch_stores_nothing_twice(monkeypatch):
+    # 스풀 재전송이나 재시도로 같은 배치가 다시 들어와도 저장 결과가 바뀌지 않음
+    sender = make_sender(monkeypatch, 'idempotent')
+    batch = CloudTrailLogData(make_events('a', 'b', 'c'))
+
+    assert sender.send_logs(batch)
+    assert (sender.last_write_result.inserted, sender.last_write_result.skipped) == (3, 0)
+    assert deleted_ids() == []
+
+    assert sender.send_logs(batch)
+    assert (sender.last_write_result.inserted, sender.last_write_result.skipped) == (0, 3)
+    assert FakePool.connection.stored == {'a', 'b', 'c'}
+    # 두 번째 배치의 events 행은 모두 같은 트랜잭션에서 삭제
+    second_staged = [row[0] for row in FakePool.connection.staged]
+    assert deleted_ids() == [(pg_array_literal(second_staged),)]
+    # 스테이징 경로만 사용 (cloudtrail 직접 COPY 없음)
+    assert copied_event_ids(CLOUDTRAIL_COPY_SQL) == []
+    assert FakePool.connection.commits == 2
@@ -0,0 +1,95 @@
+"""S3 목록 조회: StartAfter로 시작 위치를 지정하고 필요한 페이지만 조회하는지 확인"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.s3_cloudtrail import S3CloudTrailCollector
+
+ACCOUNT = '123456789012'
+REGION = 'ap-northeast-2'
+PREFIX = f'AWSLogs/{ACCOUNT}/CloudTrail/{REGION}/'
+
+
+def log_key(file_time, suffix='A'):
+    return f"{PREFIX}{file_time:%Y/%m/%d}/{ACCOUNT}_CloudTrail_{REGION}_{file_time:%Y%m%dT%H%M}Z_{suffix}.json.gz"
+
+
+class FakePaginator:
+    """ListObjectsV2 페이지네이터 - Prefix/StartAfter를 적용하고 조회한 페이지 수를 기록"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, Bucket, Prefix, StartAfter=None):
+        self.client.requests.append({'Prefix': Prefix, 'StartAfter': StartAfter})
+        keys = [key for key in sorted(self.client.keys) if key.startswith(Prefix) and (StartAfter is None or key > StartAfter)]
+        for offset in range(0, len(keys), self.client.page_size):
+            self.client.pages += 1
+            yield {'Contents': [{'Key': key} for key in keys[offset:offset + self.client.page_size]]}
+
+
+class FakeS3Client:
+    def __init__(self, keys, page_size=2):
+        self.keys = keys
+        self.page_size = page_size
+        self.requests = []
+        self.pages = 0
+
+    def get_paginator(self, name):
+        assert name == 'list_objects_v2'
+        return FakePaginator(self)
+
+
+@pytest.fixture
+def collector():
+    collector = S3CloudTrailCollector(region=REGION)
+    yield collector
+    collector._fetch_executor.shutdown()
+    collector._scan_executor.shutdown()
+
+
+def test_once_mode_starts_after_start_time_and_stops_past_end_time(collector):
+    day = datetime(2025, 9, 3)
+    keys = [log_key(day + timedelta(minutes=5 * n)) for n in range(12)]
+    collector.s3_client = FakeS3Client(keys)
+
+    objects = collector._list_s3_objects(
+        'bucket', PREFIX, start_time=day + timedelta(minutes=10), end_time=day + timedelta(minutes=20)
+    )
+
+    assert objects == keys[2:5]
+    assert collector.s3_client.requests == [{
+        'Prefix': f'{PREFIX}2025/09/03/',
+        'StartAfter': f'{PREFIX}2025/09/03/{ACCOUNT}_CloudTrail_{REGION}_20250903T0010',
+    }]
+    # 종료 시각 이후 파일이 나오면 남은 페이지는 조회하지 않음
+    assert collector.s3_client.pages == 2
+
+
+def test_service_mode_resumes_after_last_key_within_the_same_minute(collector):
+    # 같은 분에 여러 파일이 있고 지난 사이클이 max_files에서 중간에 끊긴 경우
+    last_timestamp = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=30)
+    keys = [log_key(last_timestamp, suffix) for suffix in 'ABCD'] + [log_key(last_timestamp + timedelta(minutes=5))]
+    collector.s3_client = FakeS3Client(keys)
+
+    objects = collector._list_s3_objects('bucket', PREFIX, last_timestamp=last_timestamp, last_key=keys[1], max_files=2)
+
+    assert objects == keys[2:4]
+    assert collector.s3_client.requests[0] == {'Prefix': f'{PREFIX}{last_timestamp:%Y/%m/%d}/', 'StartAfter': keys[1]}
+    # max_files를 채운 뒤에는 다음 페이지를 요청하지 않음
+    assert collector.s3_client.pages == 1
+
+
+def test_service_mode_without_last_key_starts_at_last_timestamp(collector):
+    last_timestamp = datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=30)
+    keys = [log_key(last_timestamp + timedelta(minutes=5 * n)) for n in range(-2, 3)]
+    collector.s3_client = FakeS3Client(keys, page_size=10)
+
+    objects = collector._list_s3_objects('bucket', PREFIX, last_timestamp=last_timestamp)
+
+    # 마지막 처리 시각의 파일은 이미 처리한 것으로 보고 이후 파일만 반환
+    assert objects == keys[3:]
+    assert collector.s3_client.requests[0]['StartAfter'] == (
+        f"{PREFIX}{last_timestamp:%Y/%m/%d}/{ACCOUNT}_CloudTrail_{REGION}_{last_timestamp:%Y%m%dT%H%M}"
+    )
@@ -0,0 +1,63 @@
+"""수집 간격 조절: 적체 시 즉시 실행, 새 파일 유무와 실패에 따른 간격 변화, stop() 시 대기 중단 확인"""
+
+import threading
+import time
+
+from src.config import settings
+from src.scheduler import AdaptiveScheduler
+
+
+def make_scheduler(**kwargs):
+    return AdaptiveScheduler(**{'min_interval': 10, 'latency_target': 80, 'backoff_factor': 2, 'adaptive': True, **kwargs})
+
+
+def test_idle_cycles_back_off_up_to_latency_target():
+    scheduler = make_scheduler()
+    delays = [scheduler.next_delay(success=True, new_files=0, backlog=False) for _ in range(5)]
+    assert delays == [20, 40, 80, 80, 80]
+
+
+def test_new_files_reset_interval_to_minimum():
+    scheduler = make_scheduler()
+    scheduler.next_delay(success=True, new_files=0, backlog=False)
+    scheduler.next_delay(success=True, new_files=0, backlog=False)
+
+    assert scheduler.next_delay(success=True, new_files=3, backlog=False) == 10
+    assert scheduler.next_delay(success=True, new_files=0, backlog=False) == 20
+
+
+def test_backlog_runs_next_cycle_immediately():
+    scheduler = make_scheduler()
+    assert scheduler.next_delay(success=True, new_files=50, backlog=True) == 0
+    # 적체가 풀리면 최소 간격부터 다시 시작
+    assert scheduler.next_delay(success=True, new_files=0, backlog=False) == 20
+
+
+def test_failure_backs_off_even_with_backlog():
+    scheduler = make_scheduler()
+    assert scheduler.next_delay(success=False, new_files=50, backlog=True) == 20
+    assert scheduler.next_delay(success=False, new_files=50, backlog=True) == 40
+    assert scheduler.next_delay(success=True, new_files=50, backlog=True) == 0
+
+
+def test_min_interval_is_capped_by_latency_target():
+    scheduler = make_scheduler(min_interval=120, latency_target=60)
+    assert scheduler.next_delay(success=True, new_files=1, backlog=False) == 60
+
+
+def test_fixed_interval_when_not_adaptive(monkeypatch):
+    monkeypatch.setattr(settings, 'collection_interval', 300)
+    scheduler = make_scheduler(adaptive=False)
+    assert scheduler.next_delay(success=True, new_files=50, backlog=True) == 300
+    assert scheduler.next_delay(success=False, new_files=0, backlog=False) == 300
+
+
+def test_stop_wakes_up_waiting_cycle():
+    scheduler = make_scheduler()
+    threading.Timer(0.05, scheduler.stop).start()
+
+    started = time.monotonic()
+    assert not scheduler.wait(10)
+    assert time.monotonic() - started < 5
+    assert scheduler.stopped
+    assert not scheduler.wait(0)
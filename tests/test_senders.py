@@ -0,0 +1,171 @@
+"""전송자 동시 전송: 동시 호출, 제한 시간, 재시도/스풀, 결과 집계, 스풀 재전송 위치 확인"""
+
+import threading
+import time
+
+from src.cloud_trail import CloudTrailLogData
+from src.senders import Sender, SenderFanout
+
+
+class FakeSender(Sender):
+    def __init__(self, name, delay=0.0, failures=0, spool=False, replay_delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.failures = failures
+        self.replay_delay = replay_delay
+        self.spool = [] if spool else None
+        self.attempts = 0
+        self.sent = []
+        self.replays = 0
+
+    def send_logs(self, log_data) -> bool:
+        self.attempts += 1
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.sent.append(log_data.records)
+        return True
+
+    def spool_batch(self, batch, reason) -> bool:
+        if self.spool is None:
+            return False
+        self.spool.append(batch)
+        return True
+
+    def replay_spool(self) -> int:
+        time.sleep(self.replay_delay)
+        self.replays += 1
+        return 0
+
+
+def batch(n):
+    return CloudTrailLogData(records=[f'event-{n}'])
+
+
+def make_fanout(*senders, timeout=2.0, retries=0):
+    return SenderFanout(list(senders), timeout=timeout, retries=retries, retry_backoff=0)
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_concurrent_callers_queue_on_a_healthy_sender():
+    # 백필 구간 스레드처럼 여러 스레드가 동시에 보내도, 제한 시간 안이면 차례로 저장 (스풀/실패 없음)
+    sender = FakeSender('rds', delay=0.1)
+    fanout = make_fanout(sender, timeout=2.0)
+    results = [None] * 4
+
+    def call(n):
+        results[n] = fanout.send_logs(batch(n))
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 4
+    assert sorted(records[0] for records in sender.sent) == [f'event-{n}' for n in range(4)]
+    assert fanout.stats()['rds']['success'] == 4
+    assert fanout.stats()['rds']['failure'] == 0
+    fanout.shutdown()
+
+
+def test_timeout_is_counted_once_and_late_result_separately():
+    sender = FakeSender('rds', delay=0.3)
+    fanout = make_fanout(sender, timeout=0.05)
+
+    assert not fanout.send_logs(batch(1))
+    wait_until(lambda: fanout.stats()['rds']['late_success'] == 1)
+
+    stats = fanout.stats()['rds']
+    assert (stats['timeout'], stats['success'], stats['late_success']) == (1, 0, 1)
+    fanout.shutdown()
+
+
+def test_stalled_sender_spools_new_batches_until_it_finishes():
+    sender = FakeSender('rds', delay=0.3, spool=True)
+    fanout = make_fanout(sender, timeout=0.05)
+
+    assert not fanout.send_logs(batch(1))
+    # 제한 시간을 넘긴 전송이 진행 중이면 기다리지 않고 스풀
+    assert fanout.send_logs(batch(2))
+    assert [records[0] for records in sender.spool] == ['event-2']
+
+    wait_until(lambda: fanout.stats()['rds']['late_success'] == 1)
+    sender.delay = 0
+    assert fanout.send_logs(batch(3))
+    assert fanout.stats()['rds']['success'] == 1
+    fanout.shutdown()
+
+
+def test_queued_batch_past_timeout_is_spooled_not_left_queued():
+    sender = FakeSender('rds', delay=0.3, spool=True)
+    fanout = make_fanout(sender, timeout=0.2)
+    first = threading.Thread(target=fanout.send_logs, args=(batch(1),))
+    first.start()
+    time.sleep(0.05)
+
+    # 앞선 배치를 기다리다 제한 시간을 넘김 - 시작하지 않은 전송은 취소하고 스풀
+    assert fanout.send_logs(batch(2))
+    first.join()
+    assert [records[0] for records in sender.spool] == ['event-2']
+    assert sender.attempts == 1
+    fanout.shutdown()
+
+
+def test_failed_sender_is_retried_then_spooled():
+    sender = FakeSender('rds', failures=5, spool=True)
+    fanout = make_fanout(sender, retries=2)
+
+    assert fanout.send_logs(batch(1))
+    assert sender.attempts == 3
+    assert [records[0] for records in sender.spool] == ['event-1']
+    assert fanout.stats()['rds']['spooled'] == 1
+    fanout.shutdown()
+
+
+def test_batch_fails_unless_every_sender_stores_or_spools():
+    healthy = FakeSender('rds')
+    broken = FakeSender('parquet', failures=1)
+    fanout = make_fanout(healthy, broken)
+
+    assert not fanout.send_logs(batch(1))
+    assert fanout.stats()['parquet']['failure'] == 1
+    fanout.shutdown()
+
+
+def test_spool_replay_runs_after_the_timed_send():
+    # 재전송이 제한 시간보다 길어도 이번 배치는 성공으로 집계
+    sender = FakeSender('rds', spool=True, replay_delay=0.3)
+    fanout = make_fanout(sender, timeout=0.1)
+
+    assert fanout.send_logs(batch(1))
+    assert fanout.stats()['rds']['success'] == 1
+    wait_until(lambda: sender.replays == 1)
+    fanout.shutdown()
+
+
+class FakeRowSender(FakeSender):
+    supports_rows = True
+
+    def send_rows(self, rows) -> bool:
+        self.sent.append(rows)
+        return True
+
+
+def test_send_rows_goes_only_to_senders_that_support_rows():
+    rows_sender = FakeRowSender('rds')
+    events_only = FakeSender('archive')
+    fanout = make_fanout(rows_sender, events_only)
+
+    assert fanout.send_rows(['row-1'])
+    assert rows_sender.sent == [['row-1']]
+    assert events_only.attempts == 0
+    assert not events_only.supports_rows
+    fanout.shutdown()
@@ -0,0 +1,139 @@
+"""디스크 스풀: 프레임 CRC 검증, 끝이 잘린 프레임 처리, 재전송 순서/재개 확인"""
+
+import os
+from datetime import datetime
+
+from src.direct_rds import RowBatch, copy_line
+from src.spool import FRAME_HEADER, REJECTED_FILE, DiskSpool, encode_frame, iter_frames
+
+
+def record(n):
+    return {'batch': n, 'text': f'행 {n}\t\\N\n'}
+
+
+def segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith('spool-'))
+
+
+def replay_all(spool):
+    replayed = []
+    spool.replay(lambda rec: replayed.append(rec) or True)
+    return replayed
+
+
+def test_replay_in_order_and_remove_segments(tmp_path):
+    spool = DiskSpool(str(tmp_path), max_bytes=1024 * 1024)
+    for n in range(3):
+        assert spool.append(record(n))
+    assert spool.has_pending()
+
+    assert replay_all(spool) == [record(0), record(1), record(2)]
+    assert not spool.has_pending()
+    assert segments(tmp_path) == []
+
+
+def test_failed_handler_stops_and_resumes_from_same_record(tmp_path):
+    spool = DiskSpool(str(tmp_path), max_bytes=1024 * 1024)
+    for n in range(3):
+        spool.append(record(n))
+
+    seen = []
+
+    def fail_on_second(rec):
+        seen.append(rec['batch'])
+        return rec['batch'] != 1
+
+    assert spool.replay(fail_on_second) == 1
+    assert seen == [0, 1]
+    assert spool.has_pending()
+
+    # 실패한 레코드부터 다시 재전송
+    assert replay_all(spool) == [record(1), record(2)]
+    assert not spool.has_pending()
+
+
+def test_truncated_tail_frame_is_skipped(tmp_path):
+    spool = DiskSpool(str(tmp_path), max_bytes=1024 * 1024)
+    spool.append(record(0))
+    spool.append(record(1))
+    spool.close()
+
+    path = os.path.join(tmp_path, segments(tmp_path)[0])
+    # 두 번째 프레임 기록 중 종료된 상황
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    assert replay_all(DiskSpool(str(tmp_path), max_bytes=1024 * 1024)) == [record(0)]
+    assert segments(tmp_path) == []
+
+
+def test_truncated_header_is_skipped(tmp_path):
+    path = os.path.join(tmp_path, 'frames.bin')
+    with open(path, 'wb') as f:
+        f.write(encode_frame(record(0)) + encode_frame(record(1))[:FRAME_HEADER.size - 2])
+
+    assert [rec for _, _, rec in iter_frames(path)] == [record(0)]
+
+
+def test_crc_mismatch_stops_reading(tmp_path):
+    path = os.path.join(tmp_path, 'frames.bin')
+    first = bytearray(encode_frame(record(0)))
+    first[-1] ^= 0xFF
+    with open(path, 'wb') as f:
+        f.write(bytes(first) + encode_frame(record(1)))
+
+    assert list(iter_frames(path)) == []
+
+
+def test_bad_magic_stops_reading(tmp_path):
+    path = os.path.join(tmp_path, 'frames.bin')
+    with open(path, 'wb') as f:
+        f.write(encode_frame(record(0)) + b'XXXX' + encode_frame(record(1))[4:])
+
+    assert [rec for _, _, rec in iter_frames(path)] == [record(0)]
+
+
+def test_append_refuses_over_limit(tmp_path):
+    frame_size = len(encode_frame(record(0)))
+    spool = DiskSpool(str(tmp_path), max_bytes=frame_size * 2)
+
+    assert spool.append(record(0))
+    assert spool.append(record(1))
+    assert not spool.append(record(2))
+    assert replay_all(spool) == [record(0), record(1)]
+
+
+def test_restart_keeps_pending_and_writes_new_segment(tmp_path):
+    spool = DiskSpool(str(tmp_path), max_bytes=1024 * 1024)
+    spool.append(record(0))
+    spool.close()
+
+    restarted = DiskSpool(str(tmp_path), max_bytes=1024 * 1024)
+    assert restarted.has_pending()
+    restarted.append(record(1))
+    assert segments(tmp_path) == ['spool-00000001.bin', 'spool-00000002.bin']
+
+    assert replay_all(restarted) == [record(0), record(1)]
+
+
+def test_reject_writes_readable_frame(tmp_path):
+    spool = DiskSpool(str(tmp_path), max_bytes=1024 * 1024)
+    spool.reject(record(7))
+
+    assert [rec for _, _, rec in iter_frames(os.path.join(tmp_path, REJECTED_FILE))] == [record(7)]
+    assert not spool.has_pending()
+
+
+def test_row_batch_record_round_trip(tmp_path):
+    rows = RowBatch()
+    rows.append('event-1', datetime(2025, 9, 3, 9, 5), copy_line(('a', None, 'x\ny')), copy_line(('b', 't\tab', True)))
+    rows.append('event-2', None, copy_line(('c', '한글', '\\')), copy_line(('d', None, False)))
+
+    spool = DiskSpool(str(tmp_path), max_bytes=1024 * 1024)
+    spool.append(rows.to_record())
+    restored = RowBatch.from_record(replay_all(spool)[0])
+
+    assert restored.event_ids == rows.event_ids
+    assert restored.event_times == rows.event_times
+    assert restored.events_lines == rows.events_lines
+    assert restored.cloudtrail_lines == rows.cloudtrail_lines
@@ -0,0 +1,71 @@
+"""SQS 알림 본문 해석: S3 이벤트 알림, CloudTrail SNS 알림, EventBridge, SNS 래핑 형식"""
+
+import json
+
+import pytest
+
+from src.sqs_ingest import parse_notification
+
+KEY = 'AWSLogs/123456789012/CloudTrail/ap-northeast-2/2025/09/03/123456789012_CloudTrail_ap-northeast-2_20250903T0905Z_abc.json.gz'
+
+
+def s3_event(key, event_name='ObjectCreated:Put', source='aws:s3'):
+    return {
+        'eventSource': source,
+        'eventName': event_name,
+        's3': {'bucket': {'name': 'trail-bucket'}, 'object': {'key': key}},
+    }
+
+
+def test_s3_event_notification_decodes_key():
+    body = json.dumps({'Records': [s3_event('AWSLogs/with+space/%ED%95%9C.json.gz')]})
+
+    assert parse_notification(body) == [('trail-bucket', 'AWSLogs/with space/한.json.gz')]
+
+
+def test_s3_event_notification_skips_non_create_events():
+    body = json.dumps({'Records': [
+        s3_event(KEY),
+        s3_event('deleted.json.gz', event_name='ObjectRemoved:Delete'),
+        s3_event('other.json.gz', source='aws:sqs'),
+    ]})
+
+    assert parse_notification(body) == [('trail-bucket', KEY)]
+
+
+def test_cloudtrail_sns_notification():
+    body = json.dumps({'s3Bucket': 'trail-bucket', 's3ObjectKey': [KEY, KEY.replace('abc', 'def')]})
+
+    assert parse_notification(body) == [('trail-bucket', KEY), ('trail-bucket', KEY.replace('abc', 'def'))]
+
+
+def test_sns_envelope_is_unwrapped():
+    inner = json.dumps({'Records': [s3_event(KEY)]})
+    body = json.dumps({'Type': 'Notification', 'Message': inner})
+
+    assert parse_notification(body) == [('trail-bucket', KEY)]
+
+
+def test_eventbridge_object_created_key_is_not_decoded():
+    body = json.dumps({
+        'source': 'aws.s3',
+        'detail-type': 'Object Created',
+        'detail': {'bucket': {'name': 'trail-bucket'}, 'object': {'key': 'a+b%20c.json.gz'}},
+    })
+
+    assert parse_notification(body) == [('trail-bucket', 'a+b%20c.json.gz')]
+
+
+def test_eventbridge_other_detail_type_is_empty():
+    body = json.dumps({'source': 'aws.s3', 'detail-type': 'Object Deleted', 'detail': {}})
+
+    assert parse_notification(body) == []
+
+
+def test_s3_test_event_is_empty():
+    assert parse_notification(json.dumps({'Event': 's3:TestEvent', 'Bucket': 'trail-bucket'})) == []
+
+
+@pytest.mark.parametrize('body', ['not json', None, '[1, 2]', '{"unknown": true}'])
+def test_unknown_format_is_none(body):
+    assert parse_notification(body) is None